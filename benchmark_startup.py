@@ -0,0 +1,38 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import argparse
+import json
+import subprocess
+from src.agent.learning.enhanced_learner import probe_startup
+
+def measure_startup(model_type):
+    """Measure cold-start cost of one model type in a fresh interpreter"""
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--probe', model_type],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure EnhancedLearner cold-start cost")
+    parser.add_argument('models', nargs='*', default=['rf', 'nn', 'lstm'])
+    parser.add_argument('--probe', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.probe:
+        print(json.dumps(probe_startup(args.probe)))
+        return
+    for model_type in args.models:
+        try:
+            result = measure_startup(model_type)
+        except subprocess.CalledProcessError as exc:
+            print(f"{model_type}: failed\n{exc.stderr.strip()}")
+            continue
+        print(f"{model_type}: build {result['build_seconds']:.2f}s, "
+              f"peak RSS {result['max_rss_mb']:.0f} MB "
+              f"(baseline {result['baseline_rss_mb']:.0f} MB)")
+
+if __name__ == "__main__":
+    main()
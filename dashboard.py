@@ -3,48 +3,76 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 import streamlit as st
+import pandas as pd
 import time
-from src.agent.environment.sensor_interface import SensorInterface
-from src.agent.learning.reinforcement_learner import ReinforcementLearner
-from src.agent.decision.adaptive_decision import AdaptiveDecisionMaker
+from src.agent.monitoring.snapshot_store import SnapshotFeed
+
+# Written by the running agent (``python src/main.py --snapshots ...``)
+SNAPSHOT_PATH = os.environ.get('MAINTENANCE_SNAPSHOTS', 'logs/snapshots.db')
+# Follow one asset of a fleet run; all snapshots when unset
+ASSET_ID = os.environ.get('MAINTENANCE_ASSET')
+REFRESH_SECONDS = 1.0
+
+@st.cache_resource
+def get_feed(path, asset_id=None):
+    """One feed per server process, shared by every viewer session"""
+    return SnapshotFeed(path, maxlen=3600, min_interval=REFRESH_SECONDS, asset_id=asset_id)
+
 def main():
     st.title("AI-Powered Predictive Maintenance System")
     
-    # Initialize components
-    sensor = SensorInterface()
-    learner = ReinforcementLearner()
-    decision_maker = AdaptiveDecisionMaker(learner)
+    if not os.path.exists(SNAPSHOT_PATH):
+        st.info(f"Waiting for the agent to publish snapshots to {SNAPSHOT_PATH}...")
+        time.sleep(REFRESH_SECONDS)
+        st.rerun()
+    
+    # Pull only the snapshots published since the last refresh
+    feed = get_feed(SNAPSHOT_PATH, ASSET_ID)
+    feed.refresh()
+    latest = feed.latest()
+    if latest is None:
+        st.info("Waiting for the first decision...")
+        time.sleep(REFRESH_SECONDS)
+        st.rerun()
+    
+    readings = latest['state']
     
     # Create dashboard sections
     col1, col2, col3 = st.columns(3)
     
-    while True:
-        # Get current readings
-        readings = sensor.read_sensors()
-        health = sensor.get_sensor_health(readings)
-        
-        # Display current readings
-        with col1:
-            st.header("Sensor Readings")
-            st.metric("Temperature", f"{readings['temperature']:.1f}°C")
-            st.metric("Vibration", f"{readings['vibration']:.2f}mm")
-            st.metric("Pressure", f"{readings['pressure']:.1f}PSI")
-        
-        # Display health status
-        with col2:
-            st.header("Health Status")
-            for sensor_name, status in health.items():
-                color = "green" if status['status'] == 'NORMAL' else "red"
-                st.markdown(f":{color}[{sensor_name}: {status['status']}]")
-        
-        # Display maintenance decisions
-        with col3:
-            st.header("Maintenance Action")
-            decision = decision_maker.make_decision(readings, health)
-            st.write(f"Recommended Action: {decision}")
-        
-        time.sleep(1)
-        st.experimental_rerun()
+    # Display current readings
+    with col1:
+        st.header("Sensor Readings")
+        st.metric("Temperature", f"{readings['temperature']:.1f}°C")
+        st.metric("Vibration", f"{readings['vibration']:.2f}mm")
+        st.metric("Pressure", f"{readings['pressure']:.1f}PSI")
+    
+    # Display health status
+    with col2:
+        st.header("Health Status")
+        for sensor_name, status in latest['health'].items():
+            color = "green" if status == 'NORMAL' else "red"
+            st.markdown(f":{color}[{sensor_name}: {status}]")
+    
+    # Display maintenance decisions
+    with col3:
+        st.header("Maintenance Action")
+        st.write(f"Recommended Action: {latest['action']}")
+        metrics = feed.status.get('decision_metrics')
+        if metrics:
+            st.metric("Total Decisions", metrics['total_decisions'])
+            st.metric("Average Confidence", f"{metrics['average_confidence']:.2f}")
+    
+    # Recent history from the shared feed
+    history = pd.DataFrame(
+        [dict(snapshot['state'], timestamp=snapshot['timestamp']) for snapshot in feed.history()]
+    )
+    history['timestamp'] = pd.to_datetime(history['timestamp'])
+    st.line_chart(history.set_index('timestamp')[['temperature', 'vibration', 'pressure']])
+    st.caption(f"Snapshot version {latest['version']} at {latest['timestamp']}")
+    
+    time.sleep(REFRESH_SECONDS)
+    st.rerun()
 
 if __name__ == "__main__":
     main()
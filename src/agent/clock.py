@@ -0,0 +1,53 @@
+# src/agent/clock.py
+
+from datetime import datetime, timedelta
+import time
+
+
+class SystemClock:
+    """Wall-clock time; the default for every component"""
+
+    def now(self):
+        return datetime.now()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class SimulatedClock:
+    """Clock that only moves when told to
+
+    ``sleep`` advances time instantly, so loops written against a clock run
+    as fast as the CPU allows. Drivers replaying recorded or generated data
+    move it to each reading's timestamp with ``set``.
+    """
+
+    def __init__(self, start=None):
+        self._now = start if start is not None else datetime(2000, 1, 1)
+        self._origin = self._now
+
+    def now(self):
+        return self._now
+
+    def monotonic(self):
+        """Simulated seconds since the clock was created"""
+        return (self._now - self._origin).total_seconds()
+
+    def sleep(self, seconds):
+        self.advance(seconds)
+
+    def advance(self, seconds):
+        if seconds > 0:
+            self._now += timedelta(seconds=seconds)
+
+    def set(self, timestamp):
+        """Move to ``timestamp``; time never runs backwards"""
+        if timestamp > self._now:
+            self._now = timestamp
+
+
+system_clock = SystemClock()
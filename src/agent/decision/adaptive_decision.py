@@ -1,47 +1,108 @@
 # src/agent/decision/adaptive_decision.py
 
-import numpy as np
-from datetime import datetime
-import pandas as pd
+from collections import deque
+
+from ..clock import system_clock
+from .decision_metrics import DecisionMetrics
+
+# Default actions and their ids, e.g. for fixed-width action columns
+ACTION_SPACE = {
+    'no_action': 0,
+    'increase_monitoring': 1,
+    'schedule_maintenance': 2,
+    'immediate_maintenance': 3,
+    'emergency_shutdown': 4
+}
 
 class AdaptiveDecisionMaker:
-    def __init__(self, learner):
+    def __init__(self, learner, metrics_window_minutes=60, cache=None, clock=None,
+                 warning_score=2, critical_score=5, history_size=1000, journal=None):
         self.learner = learner
-        self.decisions_history = []
-        self.action_space = {
-            'no_action': 0,
-            'increase_monitoring': 1,
-            'schedule_maintenance': 2,
-            'immediate_maintenance': 3,
-            'emergency_shutdown': 4
-        }
+        # Severity score thresholds; WARNING sensors score 1, CRITICAL ones 3
+        self.warning_score = warning_score
+        self.critical_score = critical_score
+        self.clock = clock or system_clock
+        # Recent decisions only; the full audit trail goes to ``journal``
+        # (an EventJournal) when one is given
+        self.decisions_history = deque(maxlen=history_size)
+        self.journal = journal
+        # Callables given every batch of recorded decisions, e.g. DecisionSeries
+        self.listeners = []
+        self.metrics = DecisionMetrics(window_minutes=metrics_window_minutes)
+        # Optional DecisionCache for repeated, effectively identical states
+        self.cache = cache
+        self.action_space = dict(ACTION_SPACE)
         
     def make_decision(self, current_state, sensor_health):
         """Make adaptive decision based on current state and learned experiences"""
-        # Get predictions for each possible action
-        action_predictions = {}
-        for action_name, action_id in self.action_space.items():
-            prediction = self.learner.predict_outcome(current_state, action_id)
-            if prediction:
-                action_predictions[action_name] = prediction
-                
+        return self.make_decisions([current_state], [sensor_health])[0]
+        
+    def make_decisions(self, states, sensor_healths, severities=None):
+        """Decide for several states at once, e.g. every asset due in a tick
+
+        Predictions for all states missing from the cache come from one
+        batched learner call. ``severities`` already evaluated by the
+        caller (with this decision maker's thresholds) are used as given.
+        """
         # Evaluate situation severity
-        severity = self._evaluate_severity(sensor_health)
+        if severities is None:
+            severities = [self._evaluate_severity(health) for health in sensor_healths]
         
-        # Select action based on predictions and severity
-        selected_action = self._select_action(action_predictions, severity)
+        cache_keys = [None] * len(states)
+        decisions = [None] * len(states)
+        if self.cache is not None:
+            epoch = getattr(self.learner, 'epoch', 0)
+            for i, (state, health) in enumerate(zip(states, sensor_healths)):
+                cache_keys[i] = self.cache.make_key(state, severities[i], health, epoch)
+                decisions[i] = self.cache.get(cache_keys[i])
+                
+        misses = [i for i, decision in enumerate(decisions) if decision is None]
+        if misses:
+            # Get predictions for every possible action in one pass. Experiences
+            # are recorded under action names, so predictions are keyed by name.
+            if len(misses) == 1:
+                predictions = [self.learner.predict_outcomes(states[misses[0]], self.action_space.keys())]
+            else:
+                predictions = self.learner.predict_outcomes_many(
+                    [states[i] for i in misses],
+                    self.action_space.keys()
+                )
+            for i, action_predictions in zip(misses, predictions):
+                # Select action based on predictions and severity
+                decisions[i] = (self._select_action(action_predictions, severities[i]), action_predictions)
+                if cache_keys[i] is not None:
+                    self.cache.put(cache_keys[i], decisions[i])
         
-        # Record decision
-        self.decisions_history.append({
-            'timestamp': datetime.now(),
-            'state': current_state,
-            'sensor_health': sensor_health,
-            'severity': severity,
-            'selected_action': selected_action,
-            'predictions': action_predictions
-        })
+        # Record decisions
+        timestamp = self.clock.now()
+        selected = []
+        recorded = []
+        for state, health, severity, (selected_action, action_predictions) in zip(
+                states, sensor_healths, severities, decisions):
+            decision = {
+                'timestamp': timestamp,
+                'state': state,
+                'sensor_health': health,
+                'severity': severity,
+                'selected_action': selected_action,
+                'predictions': action_predictions
+            }
+            self.decisions_history.append(decision)
+            recorded.append(decision)
+            if self.journal is not None:
+                self.journal.emit('decision', decision)
+            self.metrics.update(
+                timestamp,
+                selected_action,
+                severity,
+                next(iter(action_predictions.values()))['confidence'] if action_predictions else None
+            )
+            selected.append(selected_action)
+            
+        for listener in self.listeners:
+            listener(recorded)
         
-        return selected_action
+        return selected
         
     def _evaluate_severity(self, sensor_health):
         """Evaluate situation severity"""
@@ -53,9 +114,9 @@ class AdaptiveDecisionMaker:
             elif status['status'] == 'WARNING':
                 severity_score += 1
                 
-        if severity_score >= 5:
+        if severity_score >= self.critical_score:
             return 'CRITICAL'
-        elif severity_score >= 2:
+        elif severity_score >= self.warning_score:
             return 'WARNING'
         return 'NORMAL'
         
@@ -78,15 +139,9 @@ class AdaptiveDecisionMaker:
         return best_action[0]
         
     def get_decision_metrics(self):
-        """Get metrics about decision making performance"""
-        df = pd.DataFrame(self.decisions_history)
-        return {
-            'total_decisions': len(df),
-            'action_distribution': df['selected_action'].value_counts().to_dict(),
-            'severity_distribution': df['severity'].value_counts().to_dict(),
-            'average_confidence': np.mean([
-                list(d['predictions'].values())[0]['confidence'] 
-                for d in self.decisions_history 
-                if d['predictions']
-            ])
-        }
+        """Get metrics about decision making performance
+
+        Served from streaming counters, so the cost does not grow with the
+        number of decisions made.
+        """
+        return self.metrics.summary(self.clock.now())
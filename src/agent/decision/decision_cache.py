@@ -0,0 +1,85 @@
+# src/agent/decision/decision_cache.py
+
+from collections import OrderedDict
+import numbers
+
+from ..clock import system_clock
+
+
+class DecisionCache:
+    """LRU/TTL cache of decisions for effectively identical situations.
+
+    Keys combine the learner epoch, the severity, the per-sensor health
+    signature and the state quantized to ``state_quantum`` (a scalar or a
+    dict per state key). A new learner epoch therefore misses every older
+    entry, and entries expire ``ttl`` seconds after they were stored.
+    """
+
+    def __init__(self, maxsize=4096, ttl=60.0, state_quantum=0.5, clock=None):
+        self.maxsize = maxsize
+        self.clock = clock or system_clock
+        self.ttl = ttl
+        self.state_quantum = state_quantum
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _quantum(self, key):
+        if isinstance(self.state_quantum, dict):
+            return self.state_quantum.get(key, 1.0)
+        return self.state_quantum
+
+    def make_key(self, state, severity, sensor_health, epoch=0):
+        """Build the cache key for one decision"""
+        quantized = tuple(
+            (key, round(value / self._quantum(key)))
+            for key, value in sorted(state.items())
+            if isinstance(value, numbers.Real) and not isinstance(value, bool)
+        )
+        signature = tuple(sorted(
+            (sensor, status['status']) for sensor, status in sensor_health.items()
+        ))
+        return (epoch, severity, signature, quantized)
+
+    def get(self, key):
+        """Return the cached value for ``key`` or None"""
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        expires_at, value = entry
+        if self.ttl is not None and self.clock.monotonic() >= expires_at:
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        expires_at = self.clock.monotonic() + self.ttl if self.ttl is not None else None
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'size': len(self._entries),
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'expirations': self.expirations,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
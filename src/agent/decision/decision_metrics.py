@@ -0,0 +1,103 @@
+# src/agent/decision/decision_metrics.py
+
+from collections import Counter, deque
+import math
+
+
+class DecisionMetrics:
+    """Streaming decision statistics, updated once per decision.
+
+    Keeps action and severity counters, a running mean and variance of
+    confidence (Welford) and per-minute buckets for rates over the last
+    ``window_minutes``. Updates and reads are O(1) amortized, independent
+    of how many decisions have been made.
+    """
+
+    def __init__(self, window_minutes=60):
+        self.window_minutes = window_minutes
+        self.total_decisions = 0
+        self.action_counts = Counter()
+        self.severity_counts = Counter()
+        self._confidence_count = 0
+        self._confidence_mean = 0.0
+        self._confidence_m2 = 0.0
+        # (minute, action, severity) buckets inside the window, oldest first
+        self._buckets = deque()
+        self._window_actions = Counter()
+        self._window_severities = Counter()
+        self._window_total = 0
+
+    @staticmethod
+    def _minute(timestamp):
+        return int(timestamp.timestamp() // 60)
+
+    def update(self, timestamp, action, severity, confidence=None):
+        """Record one decision"""
+        self.total_decisions += 1
+        self.action_counts[action] += 1
+        self.severity_counts[severity] += 1
+
+        if confidence is not None:
+            self._confidence_count += 1
+            delta = confidence - self._confidence_mean
+            self._confidence_mean += delta / self._confidence_count
+            self._confidence_m2 += delta * (confidence - self._confidence_mean)
+
+        minute = self._minute(timestamp)
+        if self._buckets and self._buckets[-1][0] == minute:
+            bucket = self._buckets[-1]
+        else:
+            bucket = (minute, Counter(), Counter())
+            self._buckets.append(bucket)
+        bucket[1][action] += 1
+        bucket[2][severity] += 1
+        self._window_actions[action] += 1
+        self._window_severities[severity] += 1
+        self._window_total += 1
+        self._expire(minute)
+
+    def _expire(self, minute):
+        """Drop buckets older than the window"""
+        while self._buckets and self._buckets[0][0] <= minute - self.window_minutes:
+            _, actions, severities = self._buckets.popleft()
+            self._window_actions.subtract(actions)
+            self._window_severities.subtract(severities)
+            self._window_total -= sum(actions.values())
+
+    @property
+    def average_confidence(self):
+        if self._confidence_count == 0:
+            return float('nan')
+        return self._confidence_mean
+
+    @property
+    def confidence_variance(self):
+        if self._confidence_count < 2:
+            return float('nan')
+        return self._confidence_m2 / (self._confidence_count - 1)
+
+    def window_rates(self, now):
+        """Decisions per minute over the window ending at ``now``"""
+        self._expire(self._minute(now))
+        return {
+            'decisions_per_minute': self._window_total / self.window_minutes,
+            'actions_per_minute': {
+                action: count / self.window_minutes
+                for action, count in self._window_actions.items() if count
+            },
+            'severities_per_minute': {
+                severity: count / self.window_minutes
+                for severity, count in self._window_severities.items() if count
+            }
+        }
+
+    def summary(self, now):
+        return {
+            'total_decisions': self.total_decisions,
+            'action_distribution': dict(self.action_counts),
+            'severity_distribution': dict(self.severity_counts),
+            'average_confidence': self.average_confidence,
+            'confidence_std': math.sqrt(self.confidence_variance),
+            'window_minutes': self.window_minutes,
+            'window_rates': self.window_rates(now)
+        }
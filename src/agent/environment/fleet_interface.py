@@ -0,0 +1,135 @@
+# src/agent/environment/fleet_interface.py
+
+import numpy as np
+import pandas as pd
+
+from .ring_buffer import ColumnarRingBuffer
+from .sensor_interface import SensorInterface
+
+class FleetSensorInterface:
+    """Sensor interface for a fleet of machines keyed by asset ID.
+
+    Each tick is an (assets x sensors) array, produced by one vectorized
+    draw from the seeded generator or supplied through ``ingest``. History
+    is a single ring buffer whose columns hold one value per asset, so no
+    Python object is kept per asset. Sensor configuration, thresholds and
+    the generator come from a wrapped SensorInterface (``sensor_interface``).
+    """
+
+    def __init__(self, asset_ids, history_capacity=360, seed=None, dtype=np.float32, clock=None):
+        self.asset_ids = list(asset_ids)
+        self._asset_index = {asset_id: i for i, asset_id in enumerate(self.asset_ids)}
+        if len(self._asset_index) != len(self.asset_ids):
+            raise ValueError("asset_ids must be unique")
+        self.dtype = dtype
+        self.latest_values = None
+        self.latest_timestamp = None
+        self.sensor_interface = SensorInterface(history_capacity=1, seed=seed, clock=clock)
+        self.sensors = self.sensor_interface.sensors
+        self.sensor_names = self.sensor_interface.sensor_names
+        self.clock = self.sensor_interface.clock
+        self.readings_history = ColumnarRingBuffer(
+            self.sensor_names,
+            capacity=history_capacity,
+            dtype=self.dtype,
+            shape=(len(self.asset_ids),)
+        )
+
+    @property
+    def n_assets(self):
+        return len(self.asset_ids)
+
+    def asset_index(self, asset_id):
+        """Row of ``asset_id`` in fleet arrays"""
+        try:
+            return self._asset_index[asset_id]
+        except KeyError:
+            raise KeyError(f"Unknown asset: {asset_id}") from None
+
+    def read_fleet(self, index=None):
+        """Simulate one tick; returns (timestamp, values)
+
+        ``index`` limits the tick to those asset rows, e.g. the ones an
+        AdaptiveScheduler reports due; ``values`` then holds only them.
+        """
+        n_assets = self.n_assets if index is None else len(index)
+        return self.ingest(self.sensor_interface.simulate_values(n_assets), index=index)
+
+    def ingest(self, values, timestamp=None, index=None):
+        """Record one externally supplied (assets x sensors) tick
+
+        With ``index`` the rows belong to those assets only; the others
+        are recorded as NaN for this tick and keep their latest values.
+        """
+        values = np.asarray(values)
+        n_assets = self.n_assets if index is None else len(index)
+        expected = (n_assets, len(self.sensor_names))
+        if values.shape != expected:
+            raise ValueError(f"Expected readings of shape {expected}, got {values.shape}")
+
+        if timestamp is None:
+            timestamp = self.clock.now()
+
+        tick = values
+        if index is not None:
+            tick = np.full((self.n_assets, len(self.sensor_names)), np.nan, dtype=self.dtype)
+            tick[index] = values
+            latest = self.latest_values if self.latest_values is not None else tick
+            latest = np.array(latest, dtype=self.dtype)
+            latest[index] = values
+        self.readings_history.append(
+            timestamp,
+            {sensor: tick[:, i] for i, sensor in enumerate(self.sensor_names)}
+        )
+        self.latest_values = values if index is None else latest
+        self.latest_timestamp = timestamp
+        return timestamp, values
+
+    def evaluate_fleet_health(self, values):
+        """Status-code matrix of an (assets x sensors) array"""
+        return self.sensor_interface.evaluate_fleet_health(values)
+
+    def get_asset_health(self, values, codes, asset_index):
+        """Build the get_sensor_health dict for one row of a fleet evaluation"""
+        return self.sensor_interface.get_asset_health(values, codes, asset_index)
+
+    def fleet_health(self):
+        """Status-code matrix for the latest tick"""
+        if self.latest_values is None:
+            return None
+        return self.evaluate_fleet_health(self.latest_values)
+
+    def get_asset_readings(self, asset_id):
+        """Latest readings of one asset in the read_sensors() format"""
+        if self.latest_values is None:
+            return None
+        row = self.latest_values[self.asset_index(asset_id)]
+        readings = {'timestamp': self.latest_timestamp}
+        readings.update(zip(self.sensor_names, row))
+        return readings
+
+    def get_asset_history(self, asset_id, hours=24):
+        """Get historical data of one asset"""
+        if self.readings_history.empty:
+            return pd.DataFrame()
+
+        index = self.asset_index(asset_id)
+        cutoff = self.clock.now() - pd.Timedelta(hours=hours)
+        timestamps, values = self.readings_history.window(since=cutoff)
+        data = {'timestamp': timestamps.view('datetime64[ns]')}
+        data.update({sensor: column[:, index] for sensor, column in values.items()})
+        return pd.DataFrame(data)
+
+    def get_historical_data(self, hours=24):
+        """Get historical data of the whole fleet in long format"""
+        if self.readings_history.empty:
+            return pd.DataFrame()
+
+        cutoff = self.clock.now() - pd.Timedelta(hours=hours)
+        timestamps, values = self.readings_history.window(since=cutoff)
+        data = {
+            'timestamp': np.repeat(timestamps.view('datetime64[ns]'), self.n_assets),
+            'asset_id': np.tile(np.asarray(self.asset_ids, dtype=object), len(timestamps))
+        }
+        data.update({sensor: column.reshape(-1) for sensor, column in values.items()})
+        return pd.DataFrame(data)
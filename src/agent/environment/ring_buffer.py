@@ -0,0 +1,123 @@
+# src/agent/environment/ring_buffer.py
+
+import numpy as np
+import pandas as pd
+
+
+class ColumnarRingBuffer:
+    """Fixed-capacity columnar history with amortized O(1) appends.
+
+    Rows live in arrays of twice the capacity so the retained window is
+    always contiguous: once the write position reaches the end, the last
+    ``capacity`` rows are moved back to the front in one copy. Window
+    queries are therefore plain slices (views) found by binary search on
+    the int64 nanosecond timestamp column. A row stamped earlier than the
+    previous one (the wall clock stepped back for DST or NTP) is stored at
+    the previous timestamp, so the column stays sorted; such rows are
+    counted in ``clamped``.
+    """
+
+    def __init__(self, columns, capacity=86400, dtype=np.float64, shape=()):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.columns = list(columns)
+        self.capacity = int(capacity)
+        self.shape = tuple(shape)
+        self._timestamps = np.zeros(2 * self.capacity, dtype=np.int64)
+        self._values = {
+            column: np.full((2 * self.capacity,) + self.shape, np.nan, dtype=dtype)
+            for column in self.columns
+        }
+        self._start = 0
+        self._end = 0
+        self.clamped = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    @property
+    def empty(self):
+        return self._end == self._start
+
+    @staticmethod
+    def to_ns(timestamp):
+        """Convert a datetime-like value to int64 nanoseconds"""
+        return np.datetime64(timestamp, 'ns').astype(np.int64)
+
+    def append(self, timestamp, values):
+        """Append one row; ``values`` maps column name to value
+
+        Never raises for out-of-order timestamps; see ``clamped``.
+        """
+        if self._end == len(self._timestamps):
+            self._compact()
+
+        ts = self.to_ns(timestamp)
+        if self._end > self._start and ts < self._timestamps[self._end - 1]:
+            ts = self._timestamps[self._end - 1]
+            self.clamped += 1
+
+        row = self._end
+        self._timestamps[row] = ts
+        for column in self.columns:
+            self._values[column][row] = values[column]
+
+        self._end += 1
+        if self._end - self._start > self.capacity:
+            self._start += 1
+
+    def _compact(self):
+        """Move the retained window back to the front of the arrays"""
+        size = self._end - self._start
+        self._timestamps[:size] = self._timestamps[self._start:self._end]
+        for column in self.columns:
+            self._values[column][:size] = self._values[column][self._start:self._end]
+        self._start = 0
+        self._end = size
+
+    def clear(self):
+        self._start = 0
+        self._end = 0
+
+    def _window_start(self, since):
+        if since is None:
+            return self._start
+        offset = np.searchsorted(
+            self._timestamps[self._start:self._end],
+            self.to_ns(since),
+            side='right'
+        )
+        return self._start + int(offset)
+
+    def timestamps(self, since=None):
+        """Timestamps (int64 ns) strictly after ``since`` as a view"""
+        return self._timestamps[self._window_start(since):self._end]
+
+    def column(self, name, since=None):
+        """Values of one column strictly after ``since`` as a view"""
+        return self._values[name][self._window_start(since):self._end]
+
+    def window(self, since=None):
+        """Return ``(timestamps, {column: values})`` views after ``since``"""
+        start = self._window_start(since)
+        return (
+            self._timestamps[start:self._end],
+            {column: self._values[column][start:self._end] for column in self.columns}
+        )
+
+    def latest(self):
+        """Most recent row as a dict, or None when empty"""
+        if self.empty:
+            return None
+        row = self._end - 1
+        latest = {'timestamp': pd.Timestamp(self._timestamps[row])}
+        for column in self.columns:
+            latest[column] = self._values[column][row]
+        return latest
+
+    def to_frame(self, since=None):
+        """Build a DataFrame of the rows after ``since``"""
+        timestamps, values = self.window(since)
+        data = {'timestamp': timestamps.view('datetime64[ns]')}
+        data.update(values)
+        return pd.DataFrame(data)
@@ -1,9 +1,17 @@
 import numpy as np
-from datetime import datetime
 import pandas as pd
 
+from ..clock import system_clock
+from .ring_buffer import ColumnarRingBuffer
+
+# Status codes used by the vectorized health evaluation
+NORMAL = 0
+WARNING = 1
+CRITICAL = 2
+STATUS_NAMES = ('NORMAL', 'WARNING', 'CRITICAL')
+
 class SensorInterface:
-    def __init__(self):
+    def __init__(self, history_capacity=86400, seed=None, source=None, clock=None):
         self.sensors = {
             'temperature': {
                 'normal_range': (70, 80),
@@ -22,31 +30,66 @@ class SensorInterface:
                 'unit': 'PSI'
             }
         }
-        self.readings_history = pd.DataFrame()
+        self.rng = np.random.default_rng(seed)
+        self.source = source
+        self.clock = clock or system_clock
+        self._compile_thresholds()
+        self.readings_history = self._create_history(history_capacity)
         
-    def read_sensors(self):
-        """Read current sensor values with controlled noise"""
-        timestamp = datetime.now()
-        readings = {'timestamp': timestamp}
+    def _compile_thresholds(self):
+        """Precompile sensor thresholds into arrays ordered like sensor_names"""
+        self.sensor_names = list(self.sensors.keys())
+        self._lower = np.array([self.sensors[s]['normal_range'][0] for s in self.sensor_names])
+        self._upper = np.array([self.sensors[s]['normal_range'][1] for s in self.sensor_names])
+        self._critical = np.array([self.sensors[s]['critical'] for s in self.sensor_names])
+        self._means = (self._lower + self._upper) / 2
+        default_std = (self._upper - self._lower) * 0.1
+        self._std_devs = np.array([
+            self.sensors[s].get('std_dev', std) for s, std in zip(self.sensor_names, default_std)
+        ])
         
-        for sensor, config in self.sensors.items():
-            min_val, max_val = config['normal_range']
-            base_value = (min_val + max_val) / 2
-            std_dev = config.get('std_dev', (max_val - min_val) * 0.1)
-            
-            reading = np.random.normal(base_value, std_dev)
-            reading = np.clip(reading, min_val, max_val)
-            
-            readings[sensor] = reading
+    def _create_history(self, capacity):
+        """Create the readings history buffer"""
+        return ColumnarRingBuffer(self.sensor_names, capacity=capacity)
+        
+    def read_sensors(self):
+        """Read current sensor values from the source or the noise generator
+
+        Raises SourceExhausted once a configured source has no more data.
+        """
+        if self.source is not None:
+            readings = self.source.next_reading()
+        else:
+            readings = self._simulate_readings()
             
-        # Store in history
-        self.readings_history = pd.concat([
-            self.readings_history,
-            pd.DataFrame([readings])
-        ], ignore_index=True)
+        return self.record(readings)
+        
+    def record(self, readings):
+        """Store readings taken elsewhere, e.g. by a simulation driver"""
+        self.readings_history.append(readings['timestamp'], readings)
+        return readings
+    
+    def _simulate_readings(self):
+        """Generate sensor values with controlled noise"""
+        readings = {'timestamp': self.clock.now()}
         
+        # One draw for all sensors, clipped to their normal ranges
+        values = np.clip(
+            self.rng.normal(self._means, self._std_devs),
+            self._lower,
+            self._upper
+        )
+        readings.update(zip(self.sensor_names, values))
         return readings
     
+    def simulate_values(self, n_assets):
+        """Generate an (assets x sensors) array with the same noise, in one draw"""
+        return np.clip(
+            self.rng.normal(self._means, self._std_devs, size=(n_assets, len(self.sensor_names))),
+            self._lower,
+            self._upper
+        )
+    
     def get_sensor_health(self, readings):
         """Evaluate health status of sensor readings"""
         health_status = {}
@@ -73,10 +116,53 @@ class SensorInterface:
             
         return health_status
     
+    def evaluate_fleet_health(self, values):
+        """Evaluate an (assets x sensors) array into an int8 status-code matrix
+
+        Columns follow ``self.sensor_names``. Codes are NORMAL, WARNING and
+        CRITICAL and use the same rules as ``get_sensor_health``.
+        """
+        values = np.asarray(values)
+        if values.shape[-1] != len(self.sensor_names):
+            raise ValueError(
+                f"Expected {len(self.sensor_names)} sensor columns, got {values.shape[-1]}"
+            )
+            
+        codes = ((values < self._lower) | (values > self._upper)).astype(np.int8)
+        codes[values >= self._critical] = CRITICAL
+        return codes
+    
+    def health_from_codes(self, readings, codes):
+        """Build the get_sensor_health dict from already evaluated status codes"""
+        return {
+            sensor: {
+                'status': STATUS_NAMES[code],
+                'value': readings[sensor],
+                'unit': self.sensors[sensor]['unit']
+            }
+            for sensor, code in zip(self.sensor_names, codes)
+        }
+    
+    def get_asset_health(self, values, codes, asset_index):
+        """Build the get_sensor_health dict for one row of a fleet evaluation"""
+        return {
+            sensor: {
+                'status': STATUS_NAMES[codes[asset_index, i]],
+                'value': values[asset_index, i],
+                'unit': self.sensors[sensor]['unit']
+            }
+            for i, sensor in enumerate(self.sensor_names)
+        }
+    
     def get_historical_data(self, hours=24):
         """Get historical sensor data"""
         if self.readings_history.empty:
             return pd.DataFrame()
             
-        cutoff = datetime.now() - pd.Timedelta(hours=hours)
-        return self.readings_history[self.readings_history['timestamp'] > cutoff]
+        cutoff = self.clock.now() - pd.Timedelta(hours=hours)
+        return self.readings_history.to_frame(since=cutoff)
+    
+    def get_historical_arrays(self, hours=24):
+        """Get historical sensor data as array views without copying"""
+        cutoff = self.clock.now() - pd.Timedelta(hours=hours)
+        return self.readings_history.window(since=cutoff)
@@ -0,0 +1,254 @@
+# src/agent/environment/sources.py
+
+import asyncio
+import io
+import queue
+import socket
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+_END = object()
+
+# Seconds between stop checks while the reader waits on a full queue
+_PUT_TIMEOUT = 0.1
+
+
+class SourceExhausted(Exception):
+    """Raised when a sensor source has no more readings"""
+
+
+def _iter_rows(sensor_names, timestamps, values):
+    """Yield (timestamp_ns, readings) for each row of a decoded chunk"""
+    datetimes = timestamps.view('datetime64[ns]').astype('datetime64[us]').tolist()
+    for ts_ns, ts, row in zip(timestamps.tolist(), datetimes, values.tolist()):
+        readings = {'timestamp': ts}
+        readings.update(zip(sensor_names, row))
+        yield ts_ns, readings
+
+
+class _Pacer:
+    """Map recorded timestamps to wall-clock delays for a replay speed.
+
+    ``speed=None`` replays as fast as possible, ``1.0`` in real time and
+    ``k`` at k times real time.
+    """
+
+    def __init__(self, speed=None):
+        if speed is not None and speed <= 0:
+            raise ValueError("speed must be positive or None")
+        self.speed = speed
+        self._origin = None
+
+    def delay(self, timestamp_ns):
+        """Seconds to wait before emitting a reading recorded at ``timestamp_ns``"""
+        if self.speed is None:
+            return 0.0
+        now = time.monotonic()
+        if self._origin is None:
+            self._origin = (now, timestamp_ns)
+            return 0.0
+        start_wall, start_ns = self._origin
+        due = start_wall + (timestamp_ns - start_ns) / 1e9 / self.speed
+        return max(0.0, due - now)
+
+
+class SensorSource:
+    """Base class for pluggable sensor data sources.
+
+    Subclasses implement ``iter_chunks`` yielding ``(timestamps, values)``
+    pairs: an int64 nanosecond timestamp array and a float array of shape
+    ``(rows, len(sensor_names))``. Consumers either pull single readings
+    with ``next_reading`` or stream chunks through ``AsyncSensorStream``.
+    """
+
+    def __init__(self, sensor_names, chunk_size=4096, speed=None, queue_size=4):
+        self.sensor_names = list(sensor_names)
+        self.chunk_size = chunk_size
+        self.speed = speed
+        self.queue_size = queue_size
+        self._readings = None
+
+    def iter_chunks(self):
+        raise NotImplementedError
+
+    def prefetch_chunks(self):
+        """Decode chunks on a background thread through a bounded queue
+
+        The reader blocks once ``queue_size`` chunks are waiting, so decoding
+        never runs further ahead of the consumer than that. The reader stops
+        once the consumer closes the generator or stops early.
+        """
+        chunks = queue.Queue(maxsize=self.queue_size)
+        errors = []
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=_PUT_TIMEOUT)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def reader():
+            try:
+                for chunk in self.iter_chunks():
+                    if not put(chunk):
+                        return
+            except Exception as exc:  # surfaced in the consumer thread
+                errors.append(exc)
+            finally:
+                put(_END)
+
+        threading.Thread(target=reader, name='sensor-source-reader', daemon=True).start()
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is _END:
+                    if errors:
+                        raise errors[0]
+                    return
+                yield chunk
+        finally:
+            stop.set()
+
+    def iter_readings(self):
+        """Yield reading dicts in the read_sensors() format, paced by speed"""
+        pacer = _Pacer(self.speed)
+        for timestamps, values in self.prefetch_chunks():
+            for ts_ns, readings in _iter_rows(self.sensor_names, timestamps, values):
+                wait = pacer.delay(ts_ns)
+                if wait:
+                    time.sleep(wait)
+                yield readings
+
+    def next_reading(self):
+        """Return the next reading dict or raise SourceExhausted"""
+        if self._readings is None:
+            self._readings = self.iter_readings()
+        try:
+            return next(self._readings)
+        except StopIteration:
+            raise SourceExhausted() from None
+
+    def _frame_to_chunk(self, frame, timestamp_column):
+        """Convert a decoded DataFrame into a (timestamps, values) chunk"""
+        timestamps = pd.to_datetime(frame[timestamp_column]).to_numpy(dtype='datetime64[ns]')
+        values = frame[self.sensor_names].to_numpy(dtype=np.float64)
+        return timestamps.view(np.int64), values
+
+
+class ReplaySource(SensorSource):
+    """Replay recorded CSV or Parquet sensor logs in chunks"""
+
+    def __init__(self, path, sensor_names, timestamp_column='timestamp', **kwargs):
+        super().__init__(sensor_names, **kwargs)
+        self.path = Path(path)
+        self.timestamp_column = timestamp_column
+
+    def iter_chunks(self):
+        columns = [self.timestamp_column] + self.sensor_names
+        if self.path.suffix in ('.parquet', '.pq'):
+            try:
+                import pyarrow.parquet as pq
+            except ImportError as exc:
+                raise ImportError("Replaying Parquet logs requires pyarrow") from exc
+
+            for batch in pq.ParquetFile(self.path).iter_batches(
+                batch_size=self.chunk_size,
+                columns=columns
+            ):
+                yield self._frame_to_chunk(batch.to_pandas(), self.timestamp_column)
+        else:
+            for frame in pd.read_csv(self.path, usecols=columns, chunksize=self.chunk_size):
+                yield self._frame_to_chunk(frame, self.timestamp_column)
+
+
+class SocketSource(SensorSource):
+    """Read CSV lines ``timestamp,value,...`` from a local socket
+
+    Stand-in for the plant gateway. Everything received in one ``recv`` is
+    decoded as a block, up to ``chunk_size`` lines at a time.
+    """
+
+    def __init__(self, host, port, sensor_names, timeout=None, **kwargs):
+        super().__init__(sensor_names, **kwargs)
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+
+    def iter_chunks(self):
+        names = ['timestamp'] + self.sensor_names
+        pending = b''
+        with socket.create_connection((self.host, self.port), timeout=self.timeout) as conn:
+            while True:
+                data = conn.recv(65536)
+                if not data:
+                    break
+                lines = (pending + data).split(b'\n')
+                pending = lines.pop()
+                for start in range(0, len(lines), self.chunk_size):
+                    block = b'\n'.join(line for line in lines[start:start + self.chunk_size] if line)
+                    if block:
+                        frame = pd.read_csv(io.BytesIO(block), header=None, names=names)
+                        yield self._frame_to_chunk(frame, 'timestamp')
+
+        if pending.strip():
+            frame = pd.read_csv(io.BytesIO(pending), header=None, names=names)
+            yield self._frame_to_chunk(frame, 'timestamp')
+
+
+class AsyncSensorStream:
+    """Asyncio front end for a SensorSource with a bounded chunk queue.
+
+    A producer task pulls chunks from the source on an executor thread and
+    awaits ``queue.put``, so decoding pauses while the queue is full.
+    """
+
+    def __init__(self, source, maxsize=4, speed=None):
+        self.source = source
+        self.maxsize = maxsize
+        self.speed = source.speed if speed is None else speed
+
+    async def chunks(self):
+        """Yield (timestamps, values) chunks as they are decoded"""
+        loop = asyncio.get_running_loop()
+        chunks = asyncio.Queue(maxsize=self.maxsize)
+        iterator = self.source.iter_chunks()
+
+        async def produce():
+            try:
+                while True:
+                    chunk = await loop.run_in_executor(None, next, iterator, _END)
+                    await chunks.put(chunk)
+                    if chunk is _END:
+                        return
+            except Exception as exc:
+                await chunks.put(exc)
+
+        producer = asyncio.create_task(produce())
+        try:
+            while True:
+                chunk = await chunks.get()
+                if chunk is _END:
+                    return
+                if isinstance(chunk, Exception):
+                    raise chunk
+                yield chunk
+        finally:
+            producer.cancel()
+
+    async def readings(self):
+        """Yield reading dicts paced by the stream speed"""
+        pacer = _Pacer(self.speed)
+        async for timestamps, values in self.chunks():
+            for ts_ns, readings in _iter_rows(self.source.sensor_names, timestamps, values):
+                wait = pacer.delay(ts_ns)
+                if wait:
+                    await asyncio.sleep(wait)
+                yield readings
@@ -0,0 +1,251 @@
+# src/agent/learning/background_trainer.py
+
+import copy
+import queue
+import threading
+import time
+
+# Seconds between liveness checks while waiting on the worker
+POLL_INTERVAL = 0.1
+
+
+class BackgroundTrainer:
+    """Train a learner on a worker thread behind a double-buffered swap.
+
+    Two copies of the learner alternate between serving predictions (the
+    front) and learning (the back). ``submit`` only enqueues the experience;
+    the worker applies queued experiences to the back in batches and swaps
+    it to the front at most every ``swap_interval`` seconds. The retired
+    copy then catches up by replaying the same batch, so neither copy is
+    ever cloned again after start-up. Readers call ``predict_outcomes`` as
+    on the learner and only ever wait for a swap, never for training.
+
+    The queue holds at most ``maxsize`` experiences; when training falls
+    that far behind, ``submit`` blocks until the worker catches up rather
+    than dropping experiences. Once the worker has died, ``submit``,
+    ``flush``, ``checkpoint`` and ``close`` raise instead of waiting on it.
+    """
+
+    def __init__(self, learner, batch_size=256, swap_interval=1.0, maxsize=100000):
+        learner.wait_for_checkpoint()
+        self.batch_size = batch_size
+        self.swap_interval = swap_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+
+        # The journal stays with whichever copy is learning, so every
+        # experience is journaled exactly once
+        self._back = learner
+        self._front = copy.deepcopy(learner, {id(learner.journal): None, id(learner.clock): learner.clock})
+        self._front._journal_options = None
+        self._locks = {id(learner): threading.Lock(), id(self._front): threading.Lock()}
+        self._pending = []
+        self._last_swap = time.monotonic()
+
+        # Statistics
+        self.submitted = 0
+        self.trained = 0
+        self.published = 0
+        self.batches = 0
+        self.swaps = 0
+        self.train_seconds = 0.0
+        self.last_train_seconds = 0.0
+        self.max_train_seconds = 0.0
+        self._oldest_unpublished = None
+        self._published_at = time.monotonic()
+        self._error = None
+
+        self._worker = threading.Thread(target=self._run, name='background-trainer', daemon=True)
+        self._worker.start()
+
+    @property
+    def learner(self):
+        """The copy currently serving predictions"""
+        return self._front
+
+    @property
+    def epoch(self):
+        return self._front.epoch
+
+    def submit(self, state, action, result, reward):
+        """Queue an experience for training without waiting for it to train
+
+        Blocks only while the queue is full (backpressure).
+        """
+        if isinstance(result, dict) and result.get('timestamp') is None:
+            # Both copies must see the same timestamp
+            result = dict(result, timestamp=self.learner.clock.now())
+        self._put(('experience', time.monotonic(), (state, action, result, reward)))
+        self.submitted += 1
+
+    def process_experience(self, state, action, result, reward):
+        """Alias of ``submit`` so the trainer can stand in for a learner"""
+        self.submit(state, action, result, reward)
+
+    def predict_outcomes(self, state, actions=None):
+        return self._read(lambda learner: learner.predict_outcomes(state, actions))
+
+    def predict_outcomes_many(self, states, actions=None):
+        return self._read(lambda learner: learner.predict_outcomes_many(states, actions))
+
+    def predict_outcome(self, state, action):
+        return self._read(lambda learner: learner.predict_outcome(state, action))
+
+    def _read(self, query):
+        while True:
+            learner = self._front
+            with self._locks[id(learner)]:
+                # A swap may have retired this copy before the lock was taken
+                if learner is self._front:
+                    return query(learner)
+
+    def checkpoint(self, path, background=True):
+        """Snapshot the learner on the worker, after every queued experience
+
+        Returns an event that is set once the snapshot has been started (or,
+        with ``background=False``, written).
+        """
+        done = threading.Event()
+        self._put(('checkpoint', time.monotonic(), (path, background, done)))
+        return done
+
+    def flush(self, timeout=None):
+        """Apply and publish everything submitted so far"""
+        done = threading.Event()
+        self._put(('flush', time.monotonic(), done))
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = POLL_INTERVAL if deadline is None else min(POLL_INTERVAL, deadline - time.monotonic())
+            if done.wait(max(wait, 0)):
+                return True
+            self._check_worker()
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def close(self):
+        """Publish outstanding experiences and stop the worker
+
+        Returns the up-to-date copy that owns the journal, for the caller
+        to save and close.
+        """
+        if self._error is not None:
+            raise RuntimeError("Background trainer failed") from self._error
+        if self._worker.is_alive():
+            self._put(('stop', time.monotonic(), None))
+            self._worker.join()
+            if self._error is not None:
+                raise RuntimeError("Background trainer failed") from self._error
+        self._front.wait_for_checkpoint()
+        return self._back
+
+    def _check_worker(self):
+        if self._error is not None:
+            raise RuntimeError("Background trainer failed") from self._error
+        if not self._worker.is_alive():
+            raise RuntimeError("Background trainer is not running")
+
+    def _put(self, item):
+        """Enqueue for the worker, waiting while the queue is full unless it died"""
+        while True:
+            self._check_worker()
+            try:
+                self._queue.put(item, timeout=POLL_INTERVAL)
+                return
+            except queue.Full:
+                continue
+
+    def stats(self):
+        now = time.monotonic()
+        oldest = self._oldest_unpublished
+        return {
+            'submitted': self.submitted,
+            'trained': self.trained,
+            'queued': self._queue.qsize(),
+            'batches': self.batches,
+            'swaps': self.swaps,
+            'train_seconds': self.train_seconds,
+            'last_train_seconds': self.last_train_seconds,
+            'max_train_seconds': self.max_train_seconds,
+            # Age of the oldest experience not yet visible to readers
+            'staleness_seconds': now - oldest if oldest is not None else 0.0,
+            'seconds_since_swap': now - self._published_at,
+            'lag': self.submitted - self.published
+        }
+
+    def _run(self):
+        try:
+            running = True
+            while running:
+                timeout = self.swap_interval if self._pending else None
+                try:
+                    items = [self._queue.get(timeout=timeout)]
+                except queue.Empty:
+                    items = []
+                while len(items) < self.batch_size:
+                    try:
+                        items.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                batch = []
+                for kind, submitted_at, payload in items:
+                    if kind == 'experience':
+                        batch.append(payload)
+                        if self._oldest_unpublished is None:
+                            self._oldest_unpublished = submitted_at
+                        continue
+                    self._train(batch)
+                    batch = []
+                    if kind == 'checkpoint':
+                        path, background, done = payload
+                        self._back.save_model(path, background=background)
+                        done.set()
+                    elif kind == 'flush':
+                        self._swap()
+                        payload.set()
+                    elif kind == 'stop':
+                        self._swap()
+                        running = False
+                self._train(batch)
+
+                if self._pending and time.monotonic() - self._last_swap >= self.swap_interval:
+                    self._swap()
+        except Exception as exc:
+            self._error = exc
+            raise
+
+    def _train(self, batch):
+        if not batch:
+            return
+        start = time.perf_counter()
+        for experience in batch:
+            self._back.process_experience(*experience)
+        elapsed = time.perf_counter() - start
+        self._pending.extend(batch)
+        self.trained += len(batch)
+        self.batches += 1
+        self.train_seconds += elapsed
+        self.last_train_seconds = elapsed
+        self.max_train_seconds = max(self.max_train_seconds, elapsed)
+
+    def _swap(self):
+        """Publish the back copy, then bring the retired front up to date"""
+        now = time.monotonic()
+        self._last_swap = now
+        if not self._pending:
+            return
+        retired = self._front
+        self._front = self._back
+        self._published_at = now
+        self._oldest_unpublished = None
+        self.published += len(self._pending)
+        self.swaps += 1
+
+        # Wait for a reader still using the retired copy, then replay
+        with self._locks[id(retired)]:
+            for experience in self._pending:
+                retired.process_experience(*experience)
+        self._pending = []
+        self._front.wait_for_checkpoint()
+        retired.journal, self._front.journal = self._front.journal, None
+        retired._journal_options, self._front._journal_options = self._front._journal_options, None
+        self._back = retired
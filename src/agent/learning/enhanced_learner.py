@@ -1,21 +1,82 @@
 # src/agent/learning/enhanced_learner.py
 
-from sklearn.ensemble import RandomForestRegressor
-from tensorflow.keras.models import Sequential
-from tensorflow.keras.layers import Dense, LSTM
+import sys
+import time
+
 import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .model_registry import ModelRegistry
+
+class _SlidingWindow:
+    """Most recent ``capacity`` training rows with amortized O(1) appends"""
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self._X = None
+        self._y = None
+        self._start = 0
+        self._end = 0
+        
+    def __len__(self):
+        return self._end - self._start
+        
+    def extend(self, X, y):
+        X = np.asarray(X, dtype=np.float32)[-self.capacity:]
+        y = np.asarray(y, dtype=np.float32)[-self.capacity:]
+        if self._X is None:
+            self._X = np.empty((2 * self.capacity,) + X.shape[1:], dtype=np.float32)
+            self._y = np.empty(2 * self.capacity, dtype=np.float32)
+        if self._end + len(X) > len(self._X):
+            # Move the retained rows to the front to make room
+            keep = min(len(self), self.capacity - len(X))
+            self._X[:keep] = self._X[self._end - keep:self._end]
+            self._y[:keep] = self._y[self._end - keep:self._end]
+            self._start, self._end = 0, keep
+        self._X[self._end:self._end + len(X)] = X
+        self._y[self._end:self._end + len(X)] = y
+        self._end += len(X)
+        self._start = max(self._start, self._end - self.capacity)
+        
+    @property
+    def X(self):
+        return self._X[self._start:self._end]
+        
+    @property
+    def y(self):
+        return self._y[self._start:self._end]
+        
+    def with_tail(self, X, y, rows=None):
+        """Prepend the last ``rows`` retained rows (all when None) to X, y"""
+        if self._X is None or rows == 0:
+            return X, y
+        start = self._start if rows is None else max(self._start, self._end - rows)
+        return (np.concatenate([self._X[start:self._end], X]),
+                np.concatenate([self._y[start:self._end], y]))
 
 class EnhancedLearner:
-    def __init__(self):
-        self.models = {
-            'rf': self._create_rf_model(),
-            'nn': self._create_nn_model(),
-            'lstm': self._create_lstm_model()
-        }
-        self.active_model = 'rf'  # default model
+    def __init__(self, active_model='rf', sequence_length=10, window_size=50000,
+                 trees_per_update=10, max_trees=200, replay_ratio=1.0, batch_size=64):
+        # Models are built, and their backends imported, on first use
+        self.models = ModelRegistry()
+        self.models.register('rf', self._create_rf_model)
+        self.models.register('nn', self._create_nn_model)
+        self.models.register('lstm', self._create_lstm_model)
+        self.active_model = active_model  # default model
+        self.sequence_length = sequence_length
+        
+        # Incremental training: recent rows, forest growth and replay settings
+        self.training_window = _SlidingWindow(window_size)
+        self.trees_per_update = trees_per_update
+        self.max_trees = max_trees
+        self.replay_ratio = replay_ratio
+        self.batch_size = batch_size
+        self._rng = np.random.default_rng(42)
         
     def _create_rf_model(self):
         """Create Random Forest model"""
+        from sklearn.ensemble import RandomForestRegressor
+        
         return RandomForestRegressor(
             n_estimators=100,
             max_depth=10,
@@ -24,6 +85,9 @@ class EnhancedLearner:
         
     def _create_nn_model(self):
         """Create Neural Network model"""
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Dense
+        
         model = Sequential([
             Dense(64, activation='relu', input_shape=(3,)),
             Dense(32, activation='relu'),
@@ -35,39 +99,212 @@ class EnhancedLearner:
         
     def _create_lstm_model(self):
         """Create LSTM model for sequence learning"""
+        from tensorflow.keras.models import Sequential
+        from tensorflow.keras.layers import Dense, LSTM
+        
         model = Sequential([
-            LSTM(64, input_shape=(10, 3)),
+            LSTM(64, input_shape=(self.sequence_length, 3)),
             Dense(32, activation='relu'),
             Dense(1, activation='linear')
         ])
         model.compile(optimizer='adam', loss='mse')
         return model
         
-    def train(self, X, y, model_type=None):
-        """Train specified model"""
+    def train(self, X, y, model_type=None, incremental=False):
+        """Train specified model; ``incremental`` updates it with X, y only"""
+        if incremental:
+            return self.partial_train(X, y, model_type)
         if model_type:
             self.active_model = model_type
             
         model = self.models[self.active_model]
         
         if self.active_model == 'lstm':
-            # Reshape data for LSTM
+            # Reshape data for LSTM; each window predicts its last row's target
             X = self._prepare_sequences(X)
+            y = np.asarray(y)[len(y) - len(X):]
             
         return model.fit(X, y)
         
+    def partial_train(self, X_new, y_new, model_type=None):
+        """Update the active model with new data only
+
+        The random forest grows ``trees_per_update`` warm-started trees fit
+        on the new rows and drops its oldest trees beyond ``max_trees``.
+        Neural models take one pass of mini-batches over the new rows plus
+        ``replay_ratio`` times as many rows sampled from the training
+        window. Cost is proportional to the new data, not the history.
+        The LSTM only trains once its retained and new rows fill a window;
+        until then the rows are kept as context and None is returned.
+        """
+        if model_type:
+            self.active_model = model_type
+            
+        X_new = np.asarray(X_new, dtype=np.float32)
+        y_new = np.asarray(y_new, dtype=np.float32)
+        
+        if self.active_model == 'rf':
+            result = self._partial_train_forest(X_new, y_new)
+        elif self.active_model == 'lstm':
+            # Prepend the context rows needed for windows ending in new data
+            X_fit, y_fit = self.training_window.with_tail(X_new, y_new, self.sequence_length - 1)
+            if len(X_fit) < self.sequence_length:
+                self.training_window.extend(X_new, y_new)
+                return None
+            result = self.models['lstm'].fit(
+                self._prepare_sequences(X_fit),
+                y_fit[self.sequence_length - 1:],
+                epochs=1,
+                batch_size=self.batch_size,
+                verbose=0
+            )
+        else:
+            X_fit, y_fit = self._with_replay(X_new, y_new)
+            result = self.models[self.active_model].fit(
+                X_fit, y_fit, epochs=1, batch_size=self.batch_size, verbose=0
+            )
+            
+        self.training_window.extend(X_new, y_new)
+        return result
+        
+    def _partial_train_forest(self, X_new, y_new):
+        model = self.models['rf']
+        if not hasattr(model, 'estimators_'):
+            # First fit trains the full forest on what is available
+            return model.fit(*self.training_window.with_tail(X_new, y_new))
+            
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + self.trees_per_update)
+        model.fit(X_new, y_new)
+        if len(model.estimators_) > self.max_trees:
+            # Forget the oldest trees so the forest tracks the recent horizon
+            model.estimators_ = model.estimators_[-self.max_trees:]
+            model.set_params(n_estimators=len(model.estimators_))
+        return model
+        
+    def _with_replay(self, X_new, y_new):
+        """Append rows sampled from the training window to the new rows"""
+        n_replay = min(int(len(X_new) * self.replay_ratio), len(self.training_window))
+        if n_replay == 0:
+            return X_new, y_new
+        idx = self._rng.choice(len(self.training_window), size=n_replay, replace=False)
+        return (np.concatenate([X_new, self.training_window.X[idx]]),
+                np.concatenate([y_new, self.training_window.y[idx]]))
+        
+    def train_stream(self, X, y, batch_size=256, epochs=1):
+        """Train the LSTM from streamed window batches in bounded memory
+
+        ``X`` and ``y`` are arrays (memory-mapped ones are read slice by
+        slice) or a zero-argument callable returning an iterator of
+        ``(X_chunk, y_chunk)`` pairs, which is called again every epoch.
+        """
+        import tensorflow as tf
+        
+        self.active_model = 'lstm'
+        model = self.models['lstm']
+        n_features = model.input_shape[-1]
+        
+        def batches():
+            if callable(X):
+                return self.iter_sequence_batches(X(), batch_size=batch_size)
+            return self.iter_sequence_batches(X, y, batch_size=batch_size)
+            
+        dataset = tf.data.Dataset.from_generator(
+            batches,
+            output_signature=(
+                tf.TensorSpec(shape=(None, self.sequence_length, n_features), dtype=tf.float32),
+                tf.TensorSpec(shape=(None,), dtype=tf.float32)
+            )
+        ).prefetch(2)
+        return model.fit(dataset, epochs=epochs)
+        
     def predict(self, X):
         """Make prediction using active model"""
         model = self.models[self.active_model]
+        return model.predict(self.prepare_inputs(X))
         
-        if self.active_model == 'lstm':
-            X = self._prepare_sequences(X)
+    def prepare_inputs(self, X, model_type=None):
+        """Turn rows into a model's input (windows for the LSTM), by default the active one"""
+        if (model_type or self.active_model) == 'lstm':
+            return self._prepare_sequences(np.asarray(X, dtype=np.float32))
+        return np.asarray(X)
+        
+    def predict_batch(self, inputs, model_type=None):
+        """Run a model (by default the active one) once on already prepared inputs"""
+        model = self.models[model_type or self.active_model]
+        if hasattr(model, 'predict_on_batch'):
+            # Keras: skip the per-call dataset machinery of predict()
+            return np.asarray(model.predict_on_batch(inputs)).reshape(len(inputs), -1).squeeze(-1)
+        return model.predict(inputs)
+        
+    def _prepare_sequences(self, data, sequence_length=None):
+        """Prepare data for LSTM as a zero-copy view of sliding windows"""
+        if sequence_length is None:
+            sequence_length = self.sequence_length
+        data = np.asarray(data)
+        windows = sliding_window_view(data, sequence_length, axis=0)
+        if data.ndim > 1:
+            # (windows, features, length) -> (windows, length, features)
+            windows = windows.transpose(0, 2, 1)
+        return windows
+        
+    def iter_sequence_batches(self, X, y=None, batch_size=256, chunk_rows=65536):
+        """Yield ``(windows, targets)`` batches without materializing all windows
+
+        ``X`` is an array, possibly memory-mapped, with ``y`` aligned to its
+        rows; or ``y`` is None and ``X`` is an iterable of ``(X_chunk,
+        y_chunk)`` pairs. The last ``sequence_length - 1`` rows of each chunk
+        are carried over so windows spanning chunks are not lost. Only one
+        chunk and one batch are held in memory at a time.
+        """
+        length = self.sequence_length
+        if y is not None:
+            chunks = ((X[start:start + chunk_rows], y[start:start + chunk_rows])
+                      for start in range(0, len(X), chunk_rows))
+        else:
+            chunks = X
             
-        return model.predict(X)
-        
-    def _prepare_sequences(self, data, sequence_length=10):
-        """Prepare data for LSTM"""
-        sequences = []
-        for i in range(len(data) - sequence_length + 1):
-            sequences.append(data[i:i + sequence_length])
-        return np.array(sequences)
+        carry_X = carry_y = None
+        for X_chunk, y_chunk in chunks:
+            X_chunk = np.asarray(X_chunk, dtype=np.float32)
+            y_chunk = np.asarray(y_chunk, dtype=np.float32)
+            if carry_X is not None:
+                X_chunk = np.concatenate([carry_X, X_chunk])
+                y_chunk = np.concatenate([carry_y, y_chunk])
+            if len(X_chunk) >= length:
+                windows = self._prepare_sequences(X_chunk, length)
+                targets = y_chunk[length - 1:]
+                for start in range(0, len(windows), batch_size):
+                    yield (np.ascontiguousarray(windows[start:start + batch_size]),
+                           targets[start:start + batch_size])
+            carry_X = X_chunk[-(length - 1):] if length > 1 else X_chunk[:0]
+            carry_y = y_chunk[-(length - 1):] if length > 1 else y_chunk[:0]
+
+
+def _max_rss_mb():
+    """Peak resident set size of this process in MB, NaN where unavailable"""
+    try:
+        import resource
+    except ImportError:
+        # Windows has no resource module
+        return float('nan')
+    # ru_maxrss is reported in kilobytes on Linux and bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / (1024 * 1024) if sys.platform == 'darwin' else rss / 1024
+
+
+def probe_startup(model_type):
+    """Build one model in this process and report time and peak RSS"""
+    baseline_rss = _max_rss_mb()
+    start = time.perf_counter()
+    learner = EnhancedLearner(active_model=model_type)
+    created = time.perf_counter()
+    learner.models[model_type]
+    built = time.perf_counter()
+    return {
+        'model': model_type,
+        'init_seconds': created - start,
+        'build_seconds': built - created,
+        'baseline_rss_mb': baseline_rss,
+        'max_rss_mb': _max_rss_mb()
+    }
+
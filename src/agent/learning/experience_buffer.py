@@ -0,0 +1,157 @@
+# src/agent/learning/experience_buffer.py
+
+import numpy as np
+
+
+class FIFOEviction:
+    """Overwrite the oldest experience"""
+
+    def select_slot(self, buffer, timestamp_ns):
+        return buffer.seen % buffer.capacity
+
+
+class ReservoirEviction:
+    """Keep a uniform sample of every experience seen so far"""
+
+    def __init__(self, seed=None):
+        self.rng = np.random.default_rng(seed)
+
+    def select_slot(self, buffer, timestamp_ns):
+        if buffer.size < buffer.capacity:
+            return buffer.size
+        slot = int(self.rng.integers(0, buffer.seen + 1))
+        return slot if slot < buffer.capacity else None
+
+
+class TimeDecayEviction:
+    """Evict with a probability that grows with age.
+
+    A random sample of slots is drawn and one of them is evicted with
+    probability proportional to ``1 - 2 ** (-age / half_life)``, so recent
+    experiences are almost always kept while old ones thin out gradually.
+    """
+
+    def __init__(self, half_life=3600.0, sample_size=16, seed=None):
+        self.half_life = half_life
+        self.sample_size = sample_size
+        self.rng = np.random.default_rng(seed)
+
+    def select_slot(self, buffer, timestamp_ns):
+        if buffer.size < buffer.capacity:
+            return buffer.size
+        candidates = self.rng.integers(0, buffer.capacity, size=self.sample_size)
+        age = np.maximum(timestamp_ns - buffer.timestamps[candidates], 0) / 1e9
+        weights = 1.0 - np.exp2(-age / self.half_life)
+        if weights.sum() <= 0:
+            return int(candidates[0])
+        return int(self.rng.choice(candidates, p=weights / weights.sum()))
+
+
+EVICTION_POLICIES = {
+    'fifo': FIFOEviction,
+    'reservoir': ReservoirEviction,
+    'time_decay': TimeDecayEviction
+}
+
+
+class ExperienceBuffer:
+    """Fixed-capacity experience storage in typed NumPy columns.
+
+    States are float32 vectors, actions int8 ids, rewards float32 and
+    timestamps int64 nanoseconds. The eviction policy picks the slot each
+    new experience is written to once the buffer is full (or drops it).
+    """
+
+    # Bytes per experience in the buffer columns, excluding the state vector
+    ROW_BYTES = 1 + 4 + 8
+
+    def __init__(self, capacity=100000, eviction='fifo', **policy_kwargs):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = int(capacity)
+        if isinstance(eviction, str):
+            if eviction not in EVICTION_POLICIES:
+                raise ValueError(f"Unknown eviction policy: {eviction}")
+            eviction = EVICTION_POLICIES[eviction](**policy_kwargs)
+        self.eviction = eviction
+        self.states = None
+        self.actions = np.zeros(self.capacity, dtype=np.int8)
+        self.rewards = np.zeros(self.capacity, dtype=np.float32)
+        self.timestamps = np.zeros(self.capacity, dtype=np.int64)
+        self.size = 0
+        self.seen = 0
+
+    def __len__(self):
+        return self.size
+
+    @staticmethod
+    def capacity_for_memory(max_bytes, state_dim, index_bytes_per_row=None):
+        """Largest capacity whose buffer and index fit in ``max_bytes``
+
+        The KD-tree index keeps float64 copies of the states, row
+        bookkeeping and slack for tombstoned rows, estimated at roughly
+        three times its live data unless ``index_bytes_per_row`` is given.
+        """
+        if index_bytes_per_row is None:
+            index_bytes_per_row = 3 * (8 * state_dim + 8 + 8 + 2) + 8 * state_dim + 8
+        row_bytes = 4 * state_dim + ExperienceBuffer.ROW_BYTES + index_bytes_per_row
+        return max(1, int(max_bytes // row_bytes))
+
+    def add(self, state_vector, action_id, reward, timestamp):
+        """Store one experience; ``timestamp`` may be a datetime or int64 ns
+
+        Returns ``(slot, replaced)`` where ``replaced`` tells whether an
+        older experience was evicted, or ``(None, False)`` when the policy
+        drops the new experience.
+        """
+        if self.states is None:
+            self.states = np.zeros((self.capacity, len(state_vector)), dtype=np.float32)
+
+        if isinstance(timestamp, (int, np.integer)):
+            timestamp_ns = timestamp
+        else:
+            timestamp_ns = np.datetime64(timestamp, 'ns').astype(np.int64)
+
+        slot = self.eviction.select_slot(self, timestamp_ns)
+        self.seen += 1
+        if slot is None:
+            return None, False
+
+        replaced = slot < self.size
+        self.states[slot] = state_vector
+        self.actions[slot] = action_id
+        self.rewards[slot] = reward
+        self.timestamps[slot] = timestamp_ns
+        if not replaced:
+            self.size += 1
+        return slot, replaced
+
+    def restore(self, states, actions, rewards, timestamps, seen, capacity=None):
+        """Load saved columns (possibly memory-mapped) into the buffer"""
+        if capacity is not None and capacity != self.capacity:
+            self.capacity = int(capacity)
+            self.actions = np.zeros(self.capacity, dtype=np.int8)
+            self.rewards = np.zeros(self.capacity, dtype=np.float32)
+            self.timestamps = np.zeros(self.capacity, dtype=np.int64)
+        n = len(actions)
+        if n > self.capacity:
+            raise ValueError(f"Snapshot holds {n} experiences, capacity is {self.capacity}")
+        self.states = np.zeros((self.capacity, states.shape[1]), dtype=np.float32)
+        self.states[:n] = states
+        self.actions[:n] = actions
+        self.rewards[:n] = rewards
+        self.timestamps[:n] = timestamps
+        self.size = n
+        self.seen = seen
+
+    def clear(self):
+        self.size = 0
+        self.seen = 0
+
+    @property
+    def nbytes(self):
+        """Memory held by the buffer columns"""
+        total = self.actions.nbytes + self.rewards.nbytes + self.timestamps.nbytes
+        if self.states is not None:
+            total += self.states.nbytes
+        return total
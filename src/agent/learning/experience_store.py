@@ -0,0 +1,391 @@
+# src/agent/learning/experience_store.py
+
+import numpy as np
+from sklearn.neighbors import KDTree
+
+
+class _ActionPartition:
+    """State vectors and rewards of one action in contiguous arrays.
+
+    Rows are indexed by a forest of static KD-trees whose sizes follow a
+    binary counter (Bentley-Saxe): new rows collect in a small unindexed
+    tail, and a full tail is merged with the equally sized trees below it
+    into one new tree. Inserts are amortized O(log n) and a query touches
+    O(log n) trees plus the tail.
+
+    Removed rows are tombstoned. A tree is rebuilt from its live rows once
+    half of them are dead, and the arrays are compacted once dead rows
+    outnumber live ones.
+    """
+
+    def __init__(self, dim, block_size):
+        self.block_size = block_size
+        self.points = np.empty((block_size, dim))
+        self.rewards = np.empty(block_size)
+        self.slots = np.empty(block_size, dtype=np.int64)
+        self.alive = np.zeros(block_size, dtype=bool)
+        self.row_level = np.full(block_size, -1, dtype=np.int8)
+        self.size = 0
+        self.count = 0
+        self.indexed = 0
+        self.levels = []
+
+    def __len__(self):
+        return self.count
+
+    def append(self, point, reward, slot):
+        """Store one row and return its row id"""
+        if self.size == len(self.points):
+            self._resize(2 * len(self.points))
+        row = self.size
+        self.points[row] = point
+        self.rewards[row] = reward
+        self.slots[row] = slot
+        self.alive[row] = True
+        self.row_level[row] = -1
+        self.size += 1
+        self.count += 1
+        if self.size - self.indexed >= self.block_size:
+            self._merge_tail()
+        return row
+
+    @classmethod
+    def from_arrays(cls, points, rewards, slots, block_size):
+        """Bulk-load a partition, indexing all rows in one tree"""
+        partition = cls(points.shape[1], block_size)
+        n = len(points)
+        partition._resize(max(block_size, n))
+        partition.points[:n] = points
+        partition.rewards[:n] = rewards
+        partition.slots[:n] = slots
+        partition.alive[:n] = True
+        partition.size = partition.count = n
+        partition.compact()
+        return partition
+
+    def remove(self, row):
+        """Tombstone one row"""
+        self.alive[row] = False
+        self.count -= 1
+        level = self.row_level[row]
+        if level >= 0:
+            entry = self.levels[level]
+            entry[2] += 1
+            if 2 * entry[2] > len(entry[1]):
+                self._rebuild_level(level)
+
+    def _resize(self, capacity):
+        for name in ('points', 'rewards', 'slots', 'alive', 'row_level'):
+            old = getattr(self, name)
+            new = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[:self.size] = old[:self.size]
+            setattr(self, name, new)
+
+    def _build_level(self, level, rows):
+        if len(rows) == 0:
+            self.levels[level] = None
+            return
+        self.levels[level] = [KDTree(self.points[rows]), rows, 0]
+        self.row_level[rows] = level
+
+    def _rebuild_level(self, level):
+        rows = self.levels[level][1]
+        self._build_level(level, rows[self.alive[rows]])
+
+    def _merge_tail(self):
+        """Index the tail, merging it with every full level it carries into"""
+        rows = np.arange(self.indexed, self.size)
+        rows = rows[self.alive[rows]]
+        level = 0
+        while level < len(self.levels) and self.levels[level] is not None:
+            level_rows = self.levels[level][1]
+            rows = np.concatenate([level_rows[self.alive[level_rows]], rows])
+            self.levels[level] = None
+            level += 1
+        if level == len(self.levels):
+            self.levels.append(None)
+        self._build_level(level, rows)
+        self.indexed = self.size
+
+    def needs_compaction(self):
+        return self.size - self.count > max(self.block_size, self.count)
+
+    def compact(self):
+        """Drop dead rows and reindex; returns (slots, new_rows) of live rows"""
+        keep = np.flatnonzero(self.alive[:self.size])
+        n = len(keep)
+        self.points[:n] = self.points[keep]
+        self.rewards[:n] = self.rewards[keep]
+        self.slots[:n] = self.slots[keep]
+        self.alive[:n] = True
+        self.alive[n:] = False
+        self.size = self.count = n
+        self._resize(max(self.block_size, 2 * n))
+
+        self.levels = []
+        self.indexed = 0
+        self.row_level[:n] = -1
+        if n >= self.block_size:
+            level = int(np.ceil(np.log2(n / self.block_size)))
+            self.levels = [None] * (level + 1)
+            self._build_level(level, np.arange(n))
+            self.indexed = n
+        return self.slots[:n], np.arange(n)
+
+    def nearest(self, point, k):
+        """Row ids of the ``k`` nearest live rows"""
+        k = min(k, self.count)
+        if k == 0:
+            return np.empty(0, dtype=np.int64)
+
+        candidate_rows = []
+        candidate_dists = []
+        for entry in self.levels:
+            if entry is None:
+                continue
+            tree, rows, dead = entry
+            # Fetch more than k while tombstones hide some of the results
+            limit = min(len(rows), k + dead)
+            fetch = min(k, limit)
+            while True:
+                dists, idx = tree.query(point[None, :], k=fetch)
+                found = rows[idx[0]]
+                live = self.alive[found]
+                if live.sum() >= k or fetch >= limit:
+                    break
+                fetch = min(2 * fetch, limit)
+            candidate_rows.append(found[live])
+            candidate_dists.append(dists[0][live])
+
+        if self.indexed < self.size:
+            tail = np.arange(self.indexed, self.size)
+            tail = tail[self.alive[tail]]
+            candidate_rows.append(tail)
+            candidate_dists.append(np.sqrt(((self.points[tail] - point) ** 2).sum(axis=1)))
+
+        rows = np.concatenate(candidate_rows)
+        dists = np.concatenate(candidate_dists)
+        if len(rows) > k:
+            rows = rows[np.argpartition(dists, k - 1)[:k]]
+        return rows
+
+    def nearest_many(self, points, k):
+        """Row ids of the ``k`` nearest live rows for each of several points
+
+        Returns an (points, min(k, live rows)) array. Each tree is queried
+        once for the whole batch, which amortizes the per-query overhead.
+        """
+        k = min(k, self.count)
+        m = len(points)
+        if k == 0:
+            return np.empty((m, 0), dtype=np.int64)
+
+        candidate_rows = []
+        candidate_dists = []
+        for entry in self.levels:
+            if entry is None:
+                continue
+            tree, rows, dead = entry
+            limit = min(len(rows), k + dead)
+            needed = min(k, len(rows) - dead)
+            fetch = min(k, limit)
+            while True:
+                dists, idx = tree.query(points, k=fetch)
+                found = rows[idx]
+                live = self.alive[found]
+                if fetch >= limit or (live.sum(axis=1) >= needed).all():
+                    break
+                fetch = min(2 * fetch, limit)
+            candidate_rows.append(found)
+            candidate_dists.append(np.where(live, dists, np.inf))
+
+        if self.indexed < self.size:
+            tail = np.arange(self.indexed, self.size)
+            tail = tail[self.alive[tail]]
+            diff = self.points[tail][None, :, :] - points[:, None, :]
+            candidate_rows.append(np.broadcast_to(tail, (m, len(tail))))
+            candidate_dists.append(np.sqrt((diff ** 2).sum(axis=2)))
+
+        rows = np.concatenate(candidate_rows, axis=1)
+        dists = np.concatenate(candidate_dists, axis=1)
+        if rows.shape[1] > k:
+            best = np.argpartition(dists, k - 1, axis=1)[:, :k]
+            rows = np.take_along_axis(rows, best, axis=1)
+        return rows
+
+    @property
+    def nbytes(self):
+        total = sum(getattr(self, name).nbytes
+                    for name in ('points', 'rewards', 'slots', 'alive', 'row_level'))
+        for entry in self.levels:
+            if entry is not None:
+                total += entry[1].nbytes
+                total += sum(array.nbytes for array in entry[0].get_arrays())
+        return total
+
+
+class ExperienceStore:
+    """Nearest-neighbour index over experiences, partitioned by action.
+
+    Experiences are keyed by their slot in the learner's experience buffer
+    so evicted slots can be removed from the index. States are turned into
+    vectors over ``state_keys`` (inferred from the first state's numeric
+    entries when not given); the index divides them by ``state_scale`` so
+    differently scaled sensors weigh comparably.
+    """
+
+    # Action ids are int8, so per-action statistics fit fixed-size arrays
+    MAX_ACTIONS = 128
+
+    def __init__(self, state_keys=None, state_scale=None, block_size=256):
+        self.state_keys = list(state_keys) if state_keys is not None else None
+        self.state_scale = state_scale
+        self.block_size = block_size
+        self.partitions = {}
+        self.total = 0
+        # Running per-action counts and reward sums over indexed experiences
+        self.counts = np.zeros(self.MAX_ACTIONS, dtype=np.int64)
+        self.reward_sums = np.zeros(self.MAX_ACTIONS)
+        self._slot_action = np.full(0, -1, dtype=np.int16)
+        self._slot_row = np.empty(0, dtype=np.int64)
+
+    def __len__(self):
+        return self.total
+
+    def state_vector(self, state):
+        """Convert a state dict into a feature vector over state_keys"""
+        if self.state_keys is None:
+            self.state_keys = [
+                key for key, value in state.items()
+                if isinstance(value, (int, float, np.number)) and not isinstance(value, bool)
+            ]
+        return np.array([state[key] for key in self.state_keys], dtype=np.float64)
+
+    def _scaled(self, vector):
+        if self.state_scale is None:
+            return vector
+        return vector / self.state_scale
+
+    def _ensure_slot(self, slot):
+        if slot >= len(self._slot_row):
+            capacity = max(2 * len(self._slot_row), slot + 1, self.block_size)
+            actions = np.full(capacity, -1, dtype=np.int16)
+            actions[:len(self._slot_action)] = self._slot_action
+            rows = np.empty(capacity, dtype=np.int64)
+            rows[:len(self._slot_row)] = self._slot_row
+            self._slot_action, self._slot_row = actions, rows
+
+    def add(self, vector, action, reward, slot):
+        """Index one experience stored in buffer ``slot``"""
+        self._ensure_slot(slot)
+        if self._slot_action[slot] >= 0:
+            self.remove(slot)
+
+        point = self._scaled(np.asarray(vector, dtype=np.float64))
+        partition = self.partitions.get(action)
+        if partition is None:
+            partition = _ActionPartition(len(point), self.block_size)
+            self.partitions[action] = partition
+
+        self._slot_action[slot] = action
+        self._slot_row[slot] = partition.append(point, reward, slot)
+        self.counts[action] += 1
+        self.reward_sums[action] += reward
+        self.total += 1
+
+    def remove(self, slot):
+        """Drop the experience stored in buffer ``slot`` from the index"""
+        if slot >= len(self._slot_action) or self._slot_action[slot] < 0:
+            return
+        action = int(self._slot_action[slot])
+        partition = self.partitions[action]
+        row = self._slot_row[slot]
+        partition.remove(row)
+        self.counts[action] -= 1
+        self.reward_sums[action] -= partition.rewards[row]
+        self._slot_action[slot] = -1
+        self.total -= 1
+        if partition.needs_compaction():
+            slots, rows = partition.compact()
+            self._slot_row[slots] = rows
+
+    def rebuild(self, states, actions, rewards):
+        """Index whole buffer columns at once; row ``i`` is stored in slot ``i``"""
+        self.clear()
+        n = len(actions)
+        self._ensure_slot(max(n - 1, 0))
+        points = self._scaled(np.asarray(states, dtype=np.float64))
+        actions = np.asarray(actions)
+        rewards = np.asarray(rewards, dtype=np.float64)
+
+        # Per-action statistics in one vectorized group-by
+        self.counts[:] = np.bincount(actions, minlength=self.MAX_ACTIONS)
+        self.reward_sums[:] = np.bincount(actions, weights=rewards, minlength=self.MAX_ACTIONS)
+        self.total = n
+
+        order = np.argsort(actions, kind='stable')
+        bounds = np.flatnonzero(np.diff(actions[order])) + 1
+        for slots in np.split(order, bounds):
+            if len(slots) == 0:
+                continue
+            action = int(actions[slots[0]])
+            self.partitions[action] = _ActionPartition.from_arrays(
+                points[slots], rewards[slots], slots, self.block_size
+            )
+            self._slot_action[slots] = action
+            self._slot_row[slots] = np.arange(len(slots))
+
+    def clear(self):
+        self.partitions = {}
+        self.total = 0
+        self.counts[:] = 0
+        self.reward_sums[:] = 0
+        self._slot_action[:] = -1
+
+    def count(self, action):
+        """Number of indexed experiences for ``action``"""
+        return int(self.counts[action])
+
+    def neighbour_rewards(self, state, actions, k):
+        """Rewards of the ``k`` nearest experiences of each action
+
+        Returns ``(action_ids, rewards)`` as flat arrays so callers can
+        group them by action with ``np.bincount``.
+        """
+        point = self._scaled(self.state_vector(state))
+        labels = []
+        rewards = []
+        for action in actions:
+            partition = self.partitions.get(action)
+            if partition is None or len(partition) == 0:
+                continue
+            rows = partition.nearest(point, k)
+            labels.append(np.full(len(rows), action, dtype=np.int64))
+            rewards.append(partition.rewards[rows])
+        if not labels:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        return np.concatenate(labels), np.concatenate(rewards)
+
+    def neighbour_reward_sums(self, states, actions, k):
+        """Sum and count of the ``k`` nearest rewards per state and action
+
+        Returns ``(sums, found)``: an (states, actions) array of reward
+        sums and the number of neighbours found per action.
+        """
+        points = self._scaled(np.array([self.state_vector(state) for state in states]))
+        sums = np.zeros((len(states), len(actions)))
+        found = np.zeros(len(actions), dtype=np.int64)
+        for j, action in enumerate(actions):
+            partition = self.partitions.get(action)
+            if partition is None or len(partition) == 0:
+                continue
+            rows = partition.nearest_many(points, k)
+            sums[:, j] = partition.rewards[rows].sum(axis=1)
+            found[j] = rows.shape[1]
+        return sums, found
+
+    @property
+    def nbytes(self):
+        """Approximate memory held by the index"""
+        return (self._slot_action.nbytes + self._slot_row.nbytes
+                + sum(partition.nbytes for partition in self.partitions.values()))
@@ -0,0 +1,144 @@
+# src/agent/learning/inference_server.py
+
+from concurrent.futures import Future
+import logging
+import queue
+import threading
+import time
+
+import numpy as np
+
+from ..monitoring.histogram import Histogram, exponential_buckets
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class BatchInferenceServer:
+    """Coalesce concurrent predict requests into batched model calls.
+
+    Callers submit inputs from any thread and get a Future (or block in
+    ``predict``). A worker thread takes the first waiting request, gathers
+    more until ``max_batch_size`` rows are collected or ``max_delay_ms``
+    has passed since that request arrived, runs one ``predict_batch`` on
+    the model that was active when the requests were submitted and
+    scatters the rows back to each caller. Requests for different models
+    never share a batch.
+    """
+
+    def __init__(self, learner, max_batch_size=64, max_delay_ms=2.0, maxsize=4096):
+        self.learner = learner
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay_ms / 1000.0
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._carry = None
+        self._closed = False
+        self._lock = threading.Lock()
+
+        self.batch_sizes = Histogram(exponential_buckets(1, 2, 12))
+        # Seconds from submit to the start of the batch that served it
+        self.queue_latency = Histogram(exponential_buckets(1e-5, 2, 20))
+        self.batches = 0
+
+        self._worker = threading.Thread(target=self._run, name='batch-inference', daemon=True)
+        self._worker.start()
+
+    def submit(self, X):
+        """Queue rows for prediction and return a Future of their outputs
+
+        Raises RuntimeError once the server is closed, and queue.Full when
+        ``maxsize`` requests are already waiting. Cancelling the Future
+        before its batch starts removes it from the batch.
+        """
+        if self._closed:
+            raise RuntimeError("BatchInferenceServer is closed")
+        # Windowing (for the LSTM) happens here so requests never share
+        # windows; the batch must then run on the same model
+        model_type = self.learner.active_model
+        inputs = self.learner.prepare_inputs(X, model_type)
+        future = Future()
+        if len(inputs) == 0:
+            future.set_result(np.empty(0))
+            return future
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("BatchInferenceServer is closed")
+            self._queue.put_nowait((inputs, future, time.perf_counter(), model_type))
+        return future
+
+    def predict(self, X, timeout=None):
+        return self.submit(X).result(timeout)
+
+    def close(self):
+        """Serve the requests already queued, then stop the worker"""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._queue.put(_STOP)
+        self._worker.join()
+
+    def stats(self):
+        return {
+            'batches': self.batches,
+            'batch_size': self.batch_sizes.summary(),
+            'queue_latency_seconds': self.queue_latency.summary()
+        }
+
+    def _collect(self):
+        """Block for one request, then gather more until full or timed out"""
+        first = self._carry if self._carry is not None else self._queue.get()
+        self._carry = None
+        if first is _STOP:
+            return None
+        requests = [first]
+        rows = len(first[0])
+        deadline = first[2] + self.max_delay
+        while rows < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                request = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if request is _STOP or request[3] != first[3] or rows + len(request[0]) > self.max_batch_size:
+                # Serve it first in the next batch
+                self._carry = request
+                break
+            requests.append(request)
+            rows += len(request[0])
+        return requests
+
+    def _run(self):
+        while True:
+            requests = self._collect()
+            if requests is None:
+                return
+            # Drop requests cancelled while queued; the rest can no longer be cancelled
+            requests = [request for request in requests if request[1].set_running_or_notify_cancel()]
+            if not requests:
+                continue
+            started = time.perf_counter()
+            self.queue_latency.observe_many([started - request[2] for request in requests])
+            sizes = [len(request[0]) for request in requests]
+            self.batch_sizes.observe(sum(sizes))
+            self.batches += 1
+            try:
+                batch = requests[0][0] if len(requests) == 1 \
+                    else np.concatenate([request[0] for request in requests])
+                outputs = self.learner.predict_batch(batch, requests[0][3])
+            except Exception as exc:
+                for request in requests:
+                    self._resolve(request[1].set_exception, exc)
+                continue
+            offsets = np.cumsum([0] + sizes)
+            for request, start, end in zip(requests, offsets[:-1], offsets[1:]):
+                self._resolve(request[1].set_result, outputs[start:end])
+
+    @staticmethod
+    def _resolve(setter, value):
+        """Complete one Future; a failure there must not stop the worker"""
+        try:
+            setter(value)
+        except Exception:
+            logger.exception("Could not complete an inference request")
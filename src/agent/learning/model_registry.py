@@ -0,0 +1,48 @@
+# src/agent/learning/model_registry.py
+
+
+class ModelRegistry:
+    """Named model factories that are only called on first use.
+
+    Factories do their own backend imports, so registering a model costs
+    nothing; TensorFlow, for instance, is imported only when a Keras model
+    is first requested.
+    """
+
+    def __init__(self):
+        self._factories = {}
+        self._models = {}
+
+    def register(self, name, factory):
+        """Register a zero-argument factory for ``name``"""
+        self._factories[name] = factory
+        self._models.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self._factories
+
+    def __getitem__(self, name):
+        model = self._models.get(name)
+        if model is None:
+            if name not in self._factories:
+                raise KeyError(f"Unknown model: {name}")
+            model = self._factories[name]()
+            self._models[name] = model
+        return model
+
+    def __setitem__(self, name, model):
+        """Replace the built model for a registered name"""
+        if name not in self._factories:
+            raise KeyError(f"Unknown model: {name}")
+        self._models[name] = model
+
+    def names(self):
+        return list(self._factories)
+
+    def loaded(self):
+        """Names of the models that have been built"""
+        return list(self._models)
+
+    def unload(self, name):
+        """Drop a built model so the next access rebuilds it"""
+        self._models.pop(name, None)
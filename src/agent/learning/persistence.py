@@ -0,0 +1,227 @@
+# src/agent/learning/persistence.py
+
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+SNAPSHOT_VERSION = 1
+SNAPSHOT_COLUMNS = ('states', 'actions', 'rewards', 'timestamps')
+
+JOURNAL_MAGIC = b'RLJ1'
+JOURNAL_HEADER_SIZE = 16
+
+
+def write_snapshot(path, columns, meta):
+    """Write columns as .npy files plus meta.json, replacing ``path`` atomically
+
+    The snapshot is written to a sibling temporary directory first and
+    renamed into place, so a crash never leaves a half-written snapshot.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp-{os.getpid()}")
+    if tmp.exists():
+        shutil.rmtree(tmp)
+    tmp.mkdir()
+
+    for name, array in columns.items():
+        with open(tmp / f"{name}.npy", 'wb') as f:
+            np.save(f, array)
+            f.flush()
+            os.fsync(f.fileno())
+    with open(tmp / 'meta.json', 'w') as f:
+        json.dump(dict(meta, version=SNAPSHOT_VERSION), f)
+        f.flush()
+        os.fsync(f.fileno())
+
+    old = path.with_name(f"{path.name}.old-{os.getpid()}")
+    if path.exists():
+        os.replace(path, old)
+    os.replace(tmp, path)
+    if old.exists():
+        shutil.rmtree(old)
+
+
+def read_snapshot(path, mmap=True):
+    """Read a snapshot; columns are memory-mapped unless ``mmap`` is False"""
+    path = Path(path)
+    with open(path / 'meta.json') as f:
+        meta = json.load(f)
+    if meta.get('version') != SNAPSHOT_VERSION:
+        raise ValueError(f"Unsupported snapshot version: {meta.get('version')}")
+    columns = {
+        name: np.load(path / f"{name}.npy", mmap_mode='r' if mmap else None)
+        for name in SNAPSHOT_COLUMNS
+    }
+    return columns, meta
+
+
+def journal_dtype(state_dim):
+    """Fixed-size record layout of the experience journal"""
+    return np.dtype([
+        ('seq', np.int64),
+        ('timestamp', np.int64),
+        ('reward', np.float32),
+        ('action', np.int8),
+        ('state', np.float32, (state_dim,))
+    ])
+
+
+class ExperienceJournal:
+    """Append-only experience journal stored as numbered segment files.
+
+    Records are fixed-size binary rows collected in memory and written,
+    flushed and fsynced in batches of ``sync_every`` records or after
+    ``sync_interval`` seconds, whichever comes first. A timer thread syncs
+    records left waiting when no further appends arrive. Checkpoints rotate
+    to a new segment so segments covered by a snapshot can be deleted.
+    """
+
+    def __init__(self, directory, state_dim, sync_every=256, sync_interval=1.0):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.state_dim = state_dim
+        self.dtype = journal_dtype(state_dim)
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self._pending = np.zeros(sync_every, dtype=self.dtype)
+        self._count = 0
+        self._last_sync = time.monotonic()
+        self._file = None
+        self._lock = threading.Lock()
+        self._open_segment()
+        self._closed = threading.Event()
+        self._timer = None
+        if sync_interval:
+            self._timer = threading.Thread(target=self._sync_stale, name='experience-journal-sync',
+                                           daemon=True)
+            self._timer.start()
+
+    @staticmethod
+    def segments(directory):
+        return sorted(Path(directory).glob('segment-*.bin'))
+
+    def _open_segment(self):
+        existing = self.segments(self.directory)
+        number = int(existing[-1].stem.split('-')[1]) + 1 if existing else 1
+        self.segment_path = self.directory / f"segment-{number:06d}.bin"
+        self._file = open(self.segment_path, 'ab')
+        header = JOURNAL_MAGIC + np.uint32(self.state_dim).tobytes()
+        self._file.write(header.ljust(JOURNAL_HEADER_SIZE, b'\0'))
+        # A segment must never be left without its header, even after a crash
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def append(self, seq, timestamp_ns, action_id, reward, state_vector):
+        """Queue one record; syncs when the batch is full or stale"""
+        with self._lock:
+            record = self._pending[self._count]
+            record['seq'] = seq
+            record['timestamp'] = timestamp_ns
+            record['reward'] = reward
+            record['action'] = action_id
+            record['state'] = state_vector
+            self._count += 1
+            if (self._count == self.sync_every
+                    or time.monotonic() - self._last_sync >= self.sync_interval):
+                self._flush()
+
+    def flush(self):
+        """Write queued records and fsync the segment"""
+        with self._lock:
+            self._flush()
+
+    def _sync_stale(self):
+        """Timer thread body: sync records that have waited ``sync_interval``"""
+        timeout = self.sync_interval
+        while not self._closed.wait(timeout):
+            with self._lock:
+                if self._file is None:
+                    return
+                waited = time.monotonic() - self._last_sync
+                if self._count and waited >= self.sync_interval:
+                    self._flush()
+                    waited = 0.0
+            timeout = self.sync_interval - waited if waited < self.sync_interval else self.sync_interval
+
+    def _flush(self):
+        if self._count:
+            self._file.write(self._pending[:self._count].tobytes())
+            self._count = 0
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._last_sync = time.monotonic()
+
+    def write_actions(self, actions):
+        """Persist the action id mapping next to the segments"""
+        tmp = self.directory / 'actions.json.tmp'
+        with open(tmp, 'w') as f:
+            json.dump(list(actions), f)
+        os.replace(tmp, self.directory / 'actions.json')
+
+    def rotate(self):
+        """Close the current segment and start a new one"""
+        with self._lock:
+            self._flush()
+            self._file.close()
+            self._open_segment()
+
+    def prune(self, before_seq):
+        """Delete closed segments whose records all precede ``before_seq``"""
+        for segment in self.segments(self.directory):
+            if segment == self.segment_path:
+                continue
+            records = self.read_segment(segment)
+            if len(records) == 0 or records['seq'][-1] < before_seq:
+                segment.unlink()
+
+    def close(self):
+        self._closed.set()
+        if self._timer is not None:
+            self._timer.join()
+            self._timer = None
+        with self._lock:
+            if self._file is not None:
+                self._flush()
+                self._file.close()
+                self._file = None
+
+    @staticmethod
+    def read_segment(segment):
+        """Memory-map the records of one segment file
+
+        A segment cut short before its header was written (a crash right
+        after it was created) holds no records.
+        """
+        with open(segment, 'rb') as f:
+            header = f.read(JOURNAL_HEADER_SIZE)
+        if len(header) < JOURNAL_HEADER_SIZE:
+            return np.zeros(0, dtype=journal_dtype(0))
+        if header[:4] != JOURNAL_MAGIC:
+            raise ValueError(f"Not an experience journal segment: {segment}")
+        dtype = journal_dtype(int(np.frombuffer(header[4:8], dtype=np.uint32)[0]))
+        count = (os.path.getsize(segment) - JOURNAL_HEADER_SIZE) // dtype.itemsize
+        if count == 0:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(segment, dtype=dtype, mode='r', offset=JOURNAL_HEADER_SIZE, shape=(count,))
+
+    @classmethod
+    def read(cls, directory, start_seq=0):
+        """Yield record arrays with ``seq >= start_seq`` in journal order"""
+        for segment in cls.segments(directory):
+            records = cls.read_segment(segment)
+            if len(records) and records['seq'][-1] >= start_seq:
+                yield records[records['seq'] >= start_seq]
+
+    @staticmethod
+    def read_actions(directory):
+        path = Path(directory) / 'actions.json'
+        if not path.exists():
+            return []
+        with open(path) as f:
+            return json.load(f)
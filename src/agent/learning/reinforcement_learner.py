@@ -5,48 +5,310 @@ from sklearn.neural_network import MLPRegressor
 from collections import deque
 import random
 import joblib
-from datetime import datetime
+import threading
+
+from ..clock import system_clock
+from .experience_buffer import ExperienceBuffer
+from .experience_store import ExperienceStore
+from .persistence import ExperienceJournal, read_snapshot, write_snapshot
 
 class ReinforcementLearner:
-    def __init__(self):
-        self.experience_buffer = []
+    def __init__(self, capacity=100000, eviction='fifo', n_neighbors=10,
+                 state_keys=None, state_scale=None, epoch_min_changes=32,
+                 epoch_change_fraction=0.05, clock=None, **eviction_kwargs):
+        self.experience_buffer = ExperienceBuffer(
+            capacity=capacity,
+            eviction=eviction,
+            **eviction_kwargs
+        )
         self.min_experiences = 3  # Minimum experiences needed before making predictions
+        self.experience_store = ExperienceStore(
+            state_keys=state_keys,
+            state_scale=state_scale
+        )
+        # Neighbours averaged per prediction; None averages every experience
+        # of the action using the store's running sums
+        self.n_neighbors = n_neighbors
+        # Actions are stored as int8 ids in the buffer
+        self.action_ids = {}
+        self.actions = []
+        # The epoch advances once enough experiences changed since the last
+        # one, relative to the store size; caches keyed on it then refresh
+        self.epoch = 0
+        self.epoch_min_changes = epoch_min_changes
+        self.epoch_change_fraction = epoch_change_fraction
+        self._epoch_changes = 0
+        # One entry per epoch: time, buffer size and mean buffered reward
+        self.learning_history = deque(maxlen=10000)
+        # Persistence
+        self.journal = None
+        self._journal_options = None
+        self._checkpoint = None
+        self.clock = clock or system_clock
+        
+    def _action_id(self, action, create=False):
+        """Map an action to its int8 id, registering new actions if asked"""
+        action_id = self.action_ids.get(action)
+        if action_id is None and create:
+            if len(self.actions) >= np.iinfo(np.int8).max:
+                raise ValueError("Too many distinct actions for int8 action ids")
+            action_id = len(self.actions)
+            self.action_ids[action] = action_id
+            self.actions.append(action)
+            if self.journal is not None:
+                self.journal.write_actions(self.actions)
+        return action_id
         
     def process_experience(self, state, action, result, reward):
         """Process and store new experience"""
-        experience = {
-            'state': state,
-            'action': action,
-            'result': result,
-            'reward': reward
+        vector = self.experience_store.state_vector(state)
+        if self.journal is None and self._journal_options is not None:
+            self._start_journal(len(vector))
+        action_id = self._action_id(action, create=True)
+        timestamp = result.get('timestamp') if isinstance(result, dict) else None
+        if timestamp is None:
+            timestamp = self.clock.now()
+        timestamp_ns = int(np.datetime64(timestamp, 'ns').astype(np.int64))
+        
+        if self.journal is not None:
+            self.journal.append(self.experience_buffer.seen, timestamp_ns, action_id, reward, vector)
+        self._store_experience(vector, action_id, reward, timestamp_ns)
+        
+    def _store_experience(self, vector, action_id, reward, timestamp_ns):
+        """Add an experience to the buffer and the neighbour index"""
+        slot, replaced = self.experience_buffer.add(vector, action_id, reward, timestamp_ns)
+        if slot is None:
+            # Dropped by the eviction policy
+            return
+        if replaced:
+            self.experience_store.remove(slot)
+        self.experience_store.add(vector, action_id, reward, slot)
+        
+        self._epoch_changes += 1
+        if self._epoch_changes >= max(self.epoch_min_changes,
+                                      self.epoch_change_fraction * len(self.experience_store)):
+            self._advance_epoch()
+            
+    def _advance_epoch(self):
+        self.epoch += 1
+        self._epoch_changes = 0
+        size = self.experience_buffer.size
+        self.learning_history.append({
+            'timestamp': self.clock.now(),
+            'epoch': self.epoch,
+            'buffer_size': size,
+            'model_score': float(self.experience_buffer.rewards[:size].mean()) if size else float('nan')
+        })
+        
+    def open_journal(self, directory, **kwargs):
+        """Journal every new experience to ``directory`` between snapshots
+
+        Keyword arguments are passed to ExperienceJournal (sync_every,
+        sync_interval). The journal starts once the state size is known.
+        """
+        self._journal_options = (directory, kwargs)
+        if self.experience_store.state_keys is not None:
+            self._start_journal(len(self.experience_store.state_keys))
+            
+    def _start_journal(self, state_dim):
+        directory, kwargs = self._journal_options
+        self.journal = ExperienceJournal(directory, state_dim, **kwargs)
+        self.journal.write_actions(self.actions)
+        
+    def save_model(self, path, background=False):
+        """Write a columnar snapshot of the experience buffer to ``path``
+
+        With ``background=True`` the columns are copied and the files are
+        written on a worker thread, so the decision loop is not blocked;
+        the thread is returned. The journal rotates to a new segment and
+        segments covered by the snapshot are deleted once it is written.
+        """
+        self.wait_for_checkpoint()
+        buffer = self.experience_buffer
+        store = self.experience_store
+        n = buffer.size
+        state_dim = buffer.states.shape[1] if buffer.states is not None else len(store.state_keys or [])
+        columns = {
+            'states': buffer.states[:n].copy() if buffer.states is not None
+            else np.zeros((0, state_dim), dtype=np.float32),
+            'actions': buffer.actions[:n].copy(),
+            'rewards': buffer.rewards[:n].copy(),
+            'timestamps': buffer.timestamps[:n].copy()
+        }
+        meta = {
+            'capacity': buffer.capacity,
+            'seen': buffer.seen,
+            'actions': self.actions,
+            'state_keys': store.state_keys,
+            'state_scale': None if store.state_scale is None
+            else np.asarray(store.state_scale, dtype=np.float64).tolist(),
+            'n_neighbors': self.n_neighbors,
+            'min_experiences': self.min_experiences
+        }
+        journal = self.journal
+        if journal is not None:
+            journal.rotate()
+            
+        def write():
+            write_snapshot(path, columns, meta)
+            if journal is not None:
+                journal.prune(meta['seen'])
+                
+        if not background:
+            write()
+            return None
+        self._checkpoint = threading.Thread(target=write, name='learner-checkpoint', daemon=True)
+        self._checkpoint.start()
+        return self._checkpoint
+        
+    def wait_for_checkpoint(self):
+        """Block until a background snapshot has been written"""
+        if self._checkpoint is not None:
+            self._checkpoint.join()
+            self._checkpoint = None
+            
+    def load_model(self, path, journal_directory=None):
+        """Restore experiences from a snapshot and replay the journal after it"""
+        columns, meta = read_snapshot(path)
+        store = self.experience_store
+        
+        self.actions = list(meta['actions'])
+        self.action_ids = {action: i for i, action in enumerate(self.actions)}
+        store.state_keys = meta['state_keys']
+        store.state_scale = None if meta['state_scale'] is None else np.array(meta['state_scale'])
+        self.n_neighbors = meta['n_neighbors']
+        self.min_experiences = meta['min_experiences']
+        
+        buffer = self.experience_buffer
+        buffer.restore(
+            columns['states'],
+            columns['actions'],
+            columns['rewards'],
+            columns['timestamps'],
+            meta['seen'],
+            capacity=meta['capacity']
+        )
+        n = buffer.size
+        store.rebuild(buffer.states[:n], buffer.actions[:n], buffer.rewards[:n])
+        self._advance_epoch()
+        
+        if journal_directory is not None:
+            self.replay_journal(journal_directory, start_seq=meta['seen'])
+            
+    def replay_journal(self, directory, start_seq=0):
+        """Re-apply journaled experiences with sequence numbers from ``start_seq``"""
+        for action in ExperienceJournal.read_actions(directory):
+            self._action_id(action, create=True)
+        for records in ExperienceJournal.read(directory, start_seq):
+            for record in records:
+                if record['seq'] < self.experience_buffer.seen:
+                    continue
+                self._store_experience(
+                    record['state'],
+                    int(record['action']),
+                    float(record['reward']),
+                    int(record['timestamp'])
+                )
+                
+    def close(self):
+        """Finish pending checkpoints and close the journal"""
+        self.wait_for_checkpoint()
+        if self.journal is not None:
+            self.journal.close()
+            self.journal = None
+            
+    def memory_footprint(self):
+        """Bytes held by the experience buffer and its index"""
+        buffer_bytes = self.experience_buffer.nbytes
+        index_bytes = self.experience_store.nbytes
+        return {
+            'buffer': buffer_bytes,
+            'index': index_bytes,
+            'total': buffer_bytes + index_bytes
         }
-        self.experience_buffer.append(experience)
         
     def predict_outcome(self, state, action):
         """Predict outcome based on similar past experiences"""
-        if len(self.experience_buffer) < self.min_experiences:
-            return None
+        return self.predict_outcomes(state, [action]).get(action)
+        
+    def predict_outcomes(self, state, actions=None):
+        """Predict reward and confidence for several actions in one pass
+
+        Returns a dict keyed by action, leaving out actions without
+        experience. Confidence is the action's share of all experiences.
+        """
+        store = self.experience_store
+        total = len(store)
+        if total < self.min_experiences:
+            return {}
             
-        # Find similar experiences
-        similar_experiences = self._find_similar_experiences(state, action)
+        if actions is None:
+            actions = self.actions
+        known = [(action, self.action_ids[action]) for action in actions
+                 if action in self.action_ids]
+        if not known:
+            return {}
+        ids = np.array([action_id for _, action_id in known])
+        counts = store.counts[ids]
         
-        if not similar_experiences:
-            return None
+        if self.n_neighbors is None:
+            # Mean over every experience of the action from running sums
+            sums = store.reward_sums[ids]
+            found = counts
+        else:
+            # Group the neighbours of all actions by action id
+            labels, rewards = store.neighbour_rewards(state, ids, self.n_neighbors)
+            sums = np.bincount(labels, weights=rewards, minlength=store.MAX_ACTIONS)[ids]
+            found = np.bincount(labels, minlength=store.MAX_ACTIONS)[ids]
             
-        # Calculate average reward and confidence
-        avg_reward = sum(exp['reward'] for exp in similar_experiences) / len(similar_experiences)
-        confidence = len(similar_experiences) / len(self.experience_buffer)
+        predicted = sums / np.maximum(found, 1)
+        confidence = counts / total
         
         return {
-            'predicted_reward': avg_reward,
-            'confidence': confidence
+            action: {
+                'predicted_reward': float(predicted[i]),
+                'confidence': float(confidence[i])
+            }
+            for i, (action, _) in enumerate(known)
+            if found[i] > 0
         }
         
-    def _find_similar_experiences(self, state, action):
-        """Find experiences with similar states and same action"""
-        similar = []
-        for exp in self.experience_buffer:
-            if exp['action'] == action:
-                # Simple similarity check
-                similar.append(exp)
-        return similar
+    def predict_outcomes_many(self, states, actions=None):
+        """Batched ``predict_outcomes``: one dict per state
+
+        Neighbour searches for all states run as one query per index tree,
+        so many assets deciding in the same tick share the query overhead.
+        """
+        store = self.experience_store
+        total = len(store)
+        if total < self.min_experiences or not states:
+            return [{} for _ in states]
+            
+        if actions is None:
+            actions = self.actions
+        known = [(action, self.action_ids[action]) for action in actions
+                 if action in self.action_ids]
+        if not known:
+            return [{} for _ in states]
+        ids = np.array([action_id for _, action_id in known])
+        counts = store.counts[ids]
+        confidence = counts / total
+        
+        if self.n_neighbors is None:
+            found = counts
+            predicted = np.broadcast_to(store.reward_sums[ids] / np.maximum(found, 1), (len(states), len(ids)))
+        else:
+            sums, found = store.neighbour_reward_sums(states, ids, self.n_neighbors)
+            predicted = sums / np.maximum(found, 1)
+            
+        return [
+            {
+                action: {
+                    'predicted_reward': float(row[i]),
+                    'confidence': float(confidence[i])
+                }
+                for i, (action, _) in enumerate(known)
+                if found[i] > 0
+            }
+            for row in predicted
+        ]
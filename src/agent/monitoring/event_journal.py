@@ -0,0 +1,256 @@
+# src/agent/monitoring/event_journal.py
+
+from collections import Counter
+from datetime import date, datetime
+import json
+import logging
+from logging.handlers import QueueHandler, QueueListener
+import os
+from pathlib import Path
+import queue
+import threading
+import time
+
+import numpy as np
+
+
+def json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class _JournalHandler(QueueHandler):
+    """QueueHandler that drops records once its journal is closed"""
+
+    def __init__(self, journal):
+        super().__init__(journal._queue)
+        self.journal = journal
+
+    def enqueue(self, record):
+        if self.journal._closed:
+            self.journal._drop('log')
+            return
+        super().enqueue(record)
+
+
+class EventJournal:
+    """Non-blocking JSON-lines journal of decision, status and log events.
+
+    ``emit`` only appends to an in-memory queue; a writer thread drains it
+    in batches of up to ``batch_size`` events, serializes them to compact
+    JSON lines and writes each batch with one call. Segments
+    (``events-000001.jsonl``, ...) roll over at ``max_bytes``; with
+    ``max_segments`` the oldest are deleted, otherwise all are kept as the
+    audit trail. ``rate_limits`` maps an event kind to the events per
+    second it may emit (a token bucket with one second of burst); excess
+    events and events arriving while ``maxsize`` are queued are dropped and
+    counted rather than blocking the caller.
+    """
+
+    def __init__(self, directory, max_bytes=64 * 2**20, max_segments=None, rate_limits=None,
+                 batch_size=1024, flush_interval=0.5, maxsize=100000):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.max_segments = max_segments
+        self.rate_limits = dict(rate_limits or {})
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.maxsize = maxsize
+
+        self._buckets = {kind: [float(rate), time.monotonic()] for kind, rate in self.rate_limits.items()}
+        # Guards the token buckets and drop counts shared by emitting threads
+        self._lock = threading.Lock()
+        self._queue = queue.SimpleQueue()
+        self.emitted = 0
+        self.written = 0
+        self.batches = 0
+        self.rotations = 0
+        self.dropped = Counter()
+        self._file = None
+        self._open_segment()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='event-journal', daemon=True)
+        self._thread.start()
+
+    @staticmethod
+    def segments(directory):
+        return sorted(Path(directory).glob('events-*.jsonl'))
+
+    def _open_segment(self):
+        existing = self.segments(self.directory)
+        number = int(existing[-1].stem.split('-')[1]) + 1 if existing else 1
+        self.segment_path = self.directory / f"events-{number:06d}.jsonl"
+        self._file = open(self.segment_path, 'a', encoding='utf-8')
+        self._size = self._file.tell()
+
+    def _allow(self, kind):
+        bucket = self._buckets.get(kind)
+        if bucket is None:
+            return True
+        rate = self.rate_limits[kind]
+        with self._lock:
+            now = time.monotonic()
+            tokens = min(rate, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+            if tokens < 1.0:
+                bucket[0] = tokens
+                return False
+            bucket[0] = tokens - 1.0
+            return True
+
+    def _drop(self, kind):
+        with self._lock:
+            self.dropped[kind] += 1
+
+    def emit(self, kind, event):
+        """Queue ``event`` (a dict) under ``kind``; False if it was dropped"""
+        if self._closed or not self._allow(kind):
+            self._drop(kind)
+            return False
+        if self._queue.qsize() >= self.maxsize:
+            self._drop('queue_full')
+            return False
+        self._queue.put((kind, time.time(), event))
+        self.emitted += 1
+        return True
+
+    def handler(self, level=logging.INFO):
+        """``logging`` handler that routes records into this journal
+
+        Records logged after ``close`` are dropped and counted under 'log'.
+        """
+        handler = _JournalHandler(self)
+        handler.setLevel(level)
+        return handler
+
+    def _serialize(self, item):
+        if isinstance(item, logging.LogRecord):
+            record = {'ts': item.created, 'kind': 'log', 'level': item.levelname,
+                      'logger': item.name, 'message': item.getMessage()}
+        else:
+            kind, ts, event = item
+            record = {'ts': ts, 'kind': kind}
+            record.update(event)
+        return json.dumps(record, separators=(',', ':'), default=json_default)
+
+    def _run(self):
+        while True:
+            try:
+                items = [self._queue.get(timeout=self.flush_interval)]
+            except queue.Empty:
+                continue
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = []
+            markers = []
+            stop = False
+            for item in items:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                else:
+                    lines.append(self._serialize(item))
+            if lines:
+                self._write(lines)
+            for marker in markers:
+                self._file.flush()
+                marker.set()
+            if stop:
+                return
+
+    def _write(self, lines):
+        """Write a batch, rolling over to new segments at ``max_bytes``"""
+        chunk = []
+        chunk_size = 0
+        for line in lines:
+            size = len(line.encode('utf-8')) + 1
+            if self._size + chunk_size + size > self.max_bytes and (self._size or chunk):
+                if chunk:
+                    self._file.write('\n'.join(chunk) + '\n')
+                self._rotate()
+                chunk = []
+                chunk_size = 0
+            chunk.append(line)
+            chunk_size += size
+        self._file.write('\n'.join(chunk) + '\n')
+        self._file.flush()
+        self._size += chunk_size
+        self.written += len(lines)
+        self.batches += 1
+
+    def _rotate(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._open_segment()
+        self.rotations += 1
+        if self.max_segments:
+            for segment in self.segments(self.directory)[:-self.max_segments]:
+                segment.unlink()
+
+    def flush(self, timeout=None):
+        """Wait until every event queued so far has been written"""
+        marker = threading.Event()
+        self._queue.put(marker)
+        return marker.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def stats(self):
+        return {
+            'emitted': self.emitted,
+            'written': self.written,
+            'queued': self._queue.qsize(),
+            'batches': self.batches,
+            'rotations': self.rotations,
+            'dropped': dict(self.dropped),
+            'segment': self.segment_path.name
+        }
+
+    @classmethod
+    def read(cls, directory, kind=None):
+        """Yield the events of every segment in order, optionally of one kind"""
+        for segment in cls.segments(directory):
+            with open(segment, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        event = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A line cut short by a crash
+                        continue
+                    if kind is None or event['kind'] == kind:
+                        yield event
+
+
+def queue_logging(logger=None):
+    """Move ``logger``'s handlers (root by default) behind a queue
+
+    Records are only enqueued on the calling thread; a QueueListener thread
+    formats and writes them. Returns the started listener; stop it on
+    shutdown to drain what is left.
+    """
+    logger = logger or logging.getLogger()
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, *logger.handlers, respect_handler_level=True)
+    logger.handlers = [QueueHandler(log_queue)]
+    listener.start()
+    return listener
@@ -0,0 +1,91 @@
+# src/agent/monitoring/histogram.py
+
+from bisect import bisect_left
+import threading
+
+import numpy as np
+
+
+def exponential_buckets(start, factor, count):
+    """Upper bounds ``start * factor**i`` for ``i`` in ``range(count)``"""
+    return start * factor ** np.arange(count)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with O(log buckets) observations.
+
+    ``buckets`` are the finite upper bounds; an implicit +Inf bucket holds
+    everything above the last one. Quantiles are interpolated within the
+    bucket they fall in, as Prometheus does.
+    """
+
+    def __init__(self, buckets):
+        self.buckets = np.asarray(buckets, dtype=np.float64)
+        self._bounds = self.buckets.tolist()
+        self._counts = np.zeros(len(self.buckets) + 1, dtype=np.int64)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value, n=1):
+        """Record ``value`` ``n`` times"""
+        # bisect on a list is several times cheaper than NumPy for one value
+        index = bisect_left(self._bounds, value)
+        with self._lock:
+            self._counts[index] += n
+            self.sum += value * n
+            self.count += n
+
+    def observe_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        counts = np.bincount(
+            np.searchsorted(self.buckets, values, side='left'),
+            minlength=len(self._counts)
+        )
+        with self._lock:
+            self._counts += counts
+            self.sum += float(values.sum())
+            self.count += len(values)
+
+    @property
+    def mean(self):
+        return self.sum / self.count if self.count else float('nan')
+
+    def cumulative_counts(self):
+        """Counts of observations ``<=`` each bound, ending with +Inf"""
+        with self._lock:
+            return np.cumsum(self._counts)
+
+    def quantile(self, q):
+        cumulative = self.cumulative_counts()
+        total = cumulative[-1]
+        if total == 0:
+            return float('nan')
+        rank = q * total
+        index = int(np.searchsorted(cumulative, rank, side='left'))
+        if index >= len(self.buckets):
+            # Above the last finite bound
+            return float(self.buckets[-1])
+        lower = self.buckets[index - 1] if index > 0 else 0.0
+        below = cumulative[index - 1] if index > 0 else 0
+        in_bucket = cumulative[index] - below
+        if in_bucket == 0:
+            return float(self.buckets[index])
+        return float(lower + (self.buckets[index] - lower) * (rank - below) / in_bucket)
+
+    def snapshot(self):
+        return {
+            'buckets': self.buckets.tolist(),
+            'cumulative_counts': self.cumulative_counts().tolist(),
+            'sum': self.sum,
+            'count': self.count
+        }
+
+    def summary(self):
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+            'p99': self.quantile(0.99)
+        }
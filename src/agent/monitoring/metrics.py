@@ -0,0 +1,176 @@
+# src/agent/monitoring/metrics.py
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import math
+import threading
+
+from .histogram import Histogram
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ''
+    escaped = (
+        key + '="' + str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') + '"'
+        for key, value in items
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def _format_value(value):
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if math.isnan(value):
+        return 'NaN'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic count; ``inc`` is a plain add, cheap enough for hot paths
+
+    A ``function`` reads a count kept elsewhere (it must never decrease)
+    at scrape time instead.
+    """
+
+    def __init__(self, function=None):
+        self.function = function
+        self._value = 0
+
+    def inc(self, n=1):
+        self._value += n
+
+    @property
+    def value(self):
+        return self.function() if self.function is not None else self._value
+
+
+class Gauge:
+    """Current value, either set directly or read from ``function`` at scrape time"""
+
+    def __init__(self, function=None):
+        self.function = function
+        self._value = 0.0
+
+    def set(self, value):
+        self._value = value
+
+    @property
+    def value(self):
+        return self.function() if self.function is not None else self._value
+
+
+class MetricsRegistry:
+    """Named counters, gauges and histograms rendered in Prometheus text format.
+
+    A metric name may carry several label sets (for example one histogram
+    per pipeline stage); asking again for the same name and labels returns
+    the existing metric, so components can look metrics up freely.
+    """
+
+    def __init__(self, prefix=''):
+        self.prefix = prefix
+        self._families = {}
+        self._lock = threading.Lock()
+
+    def _get(self, kind, name, help, labels, factory):
+        name = self.prefix + name
+        key = tuple(sorted((labels or {}).items()))
+        with self._lock:
+            family = self._families.setdefault(name, {'kind': kind, 'help': help, 'metrics': {}})
+            if family['kind'] != kind:
+                raise ValueError(f"Metric {name} is already registered as a {family['kind']}")
+            if key not in family['metrics']:
+                family['metrics'][key] = factory()
+            return family['metrics'][key]
+
+    def counter(self, name, help='', labels=None, function=None):
+        return self._get('counter', name, help, labels, lambda: Counter(function))
+
+    def gauge(self, name, help='', labels=None, function=None):
+        return self._get('gauge', name, help, labels, lambda: Gauge(function))
+
+    def histogram(self, name, buckets, help='', labels=None):
+        return self._get('histogram', name, help, labels, lambda: Histogram(buckets))
+
+    def collect(self):
+        """Current values as ``{name: {labels: value}}``; histograms give their summary"""
+        with self._lock:
+            families = {name: dict(family['metrics']) for name, family in self._families.items()}
+        return {
+            name: {
+                labels: metric.summary() if isinstance(metric, Histogram) else metric.value
+                for labels, metric in metrics.items()
+            }
+            for name, metrics in families.items()
+        }
+
+    def render(self):
+        """Prometheus text exposition of every metric"""
+        with self._lock:
+            families = [
+                (name, family['kind'], family['help'], list(family['metrics'].items()))
+                for name, family in self._families.items()
+            ]
+        lines = []
+        for name, kind, help, metrics in families:
+            if help:
+                lines.append(f'# HELP {name} {help}')
+            lines.append(f'# TYPE {name} {kind}')
+            for key, metric in metrics:
+                labels = dict(key)
+                if kind != 'histogram':
+                    lines.append(f'{name}{_format_labels(labels)} {_format_value(metric.value)}')
+                    continue
+                cumulative = metric.cumulative_counts()
+                bounds = metric.buckets.tolist() + [math.inf]
+                for bound, count in zip(bounds, cumulative.tolist()):
+                    le = {'le': _format_value(bound)}
+                    lines.append(f'{name}_bucket{_format_labels(labels, le)} {count}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(metric.sum)}')
+                lines.append(f'{name}_count{_format_labels(labels)} {int(cumulative[-1])}')
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """Serve a registry on ``http://host:port/metrics`` from a daemon thread
+
+    Binds to localhost by default; ``port=0`` picks a free port, available
+    as ``port`` once started.
+    """
+
+    def __init__(self, registry, host='127.0.0.1', port=9464):
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode()
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((host, port), Handler)
+        self._server.daemon_threads = True
+        self.host, self.port = self._server.server_address[:2]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name='metrics-server', daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def close(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
@@ -0,0 +1,87 @@
+# src/agent/monitoring/profiler.py
+
+from collections import Counter
+import sys
+import threading
+import time
+
+
+class SamplingProfiler:
+    """Statistical profiler that samples thread stacks from a background thread.
+
+    Every ``interval`` seconds the current frame of each sampled thread is
+    walked and its stack counted. Nothing is hooked into the profiled code,
+    so cost is bounded by the sampling rate rather than by how many calls
+    the agent makes. ``dump`` writes the counts in collapsed-stack format
+    (``frame;frame;frame count`` per line), the input of flamegraph.pl,
+    speedscope and similar flame-graph viewers.
+    """
+
+    def __init__(self, interval=0.005, thread_ids=None):
+        self.interval = interval
+        # None samples every thread except the profiler itself
+        self.thread_ids = thread_ids
+        self.stacks = Counter()
+        self.samples = 0
+        self._stopping = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def _frame_name(frame):
+        code = frame.f_code
+        return f'{code.co_name} ({code.co_filename.rsplit("/", 1)[-1]}:{code.co_firstlineno})'
+
+    def sample(self):
+        """Take one sample of every selected thread"""
+        own = threading.get_ident()
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own or (self.thread_ids is not None and thread_id not in self.thread_ids):
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(self._frame_name(frame))
+                frame = frame.f_back
+            self.stacks[';'.join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self, duration, path):
+        deadline = time.monotonic() + duration if duration is not None else None
+        next_sample = time.monotonic()
+        while not self._stopping.is_set():
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            self.sample()
+            next_sample += self.interval
+            self._stopping.wait(max(0.0, next_sample - time.monotonic()))
+        if path:
+            self.dump(path)
+
+    def start(self, duration=None, path=None):
+        """Sample in the background for ``duration`` seconds (or until ``stop``)
+
+        With ``path`` the collapsed stacks are written there when the window
+        ends.
+        """
+        self._stopping.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(duration, path), name='sampling-profiler', daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def wait(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def collapsed(self):
+        return '\n'.join(f'{stack} {count}' for stack, count in self.stacks.most_common()) + '\n'
+
+    def dump(self, path):
+        with open(path, 'w') as f:
+            f.write(self.collapsed())
@@ -0,0 +1,307 @@
+# src/agent/monitoring/snapshot_store.py
+
+from collections import deque
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+
+from .event_journal import json_default
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    version INTEGER PRIMARY KEY,
+    asset_id TEXT,
+    timestamp TEXT NOT NULL,
+    state TEXT NOT NULL,
+    health TEXT NOT NULL,
+    severity TEXT,
+    action TEXT,
+    reward REAL
+);
+CREATE TABLE IF NOT EXISTS status (
+    key TEXT PRIMARY KEY,
+    version INTEGER NOT NULL,
+    value TEXT NOT NULL
+);
+"""
+
+ASSET_INDEX = 'CREATE INDEX IF NOT EXISTS snapshots_asset ON snapshots (asset_id, version)'
+
+COLUMNS = ('version', 'asset_id', 'timestamp', 'state', 'health', 'severity', 'action', 'reward')
+
+
+def _dumps(value):
+    return json.dumps(value, separators=(',', ':'), default=json_default)
+
+
+class SnapshotStore:
+    """Versioned agent snapshots in an SQLite database in WAL mode.
+
+    The agent ``publish``es one row per decision, optionally labelled with
+    its asset. ``publish`` only queues the row: a writer thread serializes
+    the rows and commits them in one transaction at most every
+    ``commit_interval`` seconds, so the decision thread never waits on
+    SQLite. The dict returned by ``status_function`` (aggregate metrics,
+    stored as one JSON value per key) is taken on the publishing thread
+    once per interval and written with the next commit. WAL mode lets any
+    number of readers (``SnapshotReader``) query while the agent writes.
+    Only the newest ``retain`` rows are kept.
+    """
+
+    def __init__(self, path, retain=100000, commit_interval=0.5, status_function=None):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.retain = retain
+        self.commit_interval = commit_interval
+        self.status_function = status_function
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        # WAL with synchronous=NORMAL only syncs at checkpoints
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript(SCHEMA)
+        columns = {row[1] for row in self._connection.execute('PRAGMA table_info(snapshots)')}
+        if 'asset_id' not in columns:
+            # Stores written before snapshots carried their asset
+            self._connection.execute('ALTER TABLE snapshots ADD COLUMN asset_id TEXT')
+        self._connection.execute(ASSET_INDEX)
+        row = self._connection.execute('SELECT MAX(version) FROM snapshots').fetchone()
+        self.version = row[0] or 0
+        self.committed_version = self.version
+        self.commits = 0
+        self._last_status = float('-inf')
+        self._last_commit = time.monotonic()
+        self._queue = queue.SimpleQueue()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name='snapshot-store', daemon=True)
+        self._thread.start()
+
+    def publish(self, timestamp, state, sensor_health, severity, action, reward, asset_id=None):
+        """Queue one decision snapshot for the writer; returns its version"""
+        if self._closed:
+            raise RuntimeError("SnapshotStore is closed")
+        self.version += 1
+        self._queue.put((self.version, asset_id, timestamp, state, sensor_health, severity, action, reward))
+        now = time.monotonic()
+        if now - self._last_status >= self.commit_interval:
+            self._last_status = now
+            self._queue_status()
+        return self.version
+
+    def _queue_status(self):
+        if self.status_function is not None:
+            self._queue.put(('status', self.status_function()))
+
+    def flush(self, timeout=None):
+        """Commit everything published so far, with the current status"""
+        self._queue_status()
+        marker = threading.Event()
+        self._queue.put(marker)
+        self._wake.set()
+        return marker.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._queue_status()
+        self._closed = True
+        self._queue.put(None)
+        self._wake.set()
+        self._thread.join()
+        self._connection.close()
+
+    def _run(self):
+        while True:
+            items = [self._queue.get()]
+            # Let a commit interval's worth of rows gather, unless asked to flush
+            delay = self._last_commit + self.commit_interval - time.monotonic()
+            if delay > 0 and self._wake.wait(delay):
+                self._wake.clear()
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            rows = []
+            status = None
+            markers = []
+            stop = False
+            for item in items:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    markers.append(item)
+                elif item[0] == 'status':
+                    status = item[1]
+                else:
+                    rows.append(self._serialize(*item))
+            self._commit(rows, status)
+            for marker in markers:
+                marker.set()
+            if stop:
+                return
+
+    @staticmethod
+    def _serialize(version, asset_id, timestamp, state, sensor_health, severity, action, reward):
+        return (
+            version,
+            None if asset_id is None else str(asset_id),
+            timestamp.isoformat() if hasattr(timestamp, 'isoformat') else str(timestamp),
+            _dumps(state),
+            _dumps({sensor: status['status'] for sensor, status in sensor_health.items()}),
+            severity,
+            action,
+            reward
+        )
+
+    def _commit(self, rows, status):
+        """Write snapshot rows and the latest status in one transaction"""
+        version = rows[-1][0] if rows else self.committed_version
+        with self._connection:
+            if rows:
+                self._connection.executemany(
+                    f'INSERT INTO snapshots ({", ".join(COLUMNS)}) VALUES ({", ".join("?" * len(COLUMNS))})',
+                    rows
+                )
+            if status:
+                self._connection.executemany(
+                    'INSERT OR REPLACE INTO status VALUES (?, ?, ?)',
+                    [(key, version, _dumps(value)) for key, value in status.items()]
+                )
+            if rows and self.retain and version > self.retain:
+                self._connection.execute(
+                    'DELETE FROM snapshots WHERE version <= ?', (version - self.retain,)
+                )
+        self.committed_version = version
+        self._last_commit = time.monotonic()
+        self.commits += 1
+
+
+class SnapshotReader:
+    """Read-only view of a SnapshotStore that fetches rows by version"""
+
+    def __init__(self, path):
+        self.path = path
+        stat = os.stat(path)
+        self._identity = (stat.st_dev, stat.st_ino)
+        self._size = stat.st_size
+        self._connection = sqlite3.connect(
+            f'file:{os.path.abspath(path)}?mode=ro', uri=True, check_same_thread=False
+        )
+
+    def replaced(self):
+        """Whether the database file was recreated (or shrank) since it was opened
+
+        The open connection keeps reading the old file, so its caller must
+        open a new reader to see the new one.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            # Removed but not yet recreated; keep reading the old file
+            return False
+        replaced = (stat.st_dev, stat.st_ino) != self._identity or stat.st_size < self._size
+        self._size = stat.st_size
+        return replaced
+
+    def latest_version(self):
+        row = self._connection.execute('SELECT MAX(version) FROM snapshots').fetchone()
+        return row[0] or 0
+
+    def since(self, version, limit=None, asset_id=None):
+        """Snapshots newer than ``version``, oldest first (the newest ``limit`` if given)
+
+        ``asset_id`` restricts them to one asset, using the asset index.
+        """
+        where = 'version > ?'
+        parameters = [version]
+        if asset_id is not None:
+            where += ' AND asset_id = ?'
+            parameters.append(str(asset_id))
+        select = f'SELECT {", ".join(COLUMNS)} FROM snapshots WHERE {where}'
+        if limit is None:
+            rows = self._connection.execute(f'{select} ORDER BY version', parameters).fetchall()
+        else:
+            rows = self._connection.execute(
+                f'SELECT * FROM ({select} ORDER BY version DESC LIMIT ?) ORDER BY version',
+                parameters + [limit]
+            ).fetchall()
+        return [
+            {
+                'version': row_version,
+                'asset_id': row_asset_id,
+                'timestamp': timestamp,
+                'state': json.loads(state),
+                'health': json.loads(health),
+                'severity': severity,
+                'action': action,
+                'reward': reward
+            }
+            for row_version, row_asset_id, timestamp, state, health, severity, action, reward in rows
+        ]
+
+    def status(self):
+        rows = self._connection.execute('SELECT key, value FROM status').fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def close(self):
+        self._connection.close()
+
+
+class SnapshotFeed:
+    """Rolling window of snapshots shared by every dashboard viewer.
+
+    ``refresh`` pulls only rows newer than the last version seen, at most
+    once per ``min_interval`` seconds however many viewers call it, so
+    the database sees one small query per interval and the agent none.
+    With ``asset_id`` the feed follows that one asset only.
+    """
+
+    def __init__(self, path, maxlen=3600, min_interval=1.0, asset_id=None):
+        self.reader = SnapshotReader(path)
+        self.asset_id = asset_id
+        self.snapshots = deque(maxlen=maxlen)
+        self.version = 0
+        self.status = {}
+        self.min_interval = min_interval
+        self._refreshed = float('-inf')
+        self._lock = threading.Lock()
+        self.queries = 0
+
+    def refresh(self):
+        with self._lock:
+            now = time.monotonic()
+            if now - self._refreshed < self.min_interval:
+                return False
+            self._refreshed = now
+            if self.reader.replaced():
+                # The store was recreated; the old connection still sees the old file
+                self.reader.close()
+                self.reader = SnapshotReader(self.reader.path)
+                self.snapshots.clear()
+                self.version = 0
+            rows = self.reader.since(self.version, limit=self.snapshots.maxlen, asset_id=self.asset_id)
+            if not rows and self.reader.latest_version() < self.version:
+                # The store was reset in place; start over
+                self.snapshots.clear()
+                self.version = 0
+                rows = self.reader.since(0, limit=self.snapshots.maxlen, asset_id=self.asset_id)
+            if rows:
+                self.snapshots.extend(rows)
+                self.version = rows[-1]['version']
+                self.status = self.reader.status()
+            self.queries += 1
+            return bool(rows)
+
+    def latest(self):
+        return self.snapshots[-1] if self.snapshots else None
+
+    def history(self):
+        with self._lock:
+            return list(self.snapshots)
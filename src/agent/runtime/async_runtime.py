@@ -0,0 +1,208 @@
+# src/agent/runtime/async_runtime.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import logging
+import math
+
+import numpy as np
+
+from ..environment.sensor_interface import SensorInterface
+from ..monitoring.histogram import Histogram, exponential_buckets
+from .scheduler import AdaptiveScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class AssetStats:
+    """Tick counters for one asset pipeline"""
+
+    __slots__ = ('ticks', 'overruns', 'skipped', 'last_action')
+
+    def __init__(self):
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.last_action = None
+
+
+class AsyncAgentRuntime:
+    """Drive one sense -> decide -> act -> learn pipeline per asset on an event loop.
+
+    Every asset ticks every ``period`` seconds against absolute deadlines
+    (``start + phase + k * period``), so processing time never accumulates
+    into drift; phases are spread evenly over the period to smooth load.
+    A tick that ends after its next deadline is an overrun, and deadlines
+    already missed are skipped rather than run late in a burst.
+
+    Sensing happens on the loop. The blocking decide, act and learn part
+    runs on ``executor``, by default a single model thread, which keeps the
+    loop responsive and never runs two model calls at once. Ticks that come
+    due while a batch is running are queued and handed over together to
+    ``agent.step_many`` (``MaintenanceAgent.step_many``) with their
+    ``asset_ids``, so the batch size grows with load and the per-call
+    model overhead is shared. Readings are recorded only in each asset's
+    own sensor history, never again in the agent's (``record=False``).
+
+    With ``scheduler_options`` (AdaptiveScheduler keyword arguments) each
+    asset's next deadline comes from the scheduler, which observes every
+    tick's readings and severity (``step_many`` outcomes must then carry
+    ``severity``), so calm assets are sensed and decided less often.
+    """
+
+    def __init__(self, agent, asset_ids, period=1.0, sensor_factory=None, executor=None,
+                 history_capacity=600, seed=None, scheduler_options=None):
+        self.agent = agent
+        self.asset_ids = list(asset_ids)
+        self.period = period
+        if sensor_factory is None:
+            seeds = np.random.SeedSequence(seed).spawn(len(self.asset_ids))
+            clock = getattr(agent, 'clock', None)
+            sensors = {
+                asset_id: SensorInterface(history_capacity=history_capacity, seed=s, clock=clock)
+                for asset_id, s in zip(self.asset_ids, seeds)
+            }
+            sensor_factory = sensors.__getitem__
+        self.sensors = {asset_id: sensor_factory(asset_id) for asset_id in self.asset_ids}
+        self.scheduler = None
+        if scheduler_options is not None:
+            first = self.sensors[self.asset_ids[0]]
+            self.scheduler = AdaptiveScheduler.for_sensors(
+                first.sensors, first.sensor_names, asset_ids=self.asset_ids, **scheduler_options
+            )
+        self._own_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix='model')
+
+        self.asset_stats = {asset_id: AssetStats() for asset_id in self.asset_ids}
+        # Seconds a tick started after its deadline, and tick durations
+        self.jitter = Histogram(exponential_buckets(1e-5, 2, 20))
+        self.tick_latency = Histogram(exponential_buckets(1e-5, 2, 20))
+        self.batch_sizes = Histogram(exponential_buckets(1, 2, 14))
+        self.errors = 0
+        self._stopping = None
+        self._pending = []
+        self._in_flight = None
+
+    async def run(self, duration=None):
+        """Run every pipeline until ``stop`` or for ``duration`` seconds"""
+        loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        start = loop.time()
+        n = len(self.asset_ids)
+        tasks = [
+            asyncio.create_task(self._asset_loop(asset_id, start + self.period * i / n))
+            for i, asset_id in enumerate(self.asset_ids)
+        ]
+        try:
+            if duration is None:
+                await self._stopping.wait()
+            else:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), duration)
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            self._stopping.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._in_flight is not None:
+                await asyncio.wait([self._in_flight])
+            if self._own_executor:
+                self.executor.shutdown(wait=True)
+        return self.stats()
+
+    def stop(self):
+        if self._stopping is not None:
+            self._stopping.set()
+
+    async def _asset_loop(self, asset_id, deadline):
+        loop = asyncio.get_running_loop()
+        sensors = self.sensors[asset_id]
+        stats = self.asset_stats[asset_id]
+        scheduler = self.scheduler
+        if scheduler is not None:
+            index = scheduler.asset_index(asset_id)
+        while True:
+            delay = deadline - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            started = loop.time()
+            self.jitter.observe(started - deadline)
+
+            outcome = None
+            try:
+                readings = sensors.read_sensors()
+                future = loop.create_future()
+                self._pending.append((asset_id, readings, future))
+                if self._in_flight is None:
+                    self._dispatch(loop)
+                outcome = await future
+                stats.last_action = outcome['action']
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception(f"Tick failed for asset {asset_id}")
+            stats.ticks += 1
+
+            finished = loop.time()
+            self.tick_latency.observe(finished - started)
+            if scheduler is not None:
+                if outcome is None:
+                    deadline = finished + scheduler.min_interval
+                else:
+                    scheduler.observe(finished, [readings[name] for name in sensors.sensor_names],
+                                      outcome['severity'], index)
+                    deadline = float(scheduler.next_due[index])
+                continue
+            deadline += self.period
+            if finished > deadline:
+                # Overrun: skip the deadlines already missed
+                stats.overruns += 1
+                missed = math.ceil((finished - deadline) / self.period)
+                stats.skipped += missed
+                deadline += missed * self.period
+
+    def _dispatch(self, loop):
+        """Hand every queued tick to the executor as one batch"""
+        batch, self._pending = self._pending, []
+        self.batch_sizes.observe(len(batch))
+        self._in_flight = loop.run_in_executor(self.executor, functools.partial(
+            self.agent.step_many,
+            [readings for _, readings, _ in batch],
+            record=False,
+            asset_ids=[asset_id for asset_id, _, _ in batch]
+        ))
+        self._in_flight.add_done_callback(lambda done: self._complete(loop, batch, done))
+
+    def _complete(self, loop, batch, done):
+        self._in_flight = None
+        if done.cancelled():
+            error = asyncio.CancelledError()
+        else:
+            error = done.exception()
+        for i, (_, _, future) in enumerate(batch):
+            if future.done():
+                continue
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(done.result()[i])
+        if self._pending and not self._stopping.is_set():
+            self._dispatch(loop)
+
+    def stats(self):
+        ticks = sum(s.ticks for s in self.asset_stats.values())
+        return {
+            'assets': len(self.asset_ids),
+            'ticks': ticks,
+            'overruns': sum(s.overruns for s in self.asset_stats.values()),
+            'skipped': sum(s.skipped for s in self.asset_stats.values()),
+            'errors': self.errors,
+            'mean_interval': float(self.scheduler.intervals.mean()) if self.scheduler is not None else self.period,
+            'batch_size': self.batch_sizes.summary(),
+            'jitter_seconds': self.jitter.summary(),
+            'tick_latency_seconds': self.tick_latency.summary()
+        }
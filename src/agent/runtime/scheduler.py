@@ -0,0 +1,167 @@
+# src/agent/runtime/scheduler.py
+
+import numpy as np
+
+from ..environment.sensor_interface import NORMAL, WARNING, CRITICAL, STATUS_NAMES
+
+
+def severity_codes(status_codes, warning_score=2, critical_score=5):
+    """Vectorized ``AdaptiveDecisionMaker._evaluate_severity`` per asset
+
+    ``status_codes`` is an (assets, sensors) array of per-sensor status
+    codes; each WARNING sensor scores 1 and each CRITICAL one 3. Pass the
+    decision maker's ``warning_score`` and ``critical_score`` so both
+    classify an asset the same way.
+    """
+    status_codes = np.asarray(status_codes)
+    score = (status_codes == WARNING).sum(axis=-1) + 3 * (status_codes == CRITICAL).sum(axis=-1)
+    return np.select([score >= critical_score, score >= warning_score],
+                     [CRITICAL, WARNING], NORMAL).astype(np.int8)
+
+
+class AdaptiveScheduler:
+    """Per-asset sampling intervals driven by severity and drift.
+
+    After each observation an asset's interval grows by ``growth`` while it
+    is NORMAL and every reading keeps at least ``margin_threshold`` of its
+    half range away from the ``normal_range`` edges. It shrinks by
+    ``shrink`` on WARNING or when a reading is close to an edge, and drops
+    to ``min_interval`` on CRITICAL. Independently, the interval never
+    exceeds ``horizon_fraction`` of the time the fastest-moving reading
+    needs to reach an edge at its current rate of change. Rates come from
+    an exponentially smoothed level (weight ``smoothing`` on the newest
+    reading) so sensor noise is not mistaken for drift. All updates are
+    vectorized over the assets observed together.
+    """
+
+    def __init__(self, lower, upper, asset_ids=('default',), min_interval=0.5,
+                 max_interval=60.0, initial_interval=5.0, growth=1.5, shrink=0.5,
+                 margin_threshold=0.5, horizon_fraction=0.5, smoothing=0.3):
+        self.asset_ids = list(asset_ids)
+        self._index = {asset_id: i for i, asset_id in enumerate(self.asset_ids)}
+        self._lower = np.asarray(lower, dtype=np.float64)
+        self._upper = np.asarray(upper, dtype=np.float64)
+        self._center = (self._lower + self._upper) / 2
+        self._half_range = (self._upper - self._lower) / 2
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.growth = growth
+        self.shrink = shrink
+        self.margin_threshold = margin_threshold
+        self.horizon_fraction = horizon_fraction
+        self.smoothing = smoothing
+
+        n = len(self.asset_ids)
+        self.intervals = np.full(n, float(initial_interval))
+        self.next_due = np.full(n, -np.inf)
+        self._last_time = np.full(n, np.nan)
+        self._levels = np.full((n, len(self._lower)), np.nan)
+        # Statistics
+        self.samples = np.zeros(n, dtype=np.int64)
+        self.severity_counts = np.zeros((n, len(STATUS_NAMES)), dtype=np.int64)
+        self.interval_sums = np.zeros(n)
+        self._first_time = np.full(n, np.nan)
+
+    @classmethod
+    def for_sensors(cls, sensors, sensor_names=None, **kwargs):
+        """Build a scheduler from a ``SensorInterface.sensors`` style config"""
+        if sensor_names is None:
+            sensor_names = list(sensors)
+        lower = [sensors[name]['normal_range'][0] for name in sensor_names]
+        upper = [sensors[name]['normal_range'][1] for name in sensor_names]
+        return cls(lower, upper, **kwargs)
+
+    def asset_index(self, asset_id):
+        return self._index[asset_id]
+
+    def due(self, now):
+        """Indices of the assets whose next sample is due at ``now``"""
+        return np.flatnonzero(self.next_due <= now)
+
+    def time_until_due(self, now):
+        """Seconds until the earliest asset is due, never negative"""
+        return max(0.0, float(self.next_due.min()) - now)
+
+    def margins(self, values):
+        """Distance of each reading to its nearest normal edge, in half ranges
+
+        1 at the centre of the range, 0 at an edge, negative outside.
+        """
+        return 1.0 - np.abs(np.asarray(values) - self._center) / self._half_range
+
+    def observe(self, now, values, severity, index=None):
+        """Record samples taken at ``now`` and schedule the next ones
+
+        ``values`` is (sensors,) or (assets, sensors) in sensor order,
+        ``severity`` a status code or name, or an array of codes, and
+        ``index`` the asset indices (all assets by default). Returns the new
+        intervals.
+        """
+        if index is None:
+            index = np.arange(len(self.asset_ids))
+        index = np.atleast_1d(index)
+        values = np.asarray(values, dtype=np.float64).reshape(len(index), -1)
+        if isinstance(severity, str):
+            severity = STATUS_NAMES.index(severity)
+        severity = np.broadcast_to(np.asarray(severity), index.shape)
+
+        margins = self.margins(values)
+        # Rate of change of the smoothed level in half ranges per second
+        previous = self._levels[index]
+        levels = np.where(np.isnan(previous), values,
+                          self.smoothing * values + (1 - self.smoothing) * previous)
+        elapsed = now - self._last_time[index]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rates = np.abs(levels - previous) / self._half_range / elapsed[:, None]
+            time_to_edge = np.where(rates > 0, np.maximum(margins, 0) / rates, np.inf)
+        time_to_edge = np.nan_to_num(time_to_edge, nan=np.inf).min(axis=1)
+
+        intervals = self.intervals[index]
+        calm = (severity == NORMAL) & (margins.min(axis=1) >= self.margin_threshold)
+        intervals = np.where(calm, intervals * self.growth, intervals * self.shrink)
+        intervals = np.where(severity == CRITICAL, self.min_interval, intervals)
+        intervals = np.minimum(intervals, self.horizon_fraction * time_to_edge)
+        intervals = np.clip(intervals, self.min_interval, self.max_interval)
+
+        self.intervals[index] = intervals
+        self.next_due[index] = now + intervals
+        self._last_time[index] = now
+        self._levels[index] = levels
+        self._first_time[index] = np.where(np.isnan(self._first_time[index]), now, self._first_time[index])
+        self.samples[index] += 1
+        np.add.at(self.severity_counts, (index, severity.astype(np.intp)), 1)
+        self.interval_sums[index] += intervals
+        return intervals
+
+    def next_interval(self, now, values, severity, asset_id='default'):
+        """Observe one asset and return its next interval in seconds"""
+        return float(self.observe(now, values, severity, self._index[asset_id])[0])
+
+    def asset_stats(self, asset_id):
+        i = self._index[asset_id]
+        samples = int(self.samples[i])
+        return {
+            'samples': samples,
+            'interval': float(self.intervals[i]),
+            'mean_interval': float(self.interval_sums[i] / samples) if samples else float('nan'),
+            'severity_counts': dict(zip(STATUS_NAMES, self.severity_counts[i].tolist()))
+        }
+
+    def stats(self, now, fixed_interval=None):
+        """Fleet totals, with the samples a fixed-rate poll would have taken"""
+        if fixed_interval is None:
+            fixed_interval = self.initial_interval
+        observed = ~np.isnan(self._first_time)
+        baseline = int(np.sum((now - self._first_time[observed]) // fixed_interval + 1))
+        samples = int(self.samples.sum())
+        return {
+            'assets': len(self.asset_ids),
+            'samples': samples,
+            'fixed_rate_samples': baseline,
+            'work_saved': 1.0 - samples / baseline if baseline else 0.0,
+            'mean_interval': float(self.intervals.mean()),
+            'min_interval': float(self.intervals.min()),
+            'max_interval': float(self.intervals.max()),
+            'severity_counts': dict(zip(STATUS_NAMES, self.severity_counts.sum(axis=0).tolist()))
+        }
@@ -0,0 +1,272 @@
+# src/agent/runtime/sharding.py
+
+import math
+import multiprocessing
+from multiprocessing import shared_memory
+import time
+
+import numpy as np
+
+from ..decision.adaptive_decision import ACTION_SPACE
+from ..environment.fleet_interface import FleetSensorInterface
+from ..environment.sensor_interface import STATUS_NAMES
+from .scheduler import AdaptiveScheduler, severity_codes
+
+# Per-shard counter columns
+GENERATION, TICKS, DECISIONS, BUSY_NS = range(4)
+
+
+class SharedArrays:
+    """Named NumPy arrays laid out in one shared memory block.
+
+    ``layout`` maps names to ``(shape, dtype)``; every process that attaches
+    with the same layout sees the same arrays, without pickling. Arrays
+    are 64-byte aligned so shards writing neighbouring rows rarely share
+    a cache line.
+    """
+
+    ALIGN = 64
+
+    def __init__(self, layout, name=None):
+        self.layout = {key: (tuple(shape), np.dtype(dtype)) for key, (shape, dtype) in layout.items()}
+        offsets = {}
+        size = 0
+        for key, (shape, dtype) in self.layout.items():
+            offsets[key] = size
+            nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+            size += -(-nbytes // self.ALIGN) * self.ALIGN
+        self.owner = name is None
+        if self.owner:
+            self.shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.arrays = {
+            key: np.ndarray(shape, dtype=dtype, buffer=self.shm.buf, offset=offsets[key])
+            for key, (shape, dtype) in self.layout.items()
+        }
+        if self.owner:
+            for array in self.arrays.values():
+                array.fill(0)
+
+    def __getitem__(self, key):
+        return self.arrays[key]
+
+    def close(self):
+        """Drop the views and detach; the owner also frees the block"""
+        self.arrays = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def fleet_layout(n_assets, n_sensors, n_shards):
+    return {
+        'readings': ((n_assets, n_sensors), np.float64),
+        'status': ((n_assets, n_sensors), np.int8),
+        'severity': ((n_assets,), np.int8),
+        'actions': ((n_assets,), np.int8),
+        'rewards': ((n_assets,), np.float32),
+        'timestamps': ((n_assets,), np.int64),
+        'counters': ((n_shards, 4), np.int64)
+    }
+
+
+def run_shard(shm_name, layout, shard, start, stop, asset_ids, agent_factory, period, max_ticks,
+              seed, stop_event, scheduler_options=None):
+    """Worker process body: sense, decide and publish one shard of the fleet
+
+    Each tick reads the shard's assets in one vectorized draw, decides for
+    all of them with ``agent.step_many`` and copies the results into the
+    shared arrays. With ``scheduler_options`` an AdaptiveScheduler replaces
+    the fixed ``period``: a tick wakes when the earliest asset is due and
+    senses and decides only for the assets due then. The per-shard
+    generation counter is odd while a tick is being written (a seqlock),
+    so readers can detect torn snapshots.
+    """
+    shared = SharedArrays(layout, name=shm_name)
+    agent = agent_factory(shard, asset_ids)
+    fleet = FleetSensorInterface(asset_ids, history_capacity=2, seed=seed, clock=agent.clock)
+    names = fleet.sensor_names
+    decision_maker = agent.decision_maker
+    action_ids = decision_maker.action_space
+    scheduler = None
+    if scheduler_options is not None:
+        scheduler = AdaptiveScheduler.for_sensors(fleet.sensors, names, asset_ids=asset_ids,
+                                                  **scheduler_options)
+    counters = shared['counters'][shard]
+
+    ticks = 0
+    deadline = time.monotonic()
+    try:
+        while not stop_event.is_set() and (max_ticks is None or ticks < max_ticks):
+            if scheduler is not None:
+                delay = scheduler.time_until_due(time.monotonic())
+            else:
+                delay = deadline - time.monotonic() if period else 0
+            if delay > 0:
+                time.sleep(delay)
+            began = time.perf_counter_ns()
+
+            due = None
+            if scheduler is not None:
+                now = time.monotonic()
+                due = scheduler.due(now)
+                if not len(due):
+                    continue
+            timestamp, values = fleet.read_fleet(due)
+            codes = fleet.evaluate_fleet_health(values)
+            severity = severity_codes(codes, decision_maker.warning_score, decision_maker.critical_score)
+            if scheduler is not None:
+                scheduler.observe(now, values, severity, due)
+            rows = slice(start, stop) if due is None else start + due
+            readings = []
+            for row in values.tolist():
+                reading = {'timestamp': timestamp}
+                reading.update(zip(names, row))
+                readings.append(reading)
+            # The fleet interface keeps the history; health comes from the codes
+            outcomes = agent.step_many(
+                readings,
+                record=False,
+                asset_ids=asset_ids if due is None else [asset_ids[i] for i in due],
+                status_codes=codes
+            )
+            actions = [action_ids.get(outcome['action'], -1) for outcome in outcomes]
+            rewards = [outcome['reward'] for outcome in outcomes]
+
+            counters[GENERATION] += 1
+            shared['readings'][rows] = values
+            shared['status'][rows] = codes
+            shared['severity'][rows] = severity
+            shared['actions'][rows] = actions
+            shared['rewards'][rows] = rewards
+            shared['timestamps'][rows] = np.datetime64(timestamp, 'ns').astype(np.int64)
+            counters[TICKS] += 1
+            counters[DECISIONS] += len(outcomes)
+            counters[BUSY_NS] += time.perf_counter_ns() - began
+            counters[GENERATION] += 1
+
+            ticks += 1
+            if period and scheduler is None:
+                deadline += period
+                now = time.monotonic()
+                if now > deadline:
+                    deadline += math.ceil((now - deadline) / period) * period
+    finally:
+        del counters
+        shared.close()
+
+
+class ShardedFleet:
+    """Partition a fleet across worker processes sharing one memory block.
+
+    Each of ``n_shards`` processes owns a contiguous range of assets and
+    runs its own agent, built by ``agent_factory(shard, asset_ids)`` (a
+    module-level function, so it can be sent to the workers), which must
+    offer ``clock``, ``decision_maker`` and ``step_many(readings,
+    record=..., asset_ids=..., status_codes=...)`` like MaintenanceAgent. Readings, status codes, actions and rewards are
+    published into shared arrays, so the coordinator aggregates fleet
+    metrics without any per-reading messages. ``period=None`` runs the
+    shards flat out, for throughput measurements. ``scheduler_options``
+    (AdaptiveScheduler keyword arguments) give every asset its own
+    adaptive sampling interval instead of ``period``.
+    """
+
+    def __init__(self, asset_ids, agent_factory, n_shards=None, period=1.0, seed=None,
+                 n_sensors=3, mp_context=None, scheduler_options=None):
+        self.asset_ids = list(asset_ids)
+        self.agent_factory = agent_factory
+        self.n_shards = min(n_shards or multiprocessing.cpu_count(), len(self.asset_ids))
+        self.period = period
+        self.seed = seed
+        self.scheduler_options = scheduler_options
+        self.context = mp_context or multiprocessing.get_context()
+        self.bounds = np.linspace(0, len(self.asset_ids), self.n_shards + 1).astype(int)
+        self.shared = SharedArrays(fleet_layout(len(self.asset_ids), n_sensors, self.n_shards))
+        self.shared['actions'].fill(-1)
+        self.processes = []
+        self._stop_event = None
+        self._started = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self, max_ticks=None):
+        """Start one process per shard; ``max_ticks`` bounds each shard's ticks"""
+        self._stop_event = self.context.Event()
+        seeds = np.random.SeedSequence(self.seed).spawn(self.n_shards)
+        for shard in range(self.n_shards):
+            start, stop = self.bounds[shard], self.bounds[shard + 1]
+            process = self.context.Process(
+                target=run_shard,
+                args=(self.shared.name, self.shared.layout, shard, start, stop,
+                      self.asset_ids[start:stop], self.agent_factory, self.period, max_ticks,
+                      seeds[shard], self._stop_event, self.scheduler_options),
+                name=f'fleet-shard-{shard}',
+                daemon=True
+            )
+            process.start()
+            self.processes.append(process)
+        self._started = time.monotonic()
+
+    def join(self, timeout=None):
+        for process in self.processes:
+            process.join(timeout)
+        return all(process.exitcode is not None for process in self.processes)
+
+    def stop(self):
+        if self._stop_event is not None:
+            self._stop_event.set()
+        self.join()
+
+    def close(self):
+        """Stop the workers and free the shared memory"""
+        self.stop()
+        self.processes = []
+        self.shared.close()
+
+    def snapshot(self, retries=100):
+        """Consistent copy of the shared arrays
+
+        Retried while any shard is mid-write, using the shards' generation
+        counters; after ``retries`` the latest (possibly torn) copy is used.
+        """
+        counters = self.shared['counters']
+        for _ in range(retries):
+            before = counters[:, GENERATION].copy()
+            if (before % 2).any():
+                time.sleep(0)
+                continue
+            copy = {key: array.copy() for key, array in self.shared.arrays.items()}
+            if np.array_equal(before, counters[:, GENERATION]):
+                return copy
+        return {key: array.copy() for key, array in self.shared.arrays.items()}
+
+    def metrics(self):
+        """Fleet-level aggregates over every shard's latest tick"""
+        data = self.snapshot()
+        counters = data['counters']
+        elapsed = time.monotonic() - self._started if self._started else 0.0
+        reporting = data['actions'] >= 0
+        action_names = {action_id: name for name, action_id in ACTION_SPACE.items()}
+        actions = np.bincount(data['actions'][reporting], minlength=len(ACTION_SPACE))
+        severities = np.bincount(data['severity'][reporting], minlength=len(STATUS_NAMES))
+        decisions = int(counters[:, DECISIONS].sum())
+        return {
+            'shards': self.n_shards,
+            'assets': len(self.asset_ids),
+            'reporting_assets': int(reporting.sum()),
+            'ticks': counters[:, TICKS].tolist(),
+            'decisions': decisions,
+            'decisions_per_second': decisions / elapsed if elapsed else 0.0,
+            'shard_utilization': (counters[:, BUSY_NS] / 1e9 / elapsed).tolist() if elapsed else [],
+            'sensor_status': dict(zip(STATUS_NAMES, np.bincount(
+                data['status'][reporting].ravel(), minlength=len(STATUS_NAMES)).tolist())),
+            'asset_severity': dict(zip(STATUS_NAMES, severities.tolist())),
+            'actions': {action_names.get(i, i): int(count) for i, count in enumerate(actions) if count},
+            'mean_reward': float(data['rewards'][reporting].mean()) if reporting.any() else float('nan')
+        }
@@ -0,0 +1,110 @@
+# src/agent/runtime/simulation.py
+
+from collections import Counter
+import time
+
+import numpy as np
+
+from ..monitoring.histogram import Histogram, exponential_buckets
+
+# Actions that count as responding to a critical reading
+CRITICAL_RESPONSES = ('immediate_maintenance', 'emergency_shutdown')
+
+
+class SimulationDriver:
+    """Feed recorded or generated readings through an agent on a simulated clock.
+
+    ``agent`` is anything with a ``step(readings)`` method returning a dict
+    with ``action`` and ``reward`` (MaintenanceAgent does), built on the
+    same SimulatedClock passed here. Before each step the clock is moved to
+    the reading's timestamp, so the run takes as long as the CPU needs, not
+    as long as the data spans. When the outcome also carries
+    ``sensor_health``, steps with a CRITICAL sensor that did not get one of
+    ``CRITICAL_RESPONSES`` are counted as missed.
+    """
+
+    def __init__(self, agent, clock, sensor_names=None):
+        self.agent = agent
+        self.clock = clock
+        if sensor_names is None:
+            sensor_names = agent.sensor_interface.sensor_names
+        self.sensor_names = list(sensor_names)
+        self.reset()
+
+    def reset(self):
+        self.steps = 0
+        self.cumulative_reward = 0.0
+        self.action_counts = Counter()
+        self.critical_steps = 0
+        self.missed_criticals = 0
+        self.step_latency = Histogram(exponential_buckets(1e-6, 2, 24))
+        self.wall_seconds = 0.0
+        self.first_timestamp = None
+        self.last_timestamp = None
+
+    def run(self, data, max_steps=None):
+        """Step the agent through a DataFrame or an iterable of DataFrames
+
+        Frames need a ``timestamp`` column and one column per sensor, as
+        ``MaintenanceScenarios.generate_scenario`` and ``iter_scenario``
+        produce. Returns the ``report``.
+        """
+        frames = [data] if hasattr(data, 'columns') else data
+        started = time.perf_counter()
+        try:
+            for frame in frames:
+                timestamps = frame['timestamp'].to_numpy(dtype='datetime64[us]').tolist()
+                values = frame[self.sensor_names].to_numpy(dtype=np.float64).tolist()
+                for timestamp, row in zip(timestamps, values):
+                    if max_steps is not None and self.steps >= max_steps:
+                        return self.report()
+                    self._step(timestamp, row)
+        finally:
+            self.wall_seconds += time.perf_counter() - started
+        return self.report()
+
+    def run_scenario(self, scenarios, scenario_name, duration_hours=24, chunk_minutes=1440, max_steps=None):
+        """Generate a scenario chunk by chunk and run the agent through it"""
+        return self.run(
+            scenarios.iter_scenario(scenario_name, duration_hours, chunk_minutes=chunk_minutes),
+            max_steps=max_steps
+        )
+
+    def _step(self, timestamp, row):
+        self.clock.set(timestamp)
+        readings = {'timestamp': timestamp}
+        readings.update(zip(self.sensor_names, row))
+        started = time.perf_counter()
+        outcome = self.agent.step(readings)
+        self.step_latency.observe(time.perf_counter() - started)
+
+        self.steps += 1
+        self.cumulative_reward += outcome['reward']
+        self.action_counts[outcome['action']] += 1
+        health = outcome.get('sensor_health')
+        if health and any(status['status'] == 'CRITICAL' for status in health.values()):
+            self.critical_steps += 1
+            if outcome['action'] not in CRITICAL_RESPONSES:
+                self.missed_criticals += 1
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+
+    def report(self):
+        simulated = (self.last_timestamp - self.first_timestamp).total_seconds() \
+            if self.steps else 0.0
+        return {
+            'steps': self.steps,
+            'cumulative_reward': self.cumulative_reward,
+            'mean_reward': self.cumulative_reward / self.steps if self.steps else float('nan'),
+            'action_counts': dict(self.action_counts),
+            'shutdowns': self.action_counts.get('emergency_shutdown', 0),
+            'critical_steps': self.critical_steps,
+            'missed_criticals': self.missed_criticals,
+            'step_latency_mean': self.step_latency.mean,
+            'step_latency_p99': self.step_latency.quantile(0.99),
+            'wall_seconds': self.wall_seconds,
+            'decisions_per_second': self.steps / self.wall_seconds if self.wall_seconds else float('nan'),
+            'simulated_seconds': simulated,
+            'speedup': simulated / self.wall_seconds if self.wall_seconds else float('nan')
+        }
@@ -0,0 +1,162 @@
+# src/agent/runtime/sweep.py
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+import itertools
+import json
+import logging
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from ..clock import SimulatedClock
+from ..scenarios.maintenance_scenarios import MaintenanceScenarios
+from .simulation import SimulationDriver
+
+logger = logging.getLogger(__name__)
+
+# Report fields kept per run, in table column order
+SUMMARY_FIELDS = (
+    'steps', 'cumulative_reward', 'mean_reward', 'shutdowns', 'critical_steps',
+    'missed_criticals', 'step_latency_mean', 'step_latency_p99',
+    'decisions_per_second', 'wall_seconds'
+)
+
+
+def cell_seed_sequence(base_seed, scenario, seed, config):
+    """SeedSequence for one cell, independent of sweep size and order"""
+    return np.random.SeedSequence(
+        base_seed,
+        spawn_key=(zlib.crc32(scenario.encode()), seed, zlib.crc32(config.encode()))
+    )
+
+
+def run_cell(agent_factory, scenario, seed, config_name, config, duration_hours, start, base_seed):
+    """Run one scenario x seed x config cell and return its summary row
+
+    ``agent_factory(clock, config, seed_sequence)`` builds the agent on the
+    given SimulatedClock. Module level so it can run in a worker process.
+    """
+    scenario_seed, agent_seed = cell_seed_sequence(base_seed, scenario, seed, config_name).spawn(2)
+    clock = SimulatedClock(start)
+    agent = agent_factory(clock, config, agent_seed)
+    driver = SimulationDriver(agent, clock)
+    report = driver.run_scenario(
+        MaintenanceScenarios(seed=scenario_seed, start=start),
+        scenario,
+        duration_hours=duration_hours
+    )
+    row = {'scenario': scenario, 'seed': seed, 'config': config_name}
+    row.update({field: report[field] for field in SUMMARY_FIELDS})
+    return row
+
+
+class SweepRunner:
+    """Run every scenario x seed x config cell across a process pool.
+
+    Finished rows are appended to ``results_path`` (JSON lines) as soon as
+    they arrive, so an interrupted sweep resumes with only the unfinished
+    cells. A cell that raises is logged and listed in ``failures`` while
+    the others keep running; it stays pending for the next run.
+    ``agent_factory`` must be importable by name (a module-level function)
+    to reach the worker processes.
+    """
+
+    def __init__(self, agent_factory, scenarios, seeds, configs, duration_hours=24,
+                 results_path=None, max_workers=None, base_seed=0, start=datetime(2026, 1, 1)):
+        self.agent_factory = agent_factory
+        self.scenarios = list(scenarios)
+        self.seeds = list(range(seeds)) if isinstance(seeds, int) else list(seeds)
+        # configs maps a name to keyword options for the agent factory
+        self.configs = dict(configs)
+        self.duration_hours = duration_hours
+        self.results_path = results_path
+        self.max_workers = max_workers or os.cpu_count()
+        self.base_seed = base_seed
+        self.start = start
+        self.rows = self._load_rows()
+        self.failures = []
+
+    @staticmethod
+    def _key(row):
+        return (row['scenario'], row['seed'], row['config'])
+
+    def _load_rows(self):
+        if not self.results_path or not os.path.exists(self.results_path):
+            return []
+        rows = []
+        with open(self.results_path) as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # A line cut short by an interruption; the cell reruns
+                    continue
+        return rows
+
+    def cells(self):
+        return list(itertools.product(self.scenarios, self.seeds, self.configs))
+
+    def pending(self):
+        done = {self._key(row) for row in self.rows}
+        return [cell for cell in self.cells() if cell not in done]
+
+    def run(self):
+        """Run the pending cells and return the full results table"""
+        pending = self.pending()
+        if not pending:
+            return self.table()
+        args = [
+            (self.agent_factory, scenario, seed, config, self.configs[config],
+             self.duration_hours, self.start, self.base_seed)
+            for scenario, seed, config in pending
+        ]
+        self.failures = []
+        if self.max_workers == 1:
+            for cell, cell_args in zip(pending, args):
+                try:
+                    row = run_cell(*cell_args)
+                except Exception as exc:
+                    self._fail(cell, exc)
+                    continue
+                self._record(row)
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(args))) as pool:
+                futures = {pool.submit(run_cell, *cell_args): cell for cell, cell_args in zip(pending, args)}
+                for future in as_completed(futures):
+                    try:
+                        row = future.result()
+                    except Exception as exc:
+                        self._fail(futures[future], exc)
+                        continue
+                    self._record(row)
+        return self.table()
+
+    def _fail(self, cell, exc):
+        logger.error(f"Sweep cell {cell} failed: {exc!r}")
+        self.failures.append({'scenario': cell[0], 'seed': cell[1], 'config': cell[2], 'error': repr(exc)})
+
+    def _record(self, row):
+        self.rows.append(row)
+        if self.results_path:
+            with open(self.results_path, 'ab+') as f:
+                if f.seek(0, os.SEEK_END):
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b'\n':
+                        # Terminate a line cut short by an interruption
+                        f.write(b'\n')
+                f.write((json.dumps(row) + '\n').encode())
+                f.flush()
+                os.fsync(f.fileno())
+
+    def table(self):
+        """Results as a columnar DataFrame, one row per finished cell"""
+        columns = ('scenario', 'seed', 'config') + SUMMARY_FIELDS
+        table = pd.DataFrame(self.rows, columns=list(columns))
+        return table.sort_values(['scenario', 'config', 'seed'], ignore_index=True)
+
+    def summary(self):
+        """Mean of each summary field per scenario and config across seeds"""
+        return self.table().groupby(['scenario', 'config'])[list(SUMMARY_FIELDS)].mean()
@@ -1,10 +1,23 @@
 # src/agent/scenarios/maintenance_scenarios.py
 
-from datetime import datetime, timedelta
+from datetime import datetime
 import numpy as np
+import pandas as pd
+
+MINUTES_PER_DAY = 24 * 60
 
 class MaintenanceScenarios:
-    def __init__(self):
+    """Synthetic sensor scenarios sampled once per minute
+
+    Each scenario maps minute indices to per-sensor means and standard
+    deviations as whole arrays; noise is one draw per sensor. Scenarios can
+    be generated at once or streamed in chunks, for one asset or a fleet.
+    """
+    sensor_names = ('temperature', 'vibration', 'pressure')
+    
+    def __init__(self, seed=None, start=None):
+        self.rng = np.random.default_rng(seed)
+        self.start = start
         self.scenarios = {
             'normal_operation': self._normal_operation,
             'gradual_degradation': self._gradual_degradation,
@@ -13,83 +26,119 @@ class MaintenanceScenarios:
             'seasonal_pattern': self._seasonal_pattern
         }
         
-    def generate_scenario(self, scenario_name, duration_hours=24):
+    def generate_scenario(self, scenario_name, duration_hours=24, n_assets=1):
         """Generate scenario data"""
+        chunks = list(self.iter_scenario(
+            scenario_name,
+            duration_hours,
+            n_assets=n_assets,
+            chunk_minutes=None
+        ))
+        if not chunks:
+            # Less than one minute: no rows, but the usual columns
+            empty = np.empty((0, n_assets, len(self.sensor_names)))
+            return self._frame(np.array([], dtype='datetime64[ns]'), empty, n_assets)
+        return chunks[0]
+        
+    def iter_scenario(self, scenario_name, duration_hours=24, n_assets=1, chunk_minutes=MINUTES_PER_DAY):
+        """Yield the scenario as DataFrames of ``chunk_minutes`` minutes each
+
+        With more than one asset the frames are in long format with an
+        ``asset_id`` column, like ``FleetSensorInterface.get_historical_data``.
+        """
+        for timestamps, values in self.iter_arrays(scenario_name, duration_hours, n_assets, chunk_minutes):
+            yield self._frame(timestamps, values, n_assets)
+            
+    def _frame(self, timestamps, values, n_assets):
+        """Build the DataFrame of one ``iter_arrays`` chunk"""
+        if n_assets == 1:
+            data = {'timestamp': timestamps}
+            data.update({sensor: values[:, 0, i] for i, sensor in enumerate(self.sensor_names)})
+        else:
+            data = {
+                'timestamp': np.repeat(timestamps, n_assets),
+                'asset_id': np.tile(np.arange(n_assets), len(timestamps))
+            }
+            data.update({sensor: values[:, :, i].reshape(-1) for i, sensor in enumerate(self.sensor_names)})
+        return pd.DataFrame(data)
+            
+    def iter_arrays(self, scenario_name, duration_hours=24, n_assets=1, chunk_minutes=MINUTES_PER_DAY):
+        """Yield ``(timestamps, values)`` chunks without building DataFrames
+
+        ``values`` is (minutes, assets, sensors) in ``sensor_names`` order, so
+        each row can be passed to ``FleetSensorInterface.ingest``. A
+        ``chunk_minutes`` of None yields a single chunk.
+        """
         if scenario_name not in self.scenarios:
             raise ValueError(f"Unknown scenario: {scenario_name}")
-            
-        return self.scenarios[scenario_name](duration_hours)
+        profile = self.scenarios[scenario_name]
         
-    def _normal_operation(self, duration_hours):
-        """Generate normal operation data"""
-        timestamps = pd.date_range(
-            start=datetime.now(),
-            periods=duration_hours * 60,
-            freq='1min'
-        )
+        total = int(duration_hours * 60)
+        chunk_minutes = chunk_minutes or max(total, 1)
+        start = np.datetime64(self.start if self.start is not None else datetime.now(), 'ns')
         
-        data = []
-        for ts in timestamps:
-            reading = {
-                'timestamp': ts,
-                'temperature': np.random.normal(75, 1),
-                'vibration': np.random.normal(1.0, 0.1),
-                'pressure': np.random.normal(100, 2)
-            }
-            data.append(reading)
+        for begin in range(0, total, chunk_minutes):
+            minutes = np.arange(begin, min(begin + chunk_minutes, total))
+            timestamps = start + minutes * np.timedelta64(60, 's')
+            means, stds = profile(minutes, total, start)
+            noise = self.rng.standard_normal((len(minutes), n_assets, len(self.sensor_names)))
+            values = np.stack(means, axis=-1)[:, None, :] + np.stack(stds, axis=-1)[:, None, :] * noise
+            yield timestamps, values
             
-        return pd.DataFrame(data)
-        
-    def _gradual_degradation(self, duration_hours):
-        """Generate gradual degradation scenario"""
-        data = []
-        base_temp = 75
-        base_vibration = 1.0
+    @staticmethod
+    def _baseline(minutes):
+        """Healthy means and standard deviations, broadcast to ``minutes``"""
+        shape = minutes.shape
+        means = [np.full(shape, 75.0), np.full(shape, 1.0), np.full(shape, 100.0)]
+        stds = [np.full(shape, 1.0), np.full(shape, 0.1), np.full(shape, 2.0)]
+        return means, stds
         
-        timestamps = pd.date_range(
-            start=datetime.now(),
-            periods=duration_hours * 60,
-            freq='1min'
-        )
+    def _normal_operation(self, minutes, total, start):
+        """Generate normal operation data"""
+        return self._baseline(minutes)
         
-        for i, ts in enumerate(timestamps):
-            progress = i / (duration_hours * 60)
-            reading = {
-                'timestamp': ts,
-                'temperature': base_temp + progress * 15 + np.random.normal(0, 1),
-                'vibration': base_vibration + progress * 1.5 + np.random.normal(0, 0.1),
-                'pressure': np.random.normal(100, 2)
-            }
-            data.append(reading)
-            
-        return pd.DataFrame(data)
+    def _gradual_degradation(self, minutes, total, start):
+        """Generate gradual degradation scenario"""
+        means, stds = self._baseline(minutes)
+        progress = minutes / total
+        means[0] += progress * 15
+        means[1] += progress * 1.5
+        return means, stds
         
-    def _sudden_failure(self, duration_hours):
+    def _sudden_failure(self, minutes, total, start):
         """Generate sudden failure scenario"""
-        failure_point = int(duration_hours * 0.7 * 60)  # 70% through duration
+        failure_point = int(total * 0.7)  # 70% through duration
+        means, stds = self._baseline(minutes)
+        failed = minutes >= failure_point
+        for i, (mean, std) in enumerate([(90, 2), (2.5, 0.2), (115, 3)]):
+            means[i][failed] = mean
+            stds[i][failed] = std
+        return means, stds
         
-        timestamps = pd.date_range(
-            start=datetime.now(),
-            periods=duration_hours * 60,
-            freq='1min'
-        )
+    def _multiple_issues(self, minutes, total, start):
+        """Generate overlapping faults: overheating, a loose mount and a leak"""
+        means, stds = self._baseline(minutes)
+        progress = minutes / total
+        # Temperature ramps up from 30% through the duration
+        means[0] += np.clip(progress - 0.3, 0, None) / 0.7 * 12
+        # Vibration steps up at 50% and gets noisier
+        loose = progress >= 0.5
+        means[1][loose] += 0.8
+        stds[1][loose] *= 2
+        # Pressure leaks away from 60%
+        means[2] -= np.clip(progress - 0.6, 0, None) / 0.4 * 10
+        return means, stds
         
-        data = []
-        for i, ts in enumerate(timestamps):
-            if i < failure_point:
-                reading = {
-                    'timestamp': ts,
-                    'temperature': np.random.normal(75, 1),
-                    'vibration': np.random.normal(1.0, 0.1),
-                    'pressure': np.random.normal(100, 2)
-                }
-            else:
-                reading = {
-                    'timestamp': ts,
-                    'temperature': np.random.normal(90, 2),
-                    'vibration': np.random.normal(2.5, 0.2),
-                    'pressure': np.random.normal(115, 3)
-                }
-            data.append(reading)
-            
-        return pd.DataFrame(data)
+    def _seasonal_pattern(self, minutes, total, start):
+        """Generate daily load cycles that peak mid-afternoon, quieter at weekends"""
+        means, stds = self._baseline(minutes)
+        day = start.astype('datetime64[D]')
+        # Minutes since midnight of the start day; 1970-01-01 was a Thursday
+        clock = (start - day) / np.timedelta64(1, 'm') + minutes
+        weekday = (day.astype(np.int64) + 3 + clock // MINUTES_PER_DAY) % 7 < 5
+        daily = np.sin(2 * np.pi * (clock / MINUTES_PER_DAY - 0.375))
+        load = np.where(weekday, 1.0, 0.5) * daily
+        means[0] += 4 * load
+        means[1] += 0.15 * load
+        means[2] += 2 * load
+        return means, stds
@@ -0,0 +1,75 @@
+# src/agent/visualization/downsampling.py
+
+import numpy as np
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets
+
+    Keeps the first and last point; from each of ``n_out - 2`` equal
+    buckets in between it picks the point forming the largest triangle
+    with the previously picked point and the mean of the next bucket,
+    which preserves the visual shape of a line. ``x`` must be increasing.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    # Bucket means from prefix sums, plus the last point as a final "bucket"
+    cx = np.concatenate(([0.0], np.cumsum(x)))
+    cy = np.concatenate(([0.0], np.cumsum(y)))
+    counts = np.diff(edges)
+    mean_x = np.append((cx[edges[1:]] - cx[edges[:-1]]) / counts, x[-1])
+    mean_y = np.append((cy[edges[1:]] - cy[edges[:-1]]) / counts, y[-1])
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax, ay = x[a], y[a]
+        area = np.abs((ax - mean_x[i + 1]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y[i + 1] - ay))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and maximum of ``n_out // 2`` equal buckets
+
+    Cheaper than LTTB and keeps every spike, at the cost of a noisier line.
+    The first and last points are always kept.
+    """
+    y = np.asarray(y, dtype=np.float64)
+    n = len(y)
+    if n_out >= n or n_out < 4:
+        return np.arange(n)
+
+    edges = np.linspace(0, n, n_out // 2 + 1).astype(np.int64)
+    starts = edges[:-1]
+    sizes = np.diff(edges)
+    picked = [np.array([0, n - 1])]
+    for reduce in (np.minimum, np.maximum):
+        extreme = np.repeat(reduce.reduceat(y, starts), sizes)
+        hits = np.flatnonzero(y == extreme)
+        # First hit in each bucket
+        buckets = np.searchsorted(edges, hits, side='right') - 1
+        picked.append(hits[np.unique(buckets, return_index=True)[1]])
+    return np.unique(np.concatenate(picked))
+
+
+def downsample(x, y, n_out, method='lttb'):
+    """``x`` and ``y`` reduced to at most about ``n_out`` points"""
+    x = np.asarray(x)
+    if method == 'lttb':
+        numeric_x = x.astype(np.int64) if np.issubdtype(x.dtype, np.datetime64) else x
+        indices = lttb_indices(numeric_x, y, n_out)
+    elif method == 'minmax':
+        indices = minmax_indices(y, n_out)
+    else:
+        raise ValueError(f"Unknown downsampling method: {method}")
+    return x[indices], np.asarray(y)[indices]
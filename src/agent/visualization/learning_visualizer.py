@@ -2,16 +2,32 @@
 
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-import pandas as pd
 import numpy as np
 
+from .downsampling import downsample
+from .series import DecisionSeries, LearningSeries
+
 class LearningVisualizer:
-    def __init__(self, learner, decision_maker):
+    """Learning dashboard over incrementally collected, downsampled series
+
+    Each refresh copies only the decisions and learning epochs added since
+    the last one into columnar arrays, then sends every trace at most
+    ``max_points`` points (LTTB, or per-bucket min/max with
+    ``method='minmax'``), so redraw cost stays flat as history grows.
+    """
+    
+    def __init__(self, learner, decision_maker, max_points=1000, method='lttb',
+                 sensor_names=('temperature', 'vibration', 'pressure')):
         self.learner = learner
         self.decision_maker = decision_maker
+        self.max_points = max_points
+        self.method = method
+        self.sensor_names = list(sensor_names)
+        self.decisions = DecisionSeries(decision_maker, self.sensor_names)
+        self.learning = LearningSeries(learner)
+        self.figure = None
         
-    def create_learning_dashboard(self):
-        """Create interactive dashboard of learning process"""
+    def _create_figure(self):
         fig = make_subplots(
             rows=2, cols=2,
             subplot_titles=(
@@ -23,51 +39,57 @@ class LearningVisualizer:
         )
         
         # Learning Progress
-        learning_df = pd.DataFrame(self.learner.learning_history)
-        fig.add_trace(
-            go.Scatter(
-                x=learning_df['timestamp'],
-                y=learning_df['model_score'],
-                mode='lines',
-                name='Model Score'
-            ),
-            row=1, col=1
-        )
+        fig.add_trace(go.Scattergl(mode='lines', name='Model Score'), row=1, col=1)
         
         # Decision Distribution
-        decisions = pd.DataFrame(self.decision_maker.decisions_history)
-        decision_counts = decisions['selected_action'].value_counts()
-        fig.add_trace(
-            go.Bar(
-                x=decision_counts.index,
-                y=decision_counts.values,
-                name='Decisions Made'
-            ),
-            row=1, col=2
-        )
+        fig.add_trace(go.Bar(name='Decisions Made'), row=1, col=2)
         
         # Sensor States
-        sensor_data = decisions['state'].apply(pd.Series)
-        for column in ['temperature', 'vibration', 'pressure']:
-            fig.add_trace(
-                go.Scatter(
-                    x=decisions['timestamp'],
-                    y=sensor_data[column],
-                    name=column,
-                    mode='lines'
-                ),
-                row=2, col=1
-            )
-        
+        for column in self.sensor_names:
+            fig.add_trace(go.Scattergl(name=column, mode='lines'), row=2, col=1)
+            
         # Reward History
-        fig.add_trace(
-            go.Scatter(
-                x=learning_df['timestamp'],
-                y=learning_df['buffer_size'],
-                name='Experience Buffer Size'
-            ),
-            row=2, col=2
-        )
+        fig.add_trace(go.Scattergl(name='Experience Buffer Size'), row=2, col=2)
         
         fig.update_layout(height=800, title_text="Learning Process Dashboard")
         return fig
+        
+    def _downsample(self, x, y):
+        return downsample(x, y, self.max_points, self.method)
+        
+    def refresh(self):
+        """Pull new points and update the figure's traces in place"""
+        if self.figure is None:
+            self.figure = self._create_figure()
+        self.decisions.update()
+        self.learning.update()
+        
+        fig = self.figure
+        traces = iter(fig.data)
+        with fig.batch_update():
+            progress = next(traces)
+            progress.x, progress.y = self._downsample(
+                self.learning.timestamps.values, self.learning.model_score.values
+            )
+            
+            # Counts are kept by the decision maker, over every decision
+            counts = self.decision_maker.metrics.action_counts
+            bar = next(traces)
+            bar.x = list(counts.keys())
+            bar.y = list(counts.values())
+            
+            timestamps = self.decisions.timestamps.values
+            for column in self.sensor_names:
+                trace = next(traces)
+                trace.x, trace.y = self._downsample(timestamps, self.decisions.sensors[column].values)
+                
+            buffer_trace = next(traces)
+            buffer_trace.x, buffer_trace.y = self._downsample(
+                self.learning.timestamps.values,
+                self.learning.buffer_size.values.astype(np.float64)
+            )
+        return fig
+        
+    def create_learning_dashboard(self):
+        """Create interactive dashboard of learning process"""
+        return self.refresh()
@@ -0,0 +1,97 @@
+# src/agent/visualization/series.py
+
+import threading
+
+import numpy as np
+
+
+class ColumnBuffer:
+    """Growable NumPy column; appends are amortized O(1) by doubling"""
+
+    def __init__(self, dtype, capacity=1024):
+        self._data = np.empty(capacity, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def extend(self, values):
+        values = np.asarray(values, dtype=self._data.dtype)
+        needed = self._size + len(values)
+        if needed > len(self._data):
+            grown = np.empty(max(needed, 2 * len(self._data)), dtype=self._data.dtype)
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size:needed] = values
+        self._size = needed
+
+    @property
+    def values(self):
+        return self._data[:self._size]
+
+
+class DecisionSeries:
+    """Columnar copy of every decision a decision maker records.
+
+    The series registers itself in ``decision_maker.listeners``, so each
+    batch from ``make_decisions`` is handed over as it is recorded and none
+    is lost to the bounded ``decisions_history``. Batches wait in a list
+    until ``update`` copies them into the columns; decisions still in the
+    history when the series is created are copied first.
+    """
+
+    def __init__(self, decision_maker, sensor_names=('temperature', 'vibration', 'pressure')):
+        self.decision_maker = decision_maker
+        self.sensor_names = list(sensor_names)
+        self.timestamps = ColumnBuffer('datetime64[ns]')
+        self.sensors = {name: ColumnBuffer(np.float64) for name in self.sensor_names}
+        self._lock = threading.Lock()
+        self._pending = list(decision_maker.decisions_history)
+        decision_maker.listeners.append(self._record)
+
+    def _record(self, decisions):
+        with self._lock:
+            self._pending.extend(decisions)
+
+    def close(self):
+        """Stop receiving decisions"""
+        self.decision_maker.listeners.remove(self._record)
+
+    def update(self):
+        """Append new decisions; returns how many were added"""
+        with self._lock:
+            recent, self._pending = self._pending, []
+        if not recent:
+            return 0
+
+        self.timestamps.extend([decision['timestamp'] for decision in recent])
+        for name, column in self.sensors.items():
+            column.extend([decision['state'].get(name, np.nan) for decision in recent])
+        return len(recent)
+
+
+class LearningSeries:
+    """Columnar copy of ``learner.learning_history``, fed incrementally by epoch"""
+
+    def __init__(self, learner):
+        self.learner = learner
+        self.timestamps = ColumnBuffer('datetime64[ns]')
+        self.model_score = ColumnBuffer(np.float64)
+        self.buffer_size = ColumnBuffer(np.int64)
+        self.epoch = -1
+
+    def update(self):
+        history = self.learner.learning_history
+        new = []
+        for entry in reversed(history):
+            if entry['epoch'] <= self.epoch:
+                break
+            new.append(entry)
+        if not new:
+            return 0
+        new.reverse()
+        self.timestamps.extend([entry['timestamp'] for entry in new])
+        self.model_score.extend([entry['model_score'] for entry in new])
+        self.buffer_size.extend([entry['buffer_size'] for entry in new])
+        self.epoch = new[-1]['epoch']
+        return len(new)
@@ -1,73 +1,277 @@
 # src/main.py
 
-from agent.environment.sensor_interface import SensorInterface
+from agent.environment.sensor_interface import SensorInterface, STATUS_NAMES
+from agent.environment.sources import ReplaySource, SourceExhausted
 from agent.learning.reinforcement_learner import ReinforcementLearner
+from agent.learning.background_trainer import BackgroundTrainer
 from agent.decision.adaptive_decision import AdaptiveDecisionMaker
-import time
+from agent.runtime.scheduler import AdaptiveScheduler, severity_codes
+from agent.runtime.simulation import SimulationDriver
+from agent.runtime.sweep import SweepRunner
+from agent.runtime.async_runtime import AsyncAgentRuntime
+from agent.runtime.sharding import ShardedFleet
+from agent.scenarios.maintenance_scenarios import MaintenanceScenarios
+from agent.clock import SimulatedClock, system_clock
+from agent.monitoring.histogram import exponential_buckets
+from agent.monitoring.metrics import MetricsRegistry, MetricsServer
+from agent.monitoring.profiler import SamplingProfiler
+from agent.monitoring.event_journal import EventJournal, queue_logging
+from agent.monitoring.snapshot_store import SnapshotStore
+from datetime import datetime
+import argparse
+import asyncio
+import atexit
+import json
+import os
 import logging
+import time
+
+# Pipeline stages timed by MaintenanceAgent, in cycle order
+STAGES = (
+    'read_sensors', 'get_sensor_health', 'make_decision', 'execute_action',
+    'calculate_reward', 'process_experience', 'log_status'
+)
 
 class MaintenanceAgent:
-    def __init__(self):
+    def __init__(self, source=None, model_path=None, checkpoint_every=1000,
+                 background_training=False, clock=None, learner_options=None, decision_options=None,
+                 event_log=None, status_interval=60.0, snapshot_path=None):
+        # Every component takes its time from the same clock
+        self.clock = clock or system_clock
+        
         # Initialize components
-        self.sensor_interface = SensorInterface()
-        self.learner = ReinforcementLearner()
-        self.decision_maker = AdaptiveDecisionMaker(self.learner)
+        self.sensor_interface = SensorInterface(source=source, clock=self.clock)
+        self.learner = ReinforcementLearner(clock=self.clock, **(learner_options or {}))
         
         # Setup logging
         logging.basicConfig(level=logging.INFO)
         self.logger = logging.getLogger(__name__)
         
-    def run(self, interval=5):
-        """Run the maintenance agent"""
+        # Persistence: snapshot directory plus experience journal beside it
+        self.model_path = model_path
+        self.checkpoint_every = checkpoint_every
+        self.cycles = 0
+        if model_path:
+            self._load_state()
+            
+        # Decision and status events go to disk from a writer thread
+        self.events = EventJournal(event_log, rate_limits={'status': 10.0}) if event_log else None
+        self.status_interval = status_interval
+        self._last_status_log = float('-inf')
+        
+        # Learn on a worker thread; decisions read the last published copy
+        self.trainer = BackgroundTrainer(self.learner) if background_training else None
+        self.decision_maker = AdaptiveDecisionMaker(
+            self.trainer or self.learner,
+            clock=self.clock,
+            journal=self.events,
+            **(decision_options or {})
+        )
+        self._init_metrics()
+        
+        # Versioned snapshots for dashboards, which never talk to the agent
+        self.snapshots = SnapshotStore(snapshot_path, status_function=self._snapshot_status) \
+            if snapshot_path else None
+        
+    def _init_metrics(self):
+        """Per-stage latency histograms plus counters and gauges for the endpoint"""
+        self.metrics = MetricsRegistry(prefix='maintenance_agent_')
+        buckets = exponential_buckets(1e-6, 2, 24)
+        self.stage_latency = {
+            stage: self.metrics.histogram(
+                'stage_seconds', buckets, help="Time spent per cycle in each pipeline stage",
+                labels={'stage': stage}
+            )
+            for stage in STAGES
+        }
+        self.cycle_latency = self.metrics.histogram(
+            'cycle_seconds', buckets, help="Time per sense-decide-act-learn cycle"
+        )
+        self.decision_counter = self.metrics.counter('decisions_total', help="Decisions made")
+        self.metrics.gauge(
+            'experience_buffer_size', help="Experiences held by the decision-side learner",
+            function=lambda: len((self.trainer.learner if self.trainer else self.learner).experience_buffer)
+        )
+        cache = self.decision_maker.cache
+        if cache is not None:
+            self.metrics.counter('decision_cache_hits_total', help="Decision cache hits",
+                                 function=lambda: cache.hits)
+            self.metrics.counter('decision_cache_misses_total', help="Decision cache misses",
+                                 function=lambda: cache.misses)
+        if self.events is not None:
+            self.metrics.gauge('event_journal_queued', help="Events waiting for the journal writer",
+                               function=lambda: self.events.stats()['queued'])
+        if self.trainer is not None:
+            self.metrics.gauge('training_lag', help="Experiences not yet visible to decisions",
+                               function=lambda: self.trainer.stats()['lag'])
+        
+    def run(self, interval=5, scheduler=None):
+        """Run the maintenance agent
+
+        With an AdaptiveScheduler the wait between cycles follows the
+        severity and drift of the readings instead of ``interval``.
+        """
         self.logger.info("Starting Maintenance Agent...")
         
         try:
             while True:
-                # 1. Get current state
-                current_state = self.sensor_interface.read_sensors()
-                sensor_health = self.sensor_interface.get_sensor_health(current_state)
-                
-                # 2. Make decision
-                action = self.decision_maker.make_decision(
-                    current_state,
-                    sensor_health
-                )
-                
-                # 3. Execute action and get result
-                result = self._execute_action(action, current_state)
-                
-                # 4. Calculate reward
-                reward = self._calculate_reward(result, sensor_health)
-                
-                # 5. Learn from experience
-                self.learner.process_experience(
-                    current_state,
-                    action,
-                    result,
-                    reward
-                )
-                
-                # 6. Log status
-                self._log_status(current_state, action, result)
+                outcome = self.step()
+                started = time.perf_counter()
+                self._log_status(outcome['state'], outcome['action'], outcome['result'])
+                self.stage_latency['log_status'].observe(time.perf_counter() - started)
                 
                 # Wait for next cycle
-                time.sleep(interval)
+                if scheduler is not None:
+                    self.clock.sleep(scheduler.next_interval(
+                        self.clock.monotonic(),
+                        [outcome['state'][name] for name in self.sensor_interface.sensor_names],
+                        outcome['severity']
+                    ))
+                elif interval:
+                    self.clock.sleep(interval)
                 
         except KeyboardInterrupt:
             self.logger.info("Shutting down Maintenance Agent...")
             self._save_state()
+        except SourceExhausted:
+            self.logger.info("Sensor source exhausted, shutting down Maintenance Agent...")
+            self._save_state()
             
+    def step(self, readings=None):
+        """Run one sense, decide, execute, reward and learn cycle
+
+        ``readings`` supplied by a driver are recorded instead of reading
+        the sensors. Returns the state, health, severity, action, result
+        and reward of the cycle.
+        """
+        if readings is None:
+            started = time.perf_counter()
+            readings = self.sensor_interface.read_sensors()
+            self.stage_latency['read_sensors'].observe(time.perf_counter() - started)
+            return self.step_many([readings], record=False)[0]
+        return self.step_many([readings])[0]
+        
+    def step_many(self, readings_list, record=True, asset_ids=None, status_codes=None):
+        """Run one cycle for each of several readings, deciding in one batch
+
+        Used by runtimes that tick many assets at once; returns one outcome
+        dict per readings, like ``step``. ``asset_ids``, one per readings,
+        label the published snapshots. ``status_codes``, an (readings x
+        sensors) array from ``evaluate_fleet_health``, replaces the
+        per-sensor threshold checks and severity scoring. Batched stages
+        are recorded in ``stage_latency`` as their per-readings share of
+        the batch time.
+        """
+        clock = time.perf_counter
+        latency = self.stage_latency
+        n = len(readings_list)
+        if not n:
+            return []
+        batch_started = clock()
+        
+        # 1. Get current states
+        if record:
+            states = [self.sensor_interface.record(readings) for readings in readings_list]
+            sensed = clock()
+            latency['read_sensors'].observe((sensed - batch_started) / n, n)
+        else:
+            states = list(readings_list)
+            sensed = batch_started
+        if status_codes is None:
+            healths = [self.sensor_interface.get_sensor_health(state) for state in states]
+            severities = [self.decision_maker._evaluate_severity(health) for health in healths]
+        else:
+            sensor_interface = self.sensor_interface
+            healths = [sensor_interface.health_from_codes(state, codes)
+                       for state, codes in zip(states, status_codes.tolist())]
+            severities = [STATUS_NAMES[code] for code in severity_codes(
+                status_codes, self.decision_maker.warning_score, self.decision_maker.critical_score
+            ).tolist()]
+        assessed = clock()
+        latency['get_sensor_health'].observe((assessed - sensed) / n, n)
+        
+        # 2. Make decisions
+        actions = self.decision_maker.make_decisions(states, healths, severities)
+        decided = clock()
+        latency['make_decision'].observe((decided - assessed) / n, n)
+        self.decision_counter.inc(n)
+        
+        outcomes = []
+        learner = self.trainer or self.learner
+        if asset_ids is None:
+            asset_ids = [None] * n
+        for current_state, sensor_health, severity, action, asset_id in zip(
+                states, healths, severities, actions, asset_ids):
+            # 3. Execute action and get result
+            started = clock()
+            result = self._execute_action(action, current_state)
+            executed = clock()
+            
+            # 4. Calculate reward
+            reward = self._calculate_reward(result, sensor_health)
+            rewarded = clock()
+            
+            # 5. Learn from experience
+            learner.process_experience(
+                current_state,
+                action,
+                result,
+                reward
+            )
+            latency['execute_action'].observe(executed - started)
+            latency['calculate_reward'].observe(rewarded - executed)
+            latency['process_experience'].observe(clock() - rewarded)
+            
+            # Periodic checkpoint, written in the background
+            self.cycles += 1
+            if self.model_path and self.checkpoint_every and self.cycles % self.checkpoint_every == 0:
+                if self.trainer is not None:
+                    self.trainer.checkpoint(self.model_path)
+                else:
+                    self.learner.save_model(self.model_path, background=True)
+                    
+            if self.snapshots is not None:
+                self.snapshots.publish(result['timestamp'], current_state, sensor_health, severity, action,
+                                       reward, asset_id=asset_id)
+                
+            outcomes.append({
+                'state': current_state,
+                'sensor_health': sensor_health,
+                'severity': severity,
+                'action': action,
+                'result': result,
+                'reward': reward
+            })
+        self.cycle_latency.observe((clock() - batch_started) / n, n)
+        return outcomes
+        
     def _execute_action(self, action, state):
         """Execute maintenance action"""
         # Simulate action execution
         result = {
             'action': action,
             'success': True,
-            'timestamp': datetime.now(),
+            # The reading's own time, which differs from the wall clock in replay
+            'timestamp': state.get('timestamp') or self.clock.now(),
             'effects': self._simulate_action_effects(action, state)
         }
         return result
         
+    def _simulate_action_effects(self, action, state):
+        """Simulate how far each reading moves back toward its normal midpoint"""
+        recovery = {
+            'schedule_maintenance': 0.3,
+            'immediate_maintenance': 0.7,
+            'emergency_shutdown': 1.0
+        }.get(action, 0.0)
+        
+        effects = {}
+        for sensor, config in self.sensor_interface.sensors.items():
+            if sensor in state:
+                target = sum(config['normal_range']) / 2
+                effects[sensor] = (target - state[sensor]) * recovery
+        return effects
+        
     def _calculate_reward(self, result, sensor_health):
         """Calculate reward for taken action"""
         reward = 0
@@ -86,8 +290,25 @@ class MaintenanceAgent:
                 
         return reward
         
+    def _snapshot_status(self):
+        """Aggregate metrics stored alongside each batch of snapshots"""
+        status = {
+            'decision_metrics': self.decision_maker.get_decision_metrics(),
+            'stage_latency': {stage: histogram.summary() for stage, histogram in self.stage_latency.items()}
+        }
+        if self.trainer is not None:
+            status['training'] = self.trainer.stats()
+        return status
+        
     def _log_status(self, state, action, result):
-        """Log current status"""
+        """Journal the cycle's status; log a summary every ``status_interval`` seconds"""
+        if self.events is not None:
+            self.events.emit('status', {'action': action, 'success': result['success']})
+        now = self.clock.monotonic()
+        if now - self._last_status_log < self.status_interval:
+            return
+        self._last_status_log = now
+        
         metrics = self.decision_maker.get_decision_metrics()
         self.logger.info(f"""
 Status Update:
@@ -97,11 +318,214 @@ Success: {result['success']}
 Total Decisions: {metrics['total_decisions']}
 Average Confidence: {metrics['average_confidence']:.2f}
         """)
+        if self.trainer is not None:
+            stats = self.trainer.stats()
+            self.logger.info(
+                f"Training: {stats['swaps']} swaps, lag {stats['lag']}, "
+                f"staleness {stats['staleness_seconds']:.2f}s, "
+                f"last batch {stats['last_train_seconds'] * 1000:.1f}ms"
+            )
+        
+    def _journal_path(self):
+        return f"{self.model_path}.journal"
+        
+    def _load_state(self):
+        """Restore learner state from the last snapshot and the journal"""
+        journal = self._journal_path()
+        if os.path.exists(os.path.join(self.model_path, 'meta.json')):
+            self.learner.load_model(self.model_path, journal_directory=journal)
+            self.logger.info(f"Restored {len(self.learner.experience_buffer)} experiences")
+        elif os.path.isdir(journal):
+            self.learner.replay_journal(journal)
+        self.learner.open_journal(journal)
         
     def _save_state(self):
         """Save agent state"""
-        self.learner.save_model('models/maintenance_agent.joblib')
+        if self.events is not None:
+            self.events.close()
+        if self.snapshots is not None:
+            self.snapshots.close()
+        if self.trainer is not None:
+            # Train on everything outstanding and take back the journaling copy
+            self.learner = self.trainer.close()
+        if not self.model_path:
+            return
+        self.learner.save_model(self.model_path)
+        self.learner.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the maintenance agent")
+    parser.add_argument('--interval', type=float, default=None,
+                        help="Seconds between cycles (default 5, or 0 when replaying)")
+    parser.add_argument('--replay', help="Recorded CSV or Parquet sensor log to replay")
+    parser.add_argument('--speed', type=float, default=None,
+                        help="Replay speed multiplier; omit to replay as fast as possible")
+    parser.add_argument('--adaptive', action='store_true',
+                        help="Adapt the interval to severity and drift of the readings")
+    parser.add_argument('--min-interval', type=float, default=0.5)
+    parser.add_argument('--max-interval', type=float, default=60.0)
+    parser.add_argument('--assets', type=int, default=None,
+                        help="Drive this many simulated assets concurrently on one event loop")
+    parser.add_argument('--shards', type=int, default=None,
+                        help="Split --assets across this many worker processes")
+    parser.add_argument('--model-path', default='models/maintenance_agent',
+                        help="Directory the agent's learner is checkpointed to and restored from")
+    parser.add_argument('--events', default='logs/events',
+                        help="Directory of the JSON-lines decision and status journal")
+    parser.add_argument('--snapshots', default='logs/snapshots.db',
+                        help="SQLite store the dashboard reads agent snapshots from")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Serve Prometheus metrics on this localhost port")
+    parser.add_argument('--profile', type=float, default=None, metavar='SECONDS',
+                        help="Sample stacks for this many seconds and write collapsed stacks")
+    parser.add_argument('--profile-output', default='agent_profile.folded',
+                        help="Collapsed-stack file for --profile (flamegraph.pl, speedscope)")
+    parser.add_argument('--scenario', help="Run over a generated scenario on a simulated clock")
+    parser.add_argument('--hours', type=float, default=24, help="Scenario duration in hours")
+    parser.add_argument('--seed', type=int, default=None, help="Scenario random seed")
+    parser.add_argument('--sweep', nargs='+', metavar='SCENARIO',
+                        help="Sweep these scenarios over seeds and configs on all cores")
+    parser.add_argument('--seeds', type=int, default=4, help="Seeds per sweep cell")
+    parser.add_argument('--configs', help="JSON file mapping config names to "
+                        "{'learner': {...}, 'decision': {...}} options")
+    parser.add_argument('--results', default='sweep_results.jsonl',
+                        help="Sweep results file; finished cells are skipped on rerun")
+    return parser.parse_args()
+
+def run_simulation(args):
+    """Run a fresh agent over a generated scenario as fast as possible"""
+    start = datetime.now()
+    scenarios = MaintenanceScenarios(seed=args.seed, start=start)
+    clock = SimulatedClock(start=start)
+    agent = MaintenanceAgent(clock=clock)
+    driver = SimulationDriver(agent, clock)
+    report = driver.run_scenario(scenarios, args.scenario, duration_hours=args.hours)
+    agent.logger.info(
+        f"{args.scenario}: {report['steps']} decisions in {report['wall_seconds']:.1f}s "
+        f"({report['decisions_per_second']:.0f}/s, {report['speedup']:.0f}x real time), "
+        f"cumulative reward {report['cumulative_reward']:.1f}"
+    )
+    return report
+
+def simulation_agent(clock, config, seed_sequence):
+    """Build an agent for one sweep cell from its config options"""
+    learner_options = dict(config.get('learner', {}))
+    if learner_options.get('eviction', 'fifo') != 'fifo':
+        learner_options.setdefault('seed', seed_sequence)
+    return MaintenanceAgent(
+        clock=clock,
+        learner_options=learner_options,
+        decision_options=config.get('decision')
+    )
+
+def shard_agent(shard, asset_ids):
+    """Build the agent for one fleet shard process"""
+    return MaintenanceAgent()
+
+def scheduler_options(args, interval):
+    """AdaptiveScheduler options for the fleet runtimes, or None without --adaptive"""
+    if not args.adaptive:
+        return None
+    return {
+        'min_interval': args.min_interval,
+        'max_interval': args.max_interval,
+        'initial_interval': interval
+    }
+
+def run_sharded(args):
+    """Run --assets simulated assets across --shards processes, logging fleet metrics"""
+    logger = logging.getLogger(__name__)
+    period = args.interval or 1.0
+    with ShardedFleet(range(args.assets), shard_agent, n_shards=args.shards,
+                      period=period, seed=args.seed,
+                      scheduler_options=scheduler_options(args, period)) as fleet:
+        fleet.start()
+        try:
+            while True:
+                system_clock.sleep(max(period, 5.0))
+                logger.info(f"Fleet: {fleet.metrics()}")
+        except KeyboardInterrupt:
+            logger.info(f"Shutting down fleet... {fleet.metrics()}")
+
+def run_sweep(args):
+    """Run a scenario x seed x config sweep and print per-config means"""
+    configs = {'default': {}}
+    if args.configs:
+        with open(args.configs) as f:
+            configs = json.load(f)
+    runner = SweepRunner(
+        simulation_agent,
+        args.sweep,
+        args.seeds,
+        configs,
+        duration_hours=args.hours,
+        results_path=args.results,
+        base_seed=args.seed or 0
+    )
+    logging.getLogger(__name__).info(
+        f"Sweep: {len(runner.pending())} of {len(runner.cells())} cells to run"
+    )
+    runner.run()
+    print(runner.summary().to_string())
 
 if __name__ == "__main__":
-    agent = MaintenanceAgent()
-    agent.run()
+    args = parse_args()
+    if args.scenario:
+        run_simulation(args)
+        raise SystemExit(0)
+    if args.sweep:
+        logging.basicConfig(level=logging.INFO)
+        run_sweep(args)
+        raise SystemExit(0)
+    if args.assets and args.shards:
+        logging.basicConfig(level=logging.INFO)
+        run_sharded(args)
+        raise SystemExit(0)
+        
+    agent = MaintenanceAgent(
+        model_path=args.model_path,
+        background_training=True,
+        event_log=args.events,
+        snapshot_path=args.snapshots
+    )
+    # Console logging and warnings into the journal, both off the decision thread
+    atexit.register(queue_logging().stop)
+    logging.getLogger().addHandler(agent.events.handler(logging.WARNING))
+    if args.metrics_port is not None:
+        server = MetricsServer(agent.metrics, port=args.metrics_port).start()
+        agent.logger.info(f"Serving metrics on http://{server.host}:{server.port}/metrics")
+    if args.profile:
+        SamplingProfiler().start(duration=args.profile, path=args.profile_output)
+        agent.logger.info(f"Profiling for {args.profile:.0f}s into {args.profile_output}")
+    if args.assets:
+        period = args.interval or 1.0
+        runtime = AsyncAgentRuntime(agent, range(args.assets), period=period,
+                                    scheduler_options=scheduler_options(args, period))
+        try:
+            asyncio.run(runtime.run())
+        except KeyboardInterrupt:
+            agent.logger.info(f"Shutting down Maintenance Agent... {runtime.stats()}")
+            agent._save_state()
+        raise SystemExit(0)
+        
+    if args.replay:
+        agent.sensor_interface.source = ReplaySource(
+            args.replay,
+            agent.sensor_interface.sensor_names,
+            speed=args.speed
+        )
+    interval = args.interval
+    if interval is None:
+        interval = 0 if args.replay else 5
+        
+    scheduler = None
+    if args.adaptive and not args.replay:
+        scheduler = AdaptiveScheduler.for_sensors(
+            agent.sensor_interface.sensors,
+            agent.sensor_interface.sensor_names,
+            min_interval=args.min_interval,
+            max_interval=args.max_interval,
+            initial_interval=interval
+        )
+        
+    agent.run(interval=interval, scheduler=scheduler)
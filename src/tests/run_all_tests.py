@@ -9,6 +9,9 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from src.tests.test_sensors import TestSensors
 from src.tests.test_learning import TestLearning
 from src.tests.test_decision import TestDecision
+from src.tests.test_monitoring import TestMonitoring
+from src.tests.test_runtime import TestRuntime
+from src.tests.test_visualization import TestVisualization
 
 def run_all_tests():
     # Create test suite
@@ -18,6 +21,9 @@ def run_all_tests():
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestSensors))
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestLearning))
     test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestDecision))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestMonitoring))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestRuntime))
+    test_suite.addTests(unittest.TestLoader().loadTestsFromTestCase(TestVisualization))
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -1,10 +1,12 @@
 import unittest
 import sys
 import os
+import numpy as np
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.agent.decision.adaptive_decision import AdaptiveDecisionMaker
 from src.agent.learning.reinforcement_learner import ReinforcementLearner
+from src.agent.decision.decision_cache import DecisionCache
 
 class TestDecision(unittest.TestCase):
     # Rest of the code remains same
@@ -43,3 +45,58 @@ class TestDecision(unittest.TestCase):
         
         decision = self.decision_maker.make_decision(state, sensor_health)
         self.assertEqual(decision, 'emergency_shutdown')
+
+    def test_learned_decision(self):
+        """Test learned rewards drive the decision in normal conditions"""
+        state = {'temperature': 75, 'vibration': 1.0, 'pressure': 100}
+        sensor_health = {sensor: {'status': 'NORMAL'} for sensor in state}
+        for action, reward in [('no_action', 2), ('increase_monitoring', 0),
+                               ('schedule_maintenance', -1)] * 3:
+            self.learner.process_experience(state, action, {'success': True}, reward)
+
+        decision = self.decision_maker.make_decision(state, sensor_health)
+        self.assertEqual(decision, 'no_action')
+
+    def test_decision_metrics(self):
+        """Test streaming metrics agree with the recorded decisions"""
+        state = {'temperature': 75, 'vibration': 1.0, 'pressure': 100}
+        statuses = ['NORMAL', 'WARNING', 'CRITICAL']
+        for i in range(30):
+            health = {sensor: {'status': statuses[i % 3]} for sensor in state}
+            action = self.decision_maker.make_decision(state, health)
+            self.learner.process_experience(state, action, {'success': True}, i % 4)
+
+        history = self.decision_maker.decisions_history
+        metrics = self.decision_maker.get_decision_metrics()
+        confidences = [next(iter(d['predictions'].values()))['confidence']
+                       for d in history if d['predictions']]
+
+        self.assertEqual(metrics['total_decisions'], 30)
+        self.assertEqual(sum(metrics['action_distribution'].values()), 30)
+        self.assertEqual(metrics['severity_distribution'], {'NORMAL': 10, 'WARNING': 10, 'CRITICAL': 10})
+        self.assertAlmostEqual(metrics['average_confidence'], np.mean(confidences))
+        self.assertAlmostEqual(metrics['confidence_std'], np.std(confidences, ddof=1))
+        self.assertAlmostEqual(metrics['window_rates']['decisions_per_minute'], 30 / 60)
+
+    def test_decision_cache(self):
+        """Test cached decisions are reused until the learner epoch moves"""
+        cache = DecisionCache(maxsize=16, ttl=None, state_quantum=1.0)
+        learner = ReinforcementLearner(epoch_min_changes=5)
+        decision_maker = AdaptiveDecisionMaker(learner, cache=cache)
+        health = {sensor: {'status': 'NORMAL'} for sensor in ['temperature', 'vibration', 'pressure']}
+
+        for _ in range(3):
+            learner.process_experience({'temperature': 75, 'vibration': 1.0, 'pressure': 100},
+                                       'no_action', {'success': True}, -1)
+        first = decision_maker.make_decision({'temperature': 75.1, 'vibration': 1.0, 'pressure': 100}, health)
+        second = decision_maker.make_decision({'temperature': 74.9, 'vibration': 1.1, 'pressure': 100.2}, health)
+        self.assertEqual(first, second)
+        self.assertEqual(cache.stats()['hits'], 1)
+
+        # Enough new experience advances the epoch and invalidates the entry
+        for _ in range(5):
+            learner.process_experience({'temperature': 75, 'vibration': 1.0, 'pressure': 100},
+                                       'increase_monitoring', {'success': True}, 3)
+        third = decision_maker.make_decision({'temperature': 75, 'vibration': 1.0, 'pressure': 100}, health)
+        self.assertEqual(third, 'increase_monitoring')
+        self.assertEqual(cache.stats()['misses'], 2)
@@ -1,9 +1,19 @@
 import unittest
 import sys
 import os
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+from sklearn.dummy import DummyRegressor
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
+from src.agent.clock import SimulatedClock
 from src.agent.learning.reinforcement_learner import ReinforcementLearner
+from src.agent.learning.enhanced_learner import EnhancedLearner
+from src.agent.learning.persistence import ExperienceJournal
+from src.agent.learning.background_trainer import BackgroundTrainer
+from src.agent.learning.inference_server import BatchInferenceServer
 
 class TestLearning(unittest.TestCase):
     # Rest of the code remains same
@@ -25,3 +35,358 @@ class TestLearning(unittest.TestCase):
         state = {'temperature': 75, 'vibration': 1.0, 'pressure': 100}
         prediction = self.learner.predict_outcome(state, 'monitor')
         self.assertIsNotNone(prediction)
+
+    def test_nearest_neighbour_prediction(self):
+        """Test predictions average the k nearest experiences of the action"""
+        rng = np.random.default_rng(0)
+        states = rng.normal([75, 1.0, 100], [5, 0.3, 5], size=(2000, 3))
+        rewards = rng.normal(size=2000)
+        for state, reward in zip(states, rewards):
+            state = dict(zip(['temperature', 'vibration', 'pressure'], state))
+            self.learner.process_experience(state, 'monitor', {'success': True}, reward)
+
+        query = {'temperature': 80, 'vibration': 1.2, 'pressure': 98}
+        k = self.learner.n_neighbors
+        distances = np.linalg.norm(states - [80, 1.2, 98], axis=1)
+        expected = rewards[np.argsort(distances)[:k]].mean()
+
+        prediction = self.learner.predict_outcome(query, 'monitor')
+        self.assertAlmostEqual(prediction['predicted_reward'], expected)
+        self.assertEqual(prediction['confidence'], 1.0)
+        self.assertIsNone(self.learner.predict_outcome(query, 'emergency_shutdown'))
+
+    def test_bounded_buffer_eviction(self):
+        """Test eviction keeps the buffer bounded and the index consistent"""
+        rng = np.random.default_rng(1)
+        states = rng.normal([75, 1.0, 100], [5, 0.3, 5], size=(3000, 3))
+        rewards = rng.normal(size=3000)
+        actions = rng.integers(0, 2, size=3000)
+
+        for eviction in ('fifo', 'reservoir', 'time_decay'):
+            policy_kwargs = {} if eviction == 'fifo' else {'seed': 3}
+            learner = ReinforcementLearner(capacity=500, eviction=eviction, **policy_kwargs)
+            for state, action, reward in zip(states, actions, rewards):
+                state = dict(zip(['temperature', 'vibration', 'pressure'], state))
+                learner.process_experience(state, int(action), {'success': True}, reward)
+
+            buffer = learner.experience_buffer
+            self.assertEqual(len(buffer), 500)
+            self.assertEqual(len(learner.experience_store), 500)
+            self.assertGreater(learner.memory_footprint()['total'], 0)
+
+            # Neighbours must come from the retained experiences only
+            action_id = learner.action_ids[1]
+            retained = buffer.actions[:buffer.size] == action_id
+            kept_states = buffer.states[:buffer.size][retained].astype(np.float64)
+            kept_rewards = buffer.rewards[:buffer.size][retained]
+            query = np.array([80, 1.2, 98])
+            order = np.argsort(np.linalg.norm(kept_states - query, axis=1))[:10]
+            prediction = learner.predict_outcome(dict(zip(['temperature', 'vibration', 'pressure'], query)), 1)
+            self.assertAlmostEqual(prediction['predicted_reward'], kept_rewards[order].mean(), places=5)
+
+    def test_predict_outcomes(self):
+        """Test the batched prediction matches per-action predictions"""
+        rng = np.random.default_rng(2)
+        actions = ['no_action', 'increase_monitoring', 'schedule_maintenance']
+        mean_learner = ReinforcementLearner(n_neighbors=None)
+        for _ in range(600):
+            state = dict(zip(['temperature', 'vibration', 'pressure'],
+                             rng.normal([75, 1.0, 100], [5, 0.3, 5])))
+            action = actions[rng.integers(0, 3)]
+            reward = rng.normal()
+            self.learner.process_experience(state, action, {'success': True}, reward)
+            mean_learner.process_experience(state, action, {'success': True}, reward)
+
+        query = {'temperature': 74, 'vibration': 0.9, 'pressure': 103}
+        predictions = self.learner.predict_outcomes(query, actions + ['emergency_shutdown'])
+        self.assertListEqual(sorted(predictions), sorted(actions))
+        for action in actions:
+            self.assertEqual(predictions[action], self.learner.predict_outcome(query, action))
+
+        # Without neighbour search predictions are the per-action mean reward
+        buffer = mean_learner.experience_buffer
+        for action in actions:
+            mask = buffer.actions[:buffer.size] == mean_learner.action_ids[action]
+            self.assertAlmostEqual(
+                mean_learner.predict_outcome(query, action)['predicted_reward'],
+                buffer.rewards[:buffer.size][mask].mean(),
+                places=5
+            )
+
+    def test_snapshot_and_journal_restore(self):
+        """Test a restart restores the snapshot plus journaled experiences"""
+        rng = np.random.default_rng(4)
+        query = {'temperature': 76, 'vibration': 1.1, 'pressure': 99}
+
+        def feed(learner, count):
+            for _ in range(count):
+                state = dict(zip(['temperature', 'vibration', 'pressure'],
+                                 rng.normal([75, 1.0, 100], [5, 0.3, 5])))
+                action = ['no_action', 'schedule_maintenance'][rng.integers(0, 2)]
+                learner.process_experience(state, action, {'success': True}, rng.normal())
+
+        with tempfile.TemporaryDirectory() as tmp:
+            snapshot = os.path.join(tmp, 'model')
+            journal = os.path.join(tmp, 'model.journal')
+
+            learner = ReinforcementLearner(capacity=300)
+            learner.open_journal(journal, sync_every=16)
+            feed(learner, 400)
+            learner.save_model(snapshot, background=True)
+            feed(learner, 150)
+            learner.close()
+
+            restored = ReinforcementLearner()
+            restored.load_model(snapshot, journal_directory=journal)
+
+            self.assertEqual(restored.experience_buffer.capacity, 300)
+            self.assertEqual(restored.experience_buffer.seen, 550)
+            self.assertEqual(len(restored.experience_store), 300)
+            for action in ['no_action', 'schedule_maintenance']:
+                expected = learner.predict_outcome(query, action)
+                actual = restored.predict_outcome(query, action)
+                self.assertAlmostEqual(actual['predicted_reward'], expected['predicted_reward'], places=5)
+                self.assertAlmostEqual(actual['confidence'], expected['confidence'])
+
+    def test_restore_after_crash_with_empty_segment(self):
+        """Test a segment truncated by a crash does not prevent a restore"""
+        state = {'temperature': 75, 'vibration': 1.0, 'pressure': 100}
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = os.path.join(tmp, 'model.journal')
+            learner = ReinforcementLearner()
+            learner.open_journal(journal, sync_every=4)
+            for _ in range(8):
+                learner.process_experience(state, 'no_action', {'success': True}, 1.0)
+            learner.journal.rotate()
+            last = learner.journal.segment_path
+            learner.close()
+            # Killed before the new segment's header reached the disk
+            open(last, 'wb').close()
+
+            restored = ReinforcementLearner()
+            restored.replay_journal(journal)
+            restored.open_journal(journal)
+            self.assertEqual(restored.experience_buffer.seen, 8)
+            restored.process_experience(state, 'no_action', {'success': True}, 1.0)
+            restored.save_model(os.path.join(tmp, 'model'))
+            restored.close()
+            self.assertFalse(os.path.exists(last))
+
+    def test_journal_syncs_when_idle(self):
+        """Test records are synced after sync_interval even without more appends"""
+        state = {'temperature': 75, 'vibration': 1.0, 'pressure': 100}
+        with tempfile.TemporaryDirectory() as tmp:
+            journal = os.path.join(tmp, 'model.journal')
+            learner = ReinforcementLearner()
+            learner.open_journal(journal, sync_every=256, sync_interval=0.05)
+            for _ in range(3):
+                learner.process_experience(state, 'no_action', {'success': True}, 1.0)
+            segment = learner.journal.segment_path
+            deadline = time.monotonic() + 5
+            while len(ExperienceJournal.read_segment(segment)) < 3 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(len(ExperienceJournal.read_segment(segment)), 3)
+            learner.close()
+
+    def test_enhanced_learner_builds_models_lazily(self):
+        """Test only the model in use is built"""
+        learner = EnhancedLearner()
+        self.assertEqual(learner.models.loaded(), [])
+
+        rng = np.random.default_rng(5)
+        X = rng.normal(size=(50, 3))
+        y = X.sum(axis=1)
+        learner.train(X, y)
+        self.assertEqual(learner.predict(X[:5]).shape, (5,))
+        self.assertEqual(learner.models.loaded(), ['rf'])
+
+    def test_sequence_windows(self):
+        """Test zero-copy windows and chunked batches match explicit windows"""
+        learner = EnhancedLearner(sequence_length=4)
+        data = np.arange(60, dtype=np.float32).reshape(20, 3)
+        targets = np.arange(20, dtype=np.float32)
+        expected = np.array([data[i:i + 4] for i in range(17)])
+
+        windows = learner._prepare_sequences(data)
+        np.testing.assert_array_equal(windows, expected)
+        self.assertTrue(np.shares_memory(windows, data))
+
+        batches = list(learner.iter_sequence_batches(data, targets, batch_size=5, chunk_rows=7))
+        np.testing.assert_array_equal(np.concatenate([b[0] for b in batches]), expected)
+        np.testing.assert_array_equal(np.concatenate([b[1] for b in batches]), targets[3:])
+        self.assertTrue(all(len(b[0]) <= 5 for b in batches))
+
+        chunks = [(data[i:i + 6], targets[i:i + 6]) for i in range(0, 20, 6)]
+        streamed = list(learner.iter_sequence_batches(chunks, batch_size=5))
+        np.testing.assert_array_equal(np.concatenate([b[0] for b in streamed]), expected)
+
+    def test_incremental_forest_training(self):
+        """Test incremental updates grow a bounded forest over a bounded window"""
+        learner = EnhancedLearner(window_size=100, trees_per_update=5, max_trees=30)
+        rng = np.random.default_rng(6)
+        for _ in range(8):
+            X = rng.normal(size=(40, 3))
+            learner.train(X, X.sum(axis=1), incremental=True)
+
+        model = learner.models['rf']
+        self.assertEqual(len(model.estimators_), 30)
+        self.assertEqual(len(learner.training_window), 100)
+        np.testing.assert_array_equal(learner.training_window.X[-40:], X.astype(np.float32))
+
+        X_test = rng.normal(size=(200, 3))
+        error = np.mean((learner.predict(X_test) - X_test.sum(axis=1)) ** 2)
+        self.assertLess(error, np.var(X_test.sum(axis=1)))
+
+    def test_incremental_lstm_short_updates(self):
+        """Test LSTM updates shorter than a window are buffered until one fills"""
+        fits = []
+
+        class RecordingModel:
+            def fit(self, X, y, **kwargs):
+                fits.append((X.shape, y.copy()))
+
+        rng = np.random.default_rng(6)
+        X = rng.normal(size=(14, 3))
+        y = np.arange(14, dtype=np.float32)
+        learner = EnhancedLearner(active_model='lstm', sequence_length=5)
+        learner.models.register('lstm', RecordingModel)
+
+        self.assertIsNone(learner.partial_train(X[:2], y[:2]))
+        self.assertIsNone(learner.partial_train(X[2:4], y[2:4]))
+        self.assertEqual(fits, [])
+        learner.partial_train(X[4:7], y[4:7])
+        learner.partial_train(X[7:14], y[7:14])
+
+        # Every row with a full window behind it is trained on exactly once
+        self.assertEqual([shape for shape, _ in fits], [(3, 5, 3), (7, 5, 3)])
+        np.testing.assert_array_equal(np.concatenate([targets for _, targets in fits]), y[4:])
+
+    def test_background_trainer_swap(self):
+        """Test the trainer publishes the same model as inline training"""
+        rng = np.random.default_rng(7)
+        states = rng.normal([75, 1.0, 100], [5, 0.3, 5], size=(600, 3))
+        rewards = rng.normal(size=600)
+        actions = ['no_action', 'schedule_maintenance']
+        inline = ReinforcementLearner(capacity=400)
+        trainer = BackgroundTrainer(ReinforcementLearner(capacity=400), batch_size=64, swap_interval=0.01)
+
+        for i, (state, reward) in enumerate(zip(states, rewards)):
+            state = dict(zip(['temperature', 'vibration', 'pressure'], state))
+            result = {'success': True, 'timestamp': np.datetime64(i, 's')}
+            inline.process_experience(state, actions[i % 2], result, reward)
+            trainer.submit(state, actions[i % 2], result, reward)
+        self.assertTrue(trainer.flush(timeout=10))
+
+        query = {'temperature': 78, 'vibration': 1.1, 'pressure': 99}
+        self.assertEqual(trainer.predict_outcomes(query), inline.predict_outcomes(query))
+        stats = trainer.stats()
+        self.assertGreaterEqual(stats['swaps'], 1)
+        self.assertEqual(stats['lag'], 0)
+        self.assertEqual(trainer.epoch, inline.epoch)
+
+        # The retired copy caught up with the published one
+        learner = trainer.close()
+        self.assertIsNot(learner, trainer.learner)
+        self.assertEqual(learner.predict_outcomes(query), inline.predict_outcomes(query))
+
+    def test_background_trainer_clock(self):
+        """Test unstamped experiences take the learner's clock time"""
+        clock = SimulatedClock(datetime(2026, 1, 1))
+        trainer = BackgroundTrainer(ReinforcementLearner(clock=clock), swap_interval=0.01)
+        trainer.submit({'temperature': 75, 'vibration': 1.0, 'pressure': 100}, 'no_action',
+                       {'success': True}, 1.0)
+        self.assertTrue(trainer.flush(timeout=10))
+        learner = trainer.close()
+
+        for copy in (learner, trainer.learner):
+            self.assertEqual(copy.experience_buffer.timestamps[0],
+                             np.datetime64(datetime(2026, 1, 1), 'ns').astype(np.int64))
+
+    def test_background_trainer_worker_failure(self):
+        """Test flush, checkpoint and close raise once the worker has died"""
+        trainer = BackgroundTrainer(ReinforcementLearner(), swap_interval=0.01)
+        trainer.submit(None, 'no_action', {'success': True}, 1.0)
+        with self.assertRaises(RuntimeError):
+            trainer.flush(timeout=10)
+        with self.assertRaises(RuntimeError):
+            trainer.checkpoint('unused.joblib')
+        with self.assertRaises(RuntimeError):
+            trainer.submit({'temperature': 75}, 'no_action', {'success': True}, 1.0)
+        with self.assertRaises(RuntimeError):
+            trainer.close()
+
+    def test_batch_inference_server(self):
+        """Test concurrent requests are coalesced and answered in order"""
+        rng = np.random.default_rng(8)
+        X = rng.normal(size=(400, 3))
+        learner = EnhancedLearner()
+        learner.train(X, X.sum(axis=1))
+        server = BatchInferenceServer(learner, max_batch_size=32, max_delay_ms=20)
+
+        futures = [server.submit(X[i:i + 1]) for i in range(100)]
+        futures.append(server.submit(X[100:110]))
+        outputs = np.concatenate([future.result(timeout=10) for future in futures])
+        server.close()
+
+        np.testing.assert_allclose(outputs, learner.predict(X[:110]))
+        self.assertLess(server.batches, 20)
+        self.assertEqual(server.batch_sizes.sum, 110)
+        self.assertEqual(server.queue_latency.count, 101)
+
+    def test_batch_inference_server_model_switch(self):
+        """Test requests run on the model active when they were submitted"""
+        rng = np.random.default_rng(9)
+        X = rng.normal(size=(200, 3))
+        learner = EnhancedLearner()
+        learner.models.register('mean', lambda: DummyRegressor())
+        learner.train(X, X.sum(axis=1), model_type='mean')
+        learner.train(X, X.sum(axis=1), model_type='rf')
+        server = BatchInferenceServer(learner, max_batch_size=64, max_delay_ms=200)
+
+        rf_future = server.submit(X[:5])
+        learner.active_model = 'mean'
+        mean_future = server.submit(X[:5])
+        rf_outputs, mean_outputs = rf_future.result(timeout=10), mean_future.result(timeout=10)
+        server.close()
+
+        np.testing.assert_allclose(rf_outputs, learner.models['rf'].predict(X[:5]))
+        np.testing.assert_allclose(mean_outputs, learner.models['mean'].predict(X[:5]))
+        self.assertEqual(server.stats()['batches'], 2)
+
+    def test_batch_inference_cancelled_requests(self):
+        """Test cancelled requests are skipped and the server keeps serving"""
+        X = np.random.default_rng(8).normal(size=(50, 3))
+        learner = EnhancedLearner()
+        learner.train(X, X.sum(axis=1))
+        server = BatchInferenceServer(learner, max_batch_size=8, max_delay_ms=50)
+
+        futures = [server.submit(X[i:i + 1]) for i in range(40)]
+        cancelled = [future.cancel() for future in futures[::2]]
+        self.assertTrue(any(cancelled))
+        for future in futures:
+            if not future.cancelled():
+                self.assertEqual(len(future.result(timeout=10)), 1)
+        np.testing.assert_allclose(server.predict(X[:3], timeout=10), learner.predict(X[:3]))
+
+        server.close()
+        with self.assertRaises(RuntimeError):
+            server.submit(X[:1])
+
+    def test_batched_predictions(self):
+        """Test batched predictions match one-at-a-time predictions"""
+        rng = np.random.default_rng(9)
+        learner = ReinforcementLearner(capacity=1500)
+        for i in range(3000):
+            state = dict(zip(['temperature', 'vibration', 'pressure'], rng.normal([75, 1.0, 100], [5, 0.3, 5])))
+            learner.process_experience(state, ['no_action', 'schedule_maintenance'][i % 2],
+                                       {'success': True, 'timestamp': np.datetime64(i, 's')}, rng.normal())
+
+        queries = [dict(zip(['temperature', 'vibration', 'pressure'], q))
+                   for q in rng.normal([75, 1.0, 100], [5, 0.3, 5], size=(50, 3))]
+        batched = learner.predict_outcomes_many(queries)
+        for query, prediction in zip(queries, batched):
+            expected = learner.predict_outcomes(query)
+            self.assertEqual(prediction.keys(), expected.keys())
+            for action in expected:
+                self.assertAlmostEqual(prediction[action]['predicted_reward'],
+                                       expected[action]['predicted_reward'])
@@ -0,0 +1,240 @@
+import unittest
+import sys
+import os
+import tempfile
+import threading
+import logging
+import time
+import urllib.request
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.agent.clock import SimulatedClock
+from src.agent.decision.adaptive_decision import AdaptiveDecisionMaker
+from src.agent.decision.decision_cache import DecisionCache
+from src.agent.environment.sensor_interface import SensorInterface
+from src.agent.learning.reinforcement_learner import ReinforcementLearner
+from src.agent.monitoring.metrics import MetricsRegistry, MetricsServer
+from src.agent.monitoring.profiler import SamplingProfiler
+from src.agent.monitoring.event_journal import EventJournal
+from src.agent.monitoring.snapshot_store import SnapshotStore, SnapshotReader, SnapshotFeed
+
+# main.py imports the agent package as a top-level package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import MaintenanceAgent, STAGES
+
+class TestMonitoring(unittest.TestCase):
+    def setUp(self):
+        self.learner = ReinforcementLearner()
+
+    def test_metrics_endpoint(self):
+        """Test stage metrics are served in Prometheus text format"""
+        registry = MetricsRegistry(prefix='agent_')
+        for stage in ('make_decision', 'process_experience'):
+            registry.histogram('stage_seconds', [0.001, 0.01], labels={'stage': stage}).observe(0.005)
+        registry.counter('decisions_total').inc(3)
+        registry.gauge('buffer_size', function=lambda: len(self.learner.experience_buffer))
+        registry.counter('cache_hits_total', function=lambda: 7)
+        self.assertIs(registry.counter('decisions_total'), registry.counter('decisions_total'))
+
+        server = MetricsServer(registry, port=0).start()
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/metrics', timeout=10) as response:
+                body = response.read().decode()
+        finally:
+            server.close()
+
+        self.assertIn('# TYPE agent_stage_seconds histogram', body)
+        self.assertIn('agent_stage_seconds_bucket{stage="make_decision",le="0.01"} 1', body)
+        self.assertIn('agent_stage_seconds_bucket{stage="process_experience",le="+Inf"} 1', body)
+        self.assertIn('agent_decisions_total 3', body)
+        self.assertIn('agent_buffer_size 0', body)
+        self.assertIn('# TYPE agent_cache_hits_total counter', body)
+        self.assertIn('agent_cache_hits_total 7', body)
+
+    def test_agent_step_many_metrics(self):
+        """Test a batched agent cycle is counted and timed in the served metrics"""
+        agent = MaintenanceAgent(decision_options={'cache': DecisionCache(ttl=60)})
+        sensors = SensorInterface(seed=3)
+        readings = [sensors.read_sensors() for _ in range(8)]
+        # The same readings again are answered from the decision cache
+        outcomes = agent.step_many(readings) + agent.step_many([dict(r) for r in readings])
+        self.assertEqual(len(outcomes), 16)
+
+        server = MetricsServer(agent.metrics, port=0).start()
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{server.port}/metrics', timeout=10) as response:
+                body = response.read().decode()
+        finally:
+            server.close()
+
+        self.assertIn('maintenance_agent_decisions_total 16', body)
+        self.assertIn('maintenance_agent_cycle_seconds_count 16', body)
+        for stage in STAGES:
+            if stage != 'log_status':
+                self.assertIn(f'maintenance_agent_stage_seconds_count{{stage="{stage}"}} 16', body)
+        self.assertIn('maintenance_agent_experience_buffer_size 16', body)
+        self.assertIn('# TYPE maintenance_agent_decision_cache_hits_total counter', body)
+        collected = agent.metrics.collect()
+        hits = collected['maintenance_agent_decision_cache_hits_total'][()]
+        misses = collected['maintenance_agent_decision_cache_misses_total'][()]
+        self.assertEqual(hits + misses, 16)
+        self.assertGreaterEqual(hits, 8)
+
+    def test_sampling_profiler(self):
+        """Test the profiler writes collapsed stacks for its window"""
+        def busy(seconds):
+            deadline = time.monotonic() + seconds
+            while time.monotonic() < deadline:
+                pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'profile.folded')
+            profiler = SamplingProfiler(interval=0.002).start(duration=0.2, path=path)
+            busy(0.3)
+            profiler.wait(timeout=10)
+            with open(path) as f:
+                lines = f.read().splitlines()
+
+        self.assertGreater(profiler.samples, 10)
+        self.assertTrue(any('busy (test_monitoring.py' in line for line in lines))
+        self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in lines))
+
+    def test_decision_journal(self):
+        """Test decisions stream to a rotating journal while memory stays bounded"""
+        state = {'temperature': 75, 'vibration': 1.0, 'pressure': 100}
+        sensor_health = {sensor: {'status': 'NORMAL'} for sensor in state}
+        with tempfile.TemporaryDirectory() as directory:
+            journal = EventJournal(directory, max_bytes=4096, rate_limits={'status': 5})
+            decision_maker = AdaptiveDecisionMaker(self.learner, history_size=10, journal=journal)
+            for _ in range(50):
+                decision_maker.make_decision(state, sensor_health)
+            for _ in range(100):
+                journal.emit('status', {'action': 'no_action'})
+            journal.close()
+
+            decisions = list(EventJournal.read(directory, kind='decision'))
+            statuses = list(EventJournal.read(directory, kind='status'))
+            self.assertGreater(len(EventJournal.segments(directory)), 1)
+
+        self.assertEqual(len(decision_maker.decisions_history), 10)
+        self.assertEqual(len(decisions), 50)
+        self.assertEqual(decisions[-1]['selected_action'], decision_maker.decisions_history[-1]['selected_action'])
+        self.assertEqual(decisions[0]['state'], state)
+        # The bucket starts full with one second of burst
+        self.assertLessEqual(len(statuses), 6)
+        self.assertEqual(len(statuses) + journal.stats()['dropped']['status'], 100)
+
+    def test_journal_concurrency_and_close(self):
+        """Test the rate limit holds across threads and log records stop at close"""
+        with tempfile.TemporaryDirectory() as directory:
+            journal = EventJournal(directory, rate_limits={'status': 100})
+            threads = [
+                threading.Thread(target=lambda: [journal.emit('status', {}) for _ in range(2000)])
+                for _ in range(4)
+            ]
+            started = time.monotonic()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.monotonic() - started
+            stats = journal.stats()
+            self.assertEqual(stats['emitted'] + stats['dropped']['status'], 8000)
+            self.assertLessEqual(stats['emitted'], 100 + 100 * elapsed + 1)
+
+            logger = logging.getLogger('test_journal_close')
+            logger.propagate = False
+            handler = journal.handler(logging.WARNING)
+            logger.addHandler(handler)
+            logger.warning("before close")
+            journal.close()
+            logger.warning("after close")
+            logger.removeHandler(handler)
+
+            logs = list(EventJournal.read(directory, kind='log'))
+            self.assertEqual([record['message'] for record in logs], ["before close"])
+            self.assertEqual(journal.stats()['dropped']['log'], 1)
+            self.assertEqual(journal._queue.qsize(), 0)
+
+    def test_snapshot_store_deltas(self):
+        """Test readers pull only snapshots newer than the version they hold"""
+        clock = SimulatedClock(datetime(2026, 1, 1))
+        sensors = SensorInterface(seed=0, clock=clock)
+        decision_maker = AdaptiveDecisionMaker(self.learner, clock=clock)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'snapshots.db')
+            store = SnapshotStore(path, retain=50, commit_interval=3600,
+                                  status_function=decision_maker.get_decision_metrics)
+
+            def publish(n):
+                for _ in range(n):
+                    clock.advance(1)
+                    state = sensors.read_sensors()
+                    health = sensors.get_sensor_health(state)
+                    action = decision_maker.make_decision(state, health)
+                    store.publish(clock.now(), state, health, 'NORMAL', action, 0.0,
+                                  asset_id=f'pump-{store.version % 2}')
+
+            publish(30)
+            feed = SnapshotFeed(path, maxlen=100, min_interval=0)
+            # Nothing is visible before the batch commits
+            self.assertFalse(feed.refresh())
+            store.flush()
+            self.assertTrue(feed.refresh())
+            self.assertEqual(feed.version, 30)
+
+            publish(40)
+            store.flush()
+            reader = SnapshotReader(path)
+            deltas = reader.since(30)
+            self.assertEqual([d['version'] for d in deltas], list(range(31, 71)))
+            self.assertEqual(reader.status()['total_decisions'], 70)
+            # Retention keeps the newest 50 rows
+            self.assertEqual(len(reader.since(0)), 50)
+
+            feed.refresh()
+            history = feed.history()
+            self.assertEqual([d['version'] for d in history], list(range(1, 71)))
+            self.assertEqual(history[-1]['timestamp'], clock.now().isoformat())
+            self.assertIn(history[-1]['health']['temperature'], ('NORMAL', 'WARNING', 'CRITICAL'))
+
+            # Per-asset feeds read through the asset index
+            pump = SnapshotFeed(path, maxlen=100, min_interval=0, asset_id='pump-1')
+            pump.refresh()
+            self.assertEqual([d['version'] for d in pump.history()], list(range(22, 71, 2)))
+            self.assertEqual({d['asset_id'] for d in pump.history()}, {'pump-1'})
+            plan = reader._connection.execute(
+                'EXPLAIN QUERY PLAN SELECT * FROM snapshots WHERE version > 0 AND asset_id = ?', ('pump-1',)
+            ).fetchall()
+            self.assertIn('snapshots_asset', str(plan))
+            reader.close()
+            pump.reader.close()
+            feed.reader.close()
+            store.close()
+
+    def test_snapshot_feed_follows_recreated_store(self):
+        """Test a feed reopens its reader when the store file is recreated"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'snapshots.db')
+
+            def fill(n):
+                store = SnapshotStore(path, commit_interval=3600)
+                for i in range(n):
+                    store.publish(datetime(2026, 1, 1, 0, i), {'temperature': 70 + i}, {}, 'NORMAL',
+                                  'no_action', float(i))
+                store.close()
+
+            fill(5)
+            feed = SnapshotFeed(path, maxlen=100, min_interval=0)
+            self.assertTrue(feed.refresh())
+            self.assertEqual(feed.version, 5)
+
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+            fill(3)
+            self.assertTrue(feed.refresh())
+            self.assertEqual([d['version'] for d in feed.history()], [1, 2, 3])
+            self.assertEqual(feed.latest()['state'], {'temperature': 72})
+            feed.reader.close()
@@ -0,0 +1,210 @@
+import unittest
+import sys
+import os
+import asyncio
+import tempfile
+import time
+from datetime import datetime
+import numpy as np
+import pandas as pd
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.agent.decision.adaptive_decision import AdaptiveDecisionMaker
+from src.agent.learning.reinforcement_learner import ReinforcementLearner
+from src.agent.decision.decision_cache import DecisionCache
+from src.agent.environment.sensor_interface import SensorInterface
+from src.agent.environment.sources import ReplaySource
+from src.agent.clock import SimulatedClock
+from src.agent.runtime.simulation import SimulationDriver
+from src.agent.runtime.sweep import SweepRunner
+from src.agent.runtime.async_runtime import AsyncAgentRuntime
+from src.agent.runtime.sharding import ShardedFleet
+from src.agent.scenarios.maintenance_scenarios import MaintenanceScenarios
+
+# main.py imports the agent package as a top-level package
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import MaintenanceAgent
+
+class SimulatedAgent:
+    """Minimal agent for simulation tests; rewards doing nothing"""
+
+    def __init__(self, clock, options=None, seed=None):
+        self.clock = clock
+        self.sensor_interface = SensorInterface(clock=clock)
+        self.learner = ReinforcementLearner(clock=clock)
+        self.decision_maker = AdaptiveDecisionMaker(self.learner, clock=clock, **(options or {}))
+
+    def step(self, readings, record=True):
+        state = self.sensor_interface.record(readings) if record else readings
+        health = self.sensor_interface.get_sensor_health(state)
+        action = self.decision_maker.make_decision(state, health)
+        reward = 1.0 if action == 'no_action' else 0.0
+        self.learner.process_experience(state, action, {'success': True}, reward)
+        return {'action': action, 'reward': reward, 'sensor_health': health,
+                'severity': self.decision_maker._evaluate_severity(health)}
+
+    def step_many(self, readings_list, record=True, asset_ids=None, status_codes=None):
+        return [self.step(readings, record) for readings in readings_list]
+
+def shard_agent(shard, asset_ids):
+    return SimulatedAgent(None)
+
+class TestRuntime(unittest.TestCase):
+    def test_simulated_clock_driver(self):
+        """Test a scenario runs on simulated time through a duck-typed agent"""
+        start = datetime(2026, 3, 2)
+        clock = SimulatedClock(start)
+        agent = SimulatedAgent(clock, {'cache': DecisionCache(ttl=120, clock=clock)})
+        sensors, learner, decision_maker = agent.sensor_interface, agent.learner, agent.decision_maker
+
+        driver = SimulationDriver(agent, clock)
+        report = driver.run_scenario(MaintenanceScenarios(seed=2, start=start), 'sudden_failure',
+                                     duration_hours=2, chunk_minutes=45)
+
+        self.assertEqual(report['steps'], 120)
+        self.assertEqual(report['simulated_seconds'], 119 * 60)
+        self.assertEqual(clock.now(), datetime(2026, 3, 2, 1, 59))
+        self.assertEqual(decision_maker.decisions_history[-1]['timestamp'], clock.now())
+        self.assertEqual(learner.experience_buffer.timestamps[0], np.datetime64(start, 'ns').astype(np.int64))
+        self.assertEqual(sum(report['action_counts'].values()), 120)
+        self.assertEqual(report['cumulative_reward'], report['action_counts'].get('no_action', 0))
+        self.assertEqual(len(sensors.get_historical_data(hours=1)), 60)
+
+    def test_sweep_runner_resumes(self):
+        """Test a sweep runs on a process pool and reruns only missing cells"""
+        configs = {'default': {}, 'eager': {'warning_score': 1, 'critical_score': 3}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'results.jsonl')
+            runner = SweepRunner(SimulatedAgent, ['sudden_failure'], 2, configs,
+                                 duration_hours=1, results_path=path, max_workers=2)
+            table = runner.run()
+            self.assertEqual(len(table), 4)
+            self.assertTrue((table['steps'] == 60).all())
+
+            # Drop one finished cell, as if the sweep had been interrupted
+            with open(path) as f:
+                lines = f.readlines()
+            with open(path, 'w') as f:
+                f.writelines(lines[:-1])
+            resumed = SweepRunner(SimulatedAgent, ['sudden_failure'], 2, configs,
+                                  duration_hours=1, results_path=path, max_workers=1)
+            self.assertEqual(len(resumed.pending()), 1)
+            # Per-cell seeding makes the rerun identical
+            columns = ['scenario', 'seed', 'config', 'cumulative_reward', 'missed_criticals']
+            self.assertTrue(resumed.run()[columns].equals(table[columns]))
+
+    def test_sweep_runner_failed_cells(self):
+        """Test a failing cell is reported while the rest are recorded after a torn line"""
+        configs = {'default': {}, 'broken': {'no_such_option': 1}}
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'results.jsonl')
+            with open(path, 'w') as f:
+                f.write('{"scenario": "sudden_fai')
+            for max_workers in (2, 1):
+                runner = SweepRunner(SimulatedAgent, ['sudden_failure'], 2, configs,
+                                     duration_hours=0.5, results_path=path, max_workers=max_workers)
+                table = runner.run()
+                self.assertEqual(len(table), 2)
+                self.assertEqual(sorted(f['seed'] for f in runner.failures), [0, 1])
+                self.assertEqual({f['config'] for f in runner.failures}, {'broken'})
+                self.assertEqual(len(runner.pending()), 2)
+
+            # The torn line stays on its own and both good rows survive
+            resumed = SweepRunner(SimulatedAgent, ['sudden_failure'], 2, configs, results_path=path)
+            self.assertEqual(len(resumed.rows), 2)
+
+    def test_async_runtime_deadlines(self):
+        """Test many asset pipelines tick on absolute deadlines without drift"""
+        agent = SimulatedAgent(None)
+        runtime = AsyncAgentRuntime(agent, range(50), period=0.05, seed=0)
+        started = time.monotonic()
+        stats = asyncio.run(runtime.run(duration=0.5))
+        # Under load the loop may notice the end of the window late
+        periods = (time.monotonic() - started) / 0.05
+
+        self.assertEqual(stats['errors'], 0)
+        # Every deadline was either served or counted as skipped: ten per
+        # asset, whereas sleeping after the work would drift below that
+        self.assertGreaterEqual(stats['ticks'] + stats['skipped'], 50 * 9)
+        self.assertLessEqual(stats['ticks'] + stats['skipped'], 50 * (periods + 1))
+        self.assertLess(stats['jitter_seconds']['p50'], 0.05)
+        # Ticks cancelled at shutdown may still have been decided
+        self.assertGreaterEqual(len(agent.decision_maker.decisions_history), stats['ticks'])
+        # Readings stay in each asset's history, not the agent's
+        self.assertEqual(len(agent.sensor_interface.readings_history), 0)
+        self.assertGreater(len(runtime.sensors[0].readings_history), 0)
+
+    def test_async_runtime_scheduler(self):
+        """Test an adaptive scheduler ticks calm assets less often than the period"""
+        options = {'min_interval': 0.02, 'max_interval': 0.5, 'initial_interval': 0.02, 'growth': 2.0}
+        agent = SimulatedAgent(None)
+        runtime = AsyncAgentRuntime(agent, range(20), period=0.02, seed=0, scheduler_options=options)
+        stats = asyncio.run(runtime.run(duration=0.5))
+
+        self.assertEqual(stats['errors'], 0)
+        self.assertTrue((runtime.scheduler.samples > 0).all())
+        # A fixed period would have ticked each asset about 25 times
+        self.assertLess(stats['ticks'], 20 * 12)
+        self.assertGreater(stats['mean_interval'], 0.02)
+
+    def test_sharded_fleet(self):
+        """Test shards publish their assets' decisions through shared memory"""
+        with ShardedFleet(range(10), shard_agent, n_shards=2, period=None, seed=0) as fleet:
+            fleet.start(max_ticks=5)
+            self.assertTrue(fleet.join(timeout=60))
+            self.assertEqual([p.exitcode for p in fleet.processes], [0, 0])
+            metrics = fleet.metrics()
+
+        self.assertEqual(metrics['ticks'], [5, 5])
+        self.assertEqual(metrics['decisions'], 50)
+        self.assertEqual(metrics['reporting_assets'], 10)
+        self.assertEqual(sum(metrics['actions'].values()), 10)
+        self.assertEqual(sum(metrics['asset_severity'].values()), 10)
+        self.assertEqual(sum(metrics['sensor_status'].values()), 30)
+
+    def test_sharded_fleet_scheduler(self):
+        """Test shards sense and decide only for the assets their scheduler reports due"""
+        options = {'min_interval': 0.01, 'max_interval': 0.2, 'initial_interval': 0.01,
+                   'margin_threshold': 0.0, 'horizon_fraction': 100.0}
+        with ShardedFleet(range(10), shard_agent, n_shards=2, period=0.01, seed=0,
+                          scheduler_options=options) as fleet:
+            fleet.start(max_ticks=4)
+            self.assertTrue(fleet.join(timeout=60))
+            metrics = fleet.metrics()
+
+        self.assertEqual(metrics['ticks'], [4, 4])
+        self.assertEqual(metrics['reporting_assets'], 10)
+        self.assertEqual(sum(metrics['asset_severity'].values()), 10)
+        self.assertLessEqual(metrics['decisions'], 40)
+
+    def test_replayed_experiences_keep_reading_time(self):
+        """Test replayed readings stamp experiences with their recorded time"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'log.csv')
+            pd.DataFrame({
+                'timestamp': pd.date_range('2020-06-01', periods=3, freq='1min'),
+                'temperature': [75, 76, 77],
+                'vibration': [1.0] * 3,
+                'pressure': [100] * 3
+            }).to_csv(path, index=False)
+            agent = MaintenanceAgent(source=ReplaySource(path, ['temperature', 'vibration', 'pressure']))
+            outcomes = [agent.step() for _ in range(3)]
+
+        self.assertEqual([outcome['result']['timestamp'] for outcome in outcomes],
+                         [datetime(2020, 6, 1, 0, minute) for minute in range(3)])
+
+    def test_step_many_with_fleet_codes(self):
+        """Test a shard's vectorized status codes give the same decisions without re-recording"""
+        values = np.array([[75.0, 1.0, 100.0], [82.0, 1.8, 100.0], [90.0, 2.5, 115.0]])
+        readings = [dict(zip(['temperature', 'vibration', 'pressure'], row), timestamp=datetime(2026, 1, 1))
+                    for row in values.tolist()]
+        agent = MaintenanceAgent()
+        codes = agent.sensor_interface.evaluate_fleet_health(values)
+        fleet = agent.step_many(readings, record=False, status_codes=codes)
+        self.assertEqual(len(agent.sensor_interface.readings_history), 0)
+
+        expected = MaintenanceAgent().step_many(readings)
+        for outcome, reference in zip(fleet, expected):
+            self.assertEqual(outcome['sensor_health'], reference['sensor_health'])
+            self.assertEqual(outcome['severity'], reference['severity'])
+            self.assertEqual(outcome['action'], reference['action'])
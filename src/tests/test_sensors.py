@@ -1,9 +1,19 @@
 import unittest
 import sys
 import os
+import asyncio
+import tempfile
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.agent.environment.sensor_interface import SensorInterface
+from src.agent.environment.sensor_interface import SensorInterface, NORMAL, CRITICAL
+from src.agent.environment.fleet_interface import FleetSensorInterface
+from src.agent.environment.sources import AsyncSensorStream, ReplaySource, SourceExhausted
+from src.agent.runtime.scheduler import AdaptiveScheduler, severity_codes
+from src.agent.scenarios.maintenance_scenarios import MaintenanceScenarios
 
 class TestSensors(unittest.TestCase):
     # Rest of the code remains same
@@ -34,3 +44,187 @@ class TestSensors(unittest.TestCase):
         health = self.sensor.get_sensor_health(readings)
         self.assertEqual(health['temperature']['status'], 'CRITICAL')
         self.assertEqual(health['vibration']['status'], 'NORMAL')
+
+    def test_historical_data(self):
+        """Test history window lookup"""
+        for _ in range(5):
+            self.sensor.read_sensors()
+        history = self.sensor.get_historical_data(hours=1)
+        self.assertEqual(len(history), 5)
+        self.assertListEqual(
+            list(history.columns),
+            ['timestamp', 'temperature', 'vibration', 'pressure']
+        )
+
+    def test_history_capacity(self):
+        """Test history is bounded and keeps the newest readings"""
+        sensor = SensorInterface(history_capacity=4)
+        readings = [sensor.read_sensors() for _ in range(11)]
+        timestamps, values = sensor.get_historical_arrays(hours=1)
+        self.assertEqual(len(timestamps), 4)
+        self.assertListEqual(
+            list(values['pressure']),
+            [r['pressure'] for r in readings[-4:]]
+        )
+
+    def test_clock_stepping_back(self):
+        """Test readings stamped before the previous one are kept, not rejected"""
+        sensor = SensorInterface(history_capacity=10)
+        first = sensor.read_sensors()
+        # Wall clock stepped back an hour (DST fall-back)
+        earlier = dict(first, timestamp=first['timestamp'] - pd.Timedelta(hours=1), pressure=123.0)
+        sensor.record(earlier)
+        sensor.read_sensors()
+
+        timestamps, values = sensor.readings_history.window()
+        self.assertEqual(len(timestamps), 3)
+        self.assertTrue(np.all(np.diff(timestamps) >= 0))
+        self.assertEqual(values['pressure'][1], 123.0)
+        self.assertEqual(sensor.readings_history.clamped, 1)
+
+    def test_fleet_health(self):
+        """Test vectorized health matches the per-asset evaluation"""
+        values = np.array([
+            [75.0, 1.0, 100.0],
+            [82.0, 1.8, 100.0],
+            [90.0, 2.5, 115.0]
+        ])
+        codes = self.sensor.evaluate_fleet_health(values)
+        self.assertEqual(codes.dtype, np.int8)
+        for i, row in enumerate(values):
+            expected = self.sensor.get_sensor_health(
+                dict(zip(self.sensor.sensor_names, row))
+            )
+            self.assertEqual(self.sensor.get_asset_health(values, codes, i), expected)
+
+    def test_fleet_interface(self):
+        """Test fleet simulation, seeding and per-asset history"""
+        fleet = FleetSensorInterface(['a', 'b', 'c'], history_capacity=10, seed=7)
+        same_seed = FleetSensorInterface(['a', 'b', 'c'], history_capacity=10, seed=7)
+        for _ in range(3):
+            _, values = fleet.read_fleet()
+            _, expected = same_seed.read_fleet()
+            np.testing.assert_array_equal(values, expected)
+
+        self.assertEqual(fleet.fleet_health().shape, (3, 3))
+        # Composes a SensorInterface rather than half-implementing one
+        self.assertNotIsInstance(fleet, SensorInterface)
+        health = fleet.get_asset_health(values, fleet.fleet_health(), 0)
+        self.assertEqual(health, fleet.sensor_interface.get_sensor_health(dict(zip(fleet.sensor_names, values[0]))))
+        history = fleet.get_asset_history('b', hours=1)
+        self.assertEqual(len(history), 3)
+        self.assertAlmostEqual(history['pressure'].iloc[-1], values[1, 2], places=4)
+        self.assertEqual(len(fleet.get_historical_data(hours=1)), 9)
+
+        # A partial tick, e.g. only the assets a scheduler reports due
+        _, partial = fleet.read_fleet(np.array([2]))
+        self.assertEqual(partial.shape, (1, 3))
+        self.assertAlmostEqual(fleet.get_asset_readings('c')['pressure'], partial[0, 2], places=4)
+        self.assertAlmostEqual(fleet.get_asset_readings('b')['pressure'], values[1, 2], places=4)
+        self.assertTrue(np.isnan(fleet.get_asset_history('b', hours=1)['pressure'].iloc[-1]))
+
+    def test_replay_source(self):
+        """Test replaying a recorded log through read_sensors"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'log.csv')
+            pd.DataFrame({
+                'timestamp': pd.date_range('2026-01-01', periods=5, freq='1s'),
+                'temperature': [75, 76, 77, 78, 90],
+                'vibration': [1.0] * 5,
+                'pressure': [100] * 5
+            }).to_csv(path, index=False)
+
+            source = ReplaySource(path, self.sensor.sensor_names, chunk_size=2)
+            sensor = SensorInterface(source=source)
+            readings = [sensor.read_sensors() for _ in range(5)]
+            self.assertEqual(readings[-1]['temperature'], 90)
+            self.assertEqual(len(sensor.readings_history), 5)
+            with self.assertRaises(SourceExhausted):
+                sensor.read_sensors()
+
+            async def collect():
+                stream = AsyncSensorStream(ReplaySource(path, self.sensor.sensor_names, chunk_size=2), maxsize=1)
+                return [r async for r in stream.readings()]
+
+            self.assertEqual([r['temperature'] for r in asyncio.run(collect())], [75, 76, 77, 78, 90])
+
+    def test_prefetch_stops_with_consumer(self):
+        """Test the reader thread exits when the consumer stops early"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'log.csv')
+            pd.DataFrame({
+                'timestamp': pd.date_range('2026-01-01', periods=20, freq='1s'),
+                'temperature': [75] * 20,
+                'vibration': [1.0] * 20,
+                'pressure': [100] * 20
+            }).to_csv(path, index=False)
+
+            chunks = ReplaySource(path, self.sensor.sensor_names, chunk_size=1, queue_size=1).prefetch_chunks()
+            next(chunks)
+            readers = [t for t in threading.enumerate() if t.name == 'sensor-source-reader']
+            chunks.close()
+            for reader in readers:
+                reader.join(timeout=5)
+                self.assertFalse(reader.is_alive())
+
+    def test_adaptive_scheduler(self):
+        """Test intervals relax on calm assets and tighten on drift or alarms"""
+        scheduler = AdaptiveScheduler.for_sensors(
+            self.sensor.sensors,
+            self.sensor.sensor_names,
+            asset_ids=['calm', 'drifting', 'near_edge', 'alarm'],
+            min_interval=1.0,
+            max_interval=30.0
+        )
+        now = 0.0
+        for step in range(20):
+            values = [
+                [75, 1.0, 100],
+                [75 + 0.2 * step, 1.0, 100],
+                [79, 1.0, 100],
+                [86, 1.0, 100]
+            ]
+            health = self.sensor.evaluate_fleet_health(np.array(values))
+            scheduler.observe(now, values, severity_codes(health))
+            now += 5.0
+
+        calm, drifting, near_edge, alarm = scheduler.intervals
+        self.assertEqual(calm, 30.0)
+        self.assertEqual(near_edge, 1.0)
+        self.assertEqual(alarm, 1.0)
+        self.assertLess(drifting, calm)
+        # One critical sensor scores as a WARNING situation
+        self.assertEqual(scheduler.asset_stats('alarm')['severity_counts']['WARNING'], 20)
+        # Thresholds follow the decision maker's, e.g. one CRITICAL sensor alone
+        self.assertEqual(severity_codes(health, warning_score=1, critical_score=3).tolist(),
+                         [NORMAL, NORMAL, NORMAL, CRITICAL])
+        self.assertEqual(scheduler.due(now).tolist(), [1, 2, 3])
+        self.assertEqual(scheduler.stats(now)['samples'], 80)
+
+    def test_scenario_generation(self):
+        """Test scenarios are generated whole or streamed in chunks"""
+        scenarios = MaintenanceScenarios(seed=0, start=datetime(2026, 1, 5))
+        for name in scenarios.scenarios:
+            data = scenarios.generate_scenario(name, duration_hours=2)
+            self.assertEqual(len(data), 120)
+            self.assertEqual(list(data.columns), ['timestamp', 'temperature', 'vibration', 'pressure'])
+
+        # Shorter than one sample
+        empty = scenarios.generate_scenario('normal_operation', duration_hours=0.01)
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(list(empty.columns), ['timestamp', 'temperature', 'vibration', 'pressure'])
+        self.assertEqual(list(scenarios.generate_scenario('normal_operation', 0, n_assets=3).columns),
+                         ['timestamp', 'asset_id', 'temperature', 'vibration', 'pressure'])
+
+        failure = scenarios.generate_scenario('sudden_failure', duration_hours=10)
+        self.assertLess(failure['temperature'][:400].mean(), 80)
+        self.assertGreater(failure['temperature'][420:].mean(), 85)
+
+        chunks = list(scenarios.iter_scenario('seasonal_pattern', duration_hours=24 * 14,
+                                              n_assets=5, chunk_minutes=1440))
+        self.assertEqual(len(chunks), 14)
+        self.assertEqual(len(chunks[0]), 1440 * 5)
+        self.assertEqual(chunks[0]['asset_id'].nunique(), 5)
+        # Weekday afternoons run hotter than weekend ones (Jan 5, 2026 is a Monday)
+        self.assertGreater(chunks[0]['temperature'][5 * 900:5 * 960].mean(),
+                           chunks[5]['temperature'][5 * 900:5 * 960].mean() + 1)
@@ -0,0 +1,66 @@
+import unittest
+import sys
+import os
+import numpy as np
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.agent.learning.reinforcement_learner import ReinforcementLearner
+from src.agent.decision.adaptive_decision import AdaptiveDecisionMaker
+from src.agent.visualization.downsampling import lttb_indices, minmax_indices
+from src.agent.visualization.series import DecisionSeries, LearningSeries
+
+class TestVisualization(unittest.TestCase):
+    def test_downsampling_keeps_shape(self):
+        """Test LTTB and min/max downsampling keep endpoints and spikes"""
+        rng = np.random.default_rng(4)
+        x = np.arange(100000, dtype=np.float64)
+        y = np.sin(x / 5000) + rng.normal(0, 0.01, len(x))
+        y[31337] = 25.0
+        y[77777] = -25.0
+
+        for indices in (lttb_indices(x, y, 500), minmax_indices(y, 500)):
+            self.assertLessEqual(len(indices), 502)
+            self.assertTrue(np.all(np.diff(indices) > 0))
+            self.assertEqual(indices[0], 0)
+            self.assertEqual(indices[-1], len(x) - 1)
+            self.assertIn(31337, indices)
+            self.assertIn(77777, indices)
+        self.assertEqual(len(lttb_indices(x, y, 500)), 500)
+        np.testing.assert_array_equal(lttb_indices(x[:10], y[:10], 500), np.arange(10))
+
+    def test_incremental_series(self):
+        """Test visualizer series append only new decisions and epochs"""
+        learner = ReinforcementLearner(epoch_min_changes=10, epoch_change_fraction=0)
+        decision_maker = AdaptiveDecisionMaker(learner, history_size=20)
+        decisions = DecisionSeries(decision_maker)
+        learning = LearningSeries(learner)
+        rng = np.random.default_rng(2)
+
+        def decide(n):
+            for _ in range(n):
+                state = dict(zip(['temperature', 'vibration', 'pressure'],
+                                 rng.normal([75, 1.0, 100], [5, 0.3, 5])))
+                health = {sensor: {'status': 'NORMAL'} for sensor in state}
+                action = decision_maker.make_decision(state, health)
+                learner.process_experience(state, action, {'success': True}, 1.0)
+
+        decide(15)
+        self.assertEqual(decisions.update(), 15)
+        self.assertEqual(decisions.update(), 0)
+        decide(50)
+        # Nothing is lost although the history only holds 20 decisions
+        self.assertEqual(decisions.update(), 50)
+        self.assertEqual(len(decisions.timestamps), 65)
+        self.assertAlmostEqual(decisions.sensors['pressure'].values[-1],
+                               decision_maker.decisions_history[-1]['state']['pressure'])
+        late = DecisionSeries(decision_maker)
+        self.assertEqual(late.update(), 20)
+        late.close()
+        decide(1)
+        self.assertEqual(late.update(), 0)
+
+        self.assertEqual(learning.update(), 6)
+        decide(20)
+        self.assertEqual(learning.update(), 2)
+        self.assertEqual(learning.buffer_size.values.tolist(), [10, 20, 30, 40, 50, 60, 70, 80])
+        self.assertTrue(np.allclose(learning.model_score.values, 1.0))